@@ -0,0 +1,324 @@
+"""Measures how many products the whole stack stores per minute.
+
+The real spiders, loaders and pipelines crawl the synthetic catalogs of
+benchmarks.mock_store_server, started on a free port, and store into
+mongomock. Every http and https request is sent to the mock server with its
+original host, so URLs, offsite filtering and download slots are the same as
+on a crawl of the stores. Run from the project directory:
+
+    python -m benchmarks.end_to_end_benchmark --products 500 --latency 0.05
+
+It reports the products stored per minute, the time spent downloading,
+parsing and in the item pipelines, and the peak memory of the crawl.
+"""
+
+import argparse
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+from scrapy.utils.project import get_project_settings
+from benchmarks import (
+    mock_store_components,
+)
+from price_monitor import runner
+from price_monitor.helpers import (
+    mongo_db_helper,
+)
+from typing import (
+    Dict,
+    List,
+)
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+PROJECT_DIRECTORY = os.path.dirname(
+    os.path.dirname(os.path.realpath(__file__))
+)
+SPIDERS = [
+    'metro_sitemap_spider',
+    'iga_sitemap_spider',
+    'best_buy_sitemap_spider',
+    'toysrus_sitemap_spider',
+    'incase_products_json_spider',
+]
+SERVER_START_TIMEOUT = 10
+
+def find_free_port() -> int:
+    with socket.socket() as connection:
+        connection.bind(('127.0.0.1', 0))
+
+        return connection.getsockname()[1]
+
+def start_server(port: int, arguments) -> subprocess.Popen:
+    # Its own process, so serving does not take the crawl's CPU time.
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'benchmarks.mock_store_server',
+            '--port', str(port),
+            '--products', str(arguments.products),
+            '--latency', str(arguments.latency),
+            '--jitter', str(arguments.jitter),
+            '--error-rate', str(arguments.error_rate),
+        ],
+        cwd=PROJECT_DIRECTORY,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + SERVER_START_TIMEOUT
+
+    while time.time() < deadline and server.poll() is None:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+
+            return server
+        except OSError:
+            time.sleep(0.1)
+
+    server.kill()
+    raise RuntimeError('The mock store server did not start.')
+
+def create_settings(port: int, arguments):
+    settings = get_project_settings()
+    module = mock_store_components.__name__
+    handler = f'{module}.MockStoreDownloadHandler'
+    settings.setdict(
+        {
+            'MOCK_STORE_ADDRESS': f'127.0.0.1:{port}',
+            'DOWNLOAD_HANDLERS': {
+                'http': handler,
+                'https': handler,
+            },
+            'EXTENSIONS': {
+                **settings.getdict('EXTENSIONS'),
+                f'{module}.LatencyRecorder': 1000,
+            },
+            'SPIDER_MIDDLEWARES': {
+                **settings.getdict('SPIDER_MIDDLEWARES'),
+                f'{module}.ParseTimerSpiderMiddleware': 0,
+            },
+            # Stores set ITEM_PIPELINES, the base is added to theirs.
+            'ITEM_PIPELINES_BASE': {
+                f'{module}.PipelineStartTimer': 0,
+                f'{module}.PipelineEndTimer': 10000,
+            },
+            # The stores' delays would hide what the stack can do.
+            'ADAPTIVE_THROTTLE_ENABLED': arguments.throttle,
+            'LOG_LEVEL': arguments.log_level,
+            'TELNETCONSOLE_ENABLED': False,
+        },
+        priority='cmdline',
+    )
+
+    return settings
+
+def summarize(samples: List[float]) -> Dict:
+    if not samples:
+        return {'count': 0}
+
+    samples = sorted(samples)
+
+    return {
+        'count': len(samples),
+        'mean_ms': sum(samples) / len(samples) * 1000,
+        'p50_ms': samples[len(samples) // 2] * 1000,
+        'p99_ms': samples[min(len(samples) - 1, int(len(samples) * 0.99))] \
+            * 1000,
+    }
+
+def create_report(
+    summary: Dict,
+    stats: Dict,
+    elapsed: float,
+    stored: int,
+) -> Dict:
+    items = summary['total']['item_scraped_count']
+
+    # Each crawler counts the errors logged by all of them.
+    for name, spider_summary in summary['spiders'].items():
+        spider_summary['spider_exceptions'] = sum(
+            value for key, value in stats[name].items()
+            if key.startswith('spider_exceptions/')
+        )
+
+    return {
+        'elapsed_seconds': elapsed,
+        'items': items,
+        'items_per_minute': items / elapsed * 60 if elapsed else 0,
+        'responses_per_second': \
+            summary['total']['downloader/response_count'] / elapsed \
+            if elapsed else 0,
+        'stored_products': stored,
+        # Kilobytes on Linux.
+        'peak_memory_mib': \
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'latency': {
+            key: summarize(
+                mock_store_components.LatencyRecorder.samples[key]
+            )
+            for key in [
+                mock_store_components.KEY_DOWNLOAD,
+                mock_store_components.KEY_PARSE,
+                mock_store_components.KEY_PIPELINES,
+            ]
+        },
+        'spiders': summary['spiders'],
+    }
+
+def print_report(report: Dict):
+    print(
+        f'{report["items"]} items in {report["elapsed_seconds"]:.1f} s: '
+        f'{report["items_per_minute"]:.0f} items/min, '
+        f'{report["responses_per_second"]:.1f} responses/s, '
+        f'{report["stored_products"]} products stored, '
+        f'peak memory {report["peak_memory_mib"]:.0f} MiB.'
+    )
+    print(f'{"stage":<12} {"count":>8} {"mean ms":>9} {"p50 ms":>9} '
+        f'{"p99 ms":>9}')
+
+    for key, latency in report['latency'].items():
+        if not latency['count']:
+            print(f'{key:<12} {0:>8}')
+            continue
+
+        print(
+            f'{key:<12} {latency["count"]:>8} {latency["mean_ms"]:>9.2f} '
+            f'{latency["p50_ms"]:>9.2f} {latency["p99_ms"]:>9.2f}'
+        )
+
+    for name, spider in report['spiders'].items():
+        print(
+            f'{name}: {spider["item_scraped_count"]} items, '
+            f'{spider["downloader/response_count"]} responses, '
+            f'{spider["spider_exceptions"]} spider exceptions.'
+        )
+
+def parse_arguments(arguments: List[str]):
+    parser = argparse.ArgumentParser(
+        description='Crawl a mock store server with the real spiders.',
+    )
+    parser.add_argument(
+        '--spider',
+        action='append',
+        help='spider to run (repeatable, default: the spiders of the '
+            'mock stores)',
+    )
+    parser.add_argument(
+        '--products',
+        type=int,
+        default=500,
+        help='products per store (default: 500)',
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='seconds the server waits before each response (default: 0)',
+    )
+    parser.add_argument(
+        '--jitter',
+        type=float,
+        default=0.0,
+        help='up to this many more seconds, at random (default: 0)',
+    )
+    parser.add_argument(
+        '--error-rate',
+        type=float,
+        default=0.0,
+        help='share of responses that are 503 errors (default: 0)',
+    )
+    parser.add_argument(
+        '--concurrent-requests',
+        type=int,
+        default=64,
+        help='requests of all spiders at once (default: 64)',
+    )
+    parser.add_argument(
+        '--concurrent-requests-per-store',
+        type=int,
+        default=16,
+        help='requests to a store at once (default: 16)',
+    )
+    parser.add_argument(
+        '--throttle',
+        action='store_true',
+        help='keep the adaptive throttle and the stores\' delays',
+    )
+    parser.add_argument(
+        '--mongodb',
+        action='store_true',
+        help='store into the configured MongoDB instead of mongomock',
+    )
+    parser.add_argument(
+        '--log-level',
+        default='WARNING',
+        help='Scrapy log level (default: WARNING)',
+    )
+    parser.add_argument(
+        '--output',
+        help='also write the report to this JSON file',
+    )
+    arguments = parser.parse_args(arguments)
+
+    if not arguments.mongodb and not mongomock:
+        parser.error('mongomock is not installed, use --mongodb.')
+
+    return arguments
+
+if __name__ == '__main__':
+    arguments = parse_arguments(sys.argv[1:])
+    spiders = arguments.spider or SPIDERS
+
+    # Pipelines read the project settings, not the crawler's.
+    if not arguments.mongodb:
+        os.environ['SCRAPY_SETTINGS_MODULE'] = 'benchmarks.mongomock_settings'
+
+    port = find_free_port()
+    server = start_server(port, arguments)
+
+    try:
+        settings = create_settings(port, arguments)
+
+        if not arguments.mongodb:
+            # Registered as the client of the configured server.
+            mongo_db_helper.MongoDBHelper.clients[(
+                settings.get('MONGODB_SERVER'),
+                settings.get('MONGODB_PORT'),
+            )] = mongomock.MongoClient()
+
+        start = time.perf_counter()
+        spider_runner = runner.SpiderRunner(
+            {
+                runner.SpiderRunner.KEY_SPIDERS: [
+                    {runner.SpiderRunner.KEY_NAME: name} for name in spiders
+                ],
+                runner.SpiderRunner.KEY_MAX_SPIDERS: len(spiders),
+                runner.SpiderRunner.KEY_CONCURRENT_REQUESTS: \
+                    arguments.concurrent_requests,
+                runner.SpiderRunner.KEY_CONCURRENT_REQUESTS_PER_STORE: \
+                    arguments.concurrent_requests_per_store,
+            },
+            settings=settings,
+        )
+        summary = spider_runner.run()
+        elapsed = time.perf_counter() - start
+        stored = mongo_db_helper.MongoDBHelper.get_database(settings)[
+            settings.get('MONGODB_COLLECTION_PRODUCTS')
+        ].count_documents({})
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = create_report(summary, spider_runner.stats, elapsed, stored)
+    print_report(report)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=4, default=str)
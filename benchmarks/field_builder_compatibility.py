@@ -0,0 +1,137 @@
+"""Checks the field builders against the item loaders they replace.
+
+Run from the project directory:
+
+    python -m benchmarks.field_builder_compatibility
+"""
+
+import sys
+import timeit
+from scrapy.http.response.html import HtmlResponse
+from price_monitor.helpers import (
+    field_builder_helper,
+)
+from price_monitor.item_loaders import (
+    global_trade_item_number_loader,
+    image_item_loader,
+    text_item_loader,
+)
+from price_monitor.items import (
+    global_trade_item_number_item,
+    image,
+    text,
+)
+
+VALUES = [
+    'Yop',
+    '  Yogourt à boire  ',
+    '<b>Fraise</b> &amp; banane',
+    'Line\nbreak\tand\rtabs',
+    '\xa0non-breaking\xa0',
+    '&lt;not a tag&gt;',
+    '&#233;t&eacute;',
+    '',
+    '   ',
+    None,
+    ['', 'second'],
+    ['<i></i>', '', 'third'],
+    [],
+    b'bytes \xc3\xa9',
+    'https://example.com/image.jpg?w=100&amp;h=100',
+]
+LANGUAGES = ['en', 'fr', None, '']
+GTIN_TYPES = ['upc_a', 'ean_13', None]
+
+def create_text_field_with_loader(response, value, language):
+    item_loader = text_item_loader.TextItemLoader(response=response)
+    item_loader.add_value(text.Text.KEY_VALUE, value)
+    item_loader.add_value(text.Text.KEY_LANGUAGE, language)
+
+    return item_loader.load_item().get_dictionary()
+
+def create_gtin_field_with_loader(response, type, value):
+    item_loader = \
+        global_trade_item_number_loader.GlobalTradeItemNumberItemLoader(
+            response=response
+        )
+    item_loader.add_value(
+        global_trade_item_number_item.GlobalTradeItemNumberItem.KEY_VALUE,
+        value,
+    )
+    item_loader.add_value(
+        global_trade_item_number_item.GlobalTradeItemNumberItem \
+            .KEY_GTIN_TYPE,
+        type,
+    )
+
+    return dict(item_loader.load_item())
+
+def create_image_field_with_loader(response, url, language):
+    item_loader = image_item_loader.ImageItemLoader(response=response)
+    item_loader.add_value(image.Image.KEY_LANGUAGE, language)
+    item_loader.add_value(image.Image.KEY_URL, url)
+
+    return dict(item_loader.load_item())
+
+def find_mismatches():
+    builder = field_builder_helper.FieldBuilderHelper
+    mismatches = []
+
+    for value in VALUES:
+        for language in LANGUAGES:
+            expected = create_text_field_with_loader(None, value, language)
+            actual = builder.create_text_field(value, language)
+
+            if expected != actual:
+                mismatches.append(('text', value, language, expected, actual))
+
+            expected = create_image_field_with_loader(None, value, language)
+            actual = builder.create_image_field(value, language)
+
+            if expected != actual:
+                mismatches.append(('image', value, language, expected, actual))
+
+        for type in GTIN_TYPES:
+            expected = create_gtin_field_with_loader(None, type, value)
+            actual = builder.create_gtin_field(type, value)
+
+            if expected != actual:
+                mismatches.append(('gtin', value, type, expected, actual))
+
+    return mismatches
+
+def time_text_fields(number: int = 2000):
+    # Loaders given the response, as the store models do, parse its body.
+    response = HtmlResponse(
+        'https://example.com/',
+        body=b'<html><body>' + b'<p>product</p>' * 2000 + b'</body></html>',
+        encoding='utf-8',
+    )
+    loader_seconds = timeit.timeit(
+        lambda: create_text_field_with_loader(response, VALUES[2], 'en'),
+        number=number,
+    )
+    builder_seconds = timeit.timeit(
+        lambda: field_builder_helper.FieldBuilderHelper.create_text_field(
+            VALUES[2],
+            'en',
+        ),
+        number=number,
+    )
+
+    return loader_seconds / number, builder_seconds / number
+
+if __name__ == '__main__':
+    mismatches = find_mismatches()
+
+    for mismatch in mismatches:
+        print('Mismatch: %s %r %r loader=%r builder=%r' % mismatch)
+
+    loader_seconds, builder_seconds = time_text_fields()
+    print(
+        f'Text field: loader {loader_seconds * 1e6:.1f} us, '
+        f'builder {builder_seconds * 1e6:.1f} us '
+        f'({loader_seconds / builder_seconds:.0f}x).'
+    )
+
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,47 @@
+{
+  "id": 1234567890,
+  "title": "Icon Backpack | Incase",
+  "handle": "icon-backpack",
+  "description": "<p>The Icon Backpack protects a laptop up to 16\".</p>",
+  "vendor": "Incase",
+  "type": "Backpacks",
+  "tags": [
+    "upc:650450139254",
+    "vsn:INCO100346-BLK",
+    "backpack",
+    "travel"
+  ],
+  "price": 24995,
+  "available": true,
+  "variants": [
+    {
+      "id": 3123450,
+      "sku": "INMB200-BLK",
+      "title": "Black / 13\"",
+      "price": 4995,
+      "available": true
+    },
+    {
+      "id": 3123451,
+      "sku": "INMB201-BLK",
+      "title": "Black / 14\"",
+      "price": 5495,
+      "available": true
+    },
+    {
+      "id": 3123452,
+      "sku": "INMB202-BLK",
+      "title": "Black / 15\"",
+      "price": 5995,
+      "available": true
+    }
+  ],
+  "images": [
+    "//cdn.shopify.com/s/files/1/0000/0001/products/icon-backpack-0.jpg",
+    "//cdn.shopify.com/s/files/1/0000/0001/products/icon-backpack-1.jpg",
+    "//cdn.shopify.com/s/files/1/0000/0001/products/icon-backpack-2.jpg",
+    "//cdn.shopify.com/s/files/1/0000/0001/products/icon-backpack-3.jpg",
+    "//cdn.shopify.com/s/files/1/0000/0001/products/icon-backpack-4.jpg",
+    "//cdn.shopify.com/s/files/1/0000/0001/products/icon-backpack-5.jpg"
+  ]
+}
\ No newline at end of file
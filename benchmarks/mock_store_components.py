@@ -0,0 +1,123 @@
+"""Scrapy components of benchmarks.end_to_end_benchmark."""
+
+import collections
+import time
+from scrapy import signals
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+from urllib.parse import (
+    urlsplit,
+    urlunsplit,
+)
+
+KEY_DOWNLOAD = 'download'
+KEY_PARSE = 'parse'
+KEY_PIPELINES = 'pipelines'
+
+class MockStoreDownloadHandler(HTTP11DownloadHandler):
+    """Downloads every URL from the mock store server, as its host."""
+
+    def __init__(self, settings, crawler=None):
+        super().__init__(settings, crawler)
+        self.address = settings.get('MOCK_STORE_ADDRESS')
+
+    def download_request(self, request, spider):
+        url = urlsplit(request.url)
+        mock_request = request.replace(
+            url=urlunsplit(('http', self.address, url.path, url.query, '')),
+            headers=request.headers.copy(),
+        )
+        mock_request.headers['Host'] = url.netloc
+
+        return super().download_request(mock_request, spider).addCallback(
+            self.__restore_request,
+            request,
+            mock_request,
+        )
+
+    def __restore_request(self, response, request, mock_request):
+        request.meta['download_latency'] = \
+            mock_request.meta.get('download_latency')
+
+        return response.replace(url=request.url, request=request)
+
+class LatencyRecorder:
+    """Holds the latencies of all crawlers, and records their downloads."""
+
+    samples = collections.defaultdict(list)
+    pipeline_starts = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        recorder = cls()
+        crawler.signals.connect(
+            recorder.response_received,
+            signal=signals.response_received,
+        )
+
+        return recorder
+
+    def response_received(self, response, request, spider):
+        if request.meta.get('download_latency') is not None:
+            self.samples[KEY_DOWNLOAD].append(
+                request.meta['download_latency']
+            )
+
+class ParseTimerSpiderMiddleware:
+    """Records the time spent in the callbacks and spider middlewares.
+
+    Scrapy calls a callback a reactor loop after the spider middlewares'
+    input, so the callback itself is timed. Being the first spider
+    middleware, the time the engine spends on the results between two of
+    them is left out.
+    """
+
+    KEY_ELAPSED = 'parse_elapsed'
+
+    def process_spider_input(self, response, spider):
+        request = response.request
+        callback = request.callback or spider._parse
+
+        def timed_callback(response, **kwargs):
+            start = time.perf_counter()
+
+            try:
+                return callback(response, **kwargs)
+            finally:
+                response.meta[self.KEY_ELAPSED] = time.perf_counter() - start
+
+        request.callback = timed_callback
+
+    def process_spider_output(self, response, result, spider):
+        elapsed = response.meta.pop(self.KEY_ELAPSED, 0)
+        iterator = iter(result)
+
+        while True:
+            start = time.perf_counter()
+
+            try:
+                element = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - start
+
+            yield element
+
+        LatencyRecorder.samples[KEY_PARSE].append(elapsed)
+
+class PipelineStartTimer:
+    def process_item(self, item, spider):
+        LatencyRecorder.pipeline_starts[id(item)] = time.perf_counter()
+
+        return item
+
+class PipelineEndTimer:
+    def process_item(self, item, spider):
+        start = LatencyRecorder.pipeline_starts.pop(id(item), None)
+
+        if start:
+            LatencyRecorder.samples[KEY_PIPELINES].append(
+                time.perf_counter() - start
+            )
+
+        return item
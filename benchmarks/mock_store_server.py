@@ -0,0 +1,349 @@
+"""Serves synthetic store catalogs in each store's page format.
+
+Requests are routed by their Host header, so the spiders keep their real
+URLs (see benchmarks.end_to_end_benchmark). Metro, IGA, Best Buy and Toys R
+Us get a robots.txt, sitemaps and product pages made from the fixtures,
+Incase gets Shopify's products.json and /products/<handle>.js. Run from the
+project directory:
+
+    python -m benchmarks.mock_store_server --port 8070 --products 1000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from collections import namedtuple
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import (
+    parse_qs,
+    urlsplit,
+)
+
+DIRECTORY = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'fixtures',
+)
+
+# The template's values in placeholders are replaced for each product.
+StoreFormat = namedtuple(
+    'StoreFormat',
+    [
+        'template',
+        'path',
+        'placeholders',
+        'first_id',
+    ],
+)
+Page = namedtuple('Page', ['status', 'content_type', 'body'])
+
+HTML = 'text/html; charset=utf-8'
+XML = 'application/xml'
+JSON = 'application/json'
+TEXT = 'text/plain'
+
+class PageCatalog:
+    """A store with a robots.txt, sitemaps and HTML product pages."""
+
+    SITEMAP_SIZE = 1000
+
+    def __init__(self, host: str, store_format: StoreFormat, products: int):
+        self.host = host
+        self.store_format = store_format
+        self.products = products
+
+        with open(
+            os.path.join(DIRECTORY, store_format.template),
+            encoding='utf-8',
+        ) as file:
+            self.template = file.read()
+
+        self.paths = {
+            store_format.path.format(n=n, id=self.__get_id(n)): n
+            for n in range(products)
+        }
+
+    def get(self, path: str, query: Dict) -> Optional[Page]:
+        if path == '/robots.txt':
+            return Page(
+                200,
+                TEXT,
+                f'User-agent: *\nAllow: /\n'
+                f'Sitemap: https://{self.host}/sitemap.xml\n',
+            )
+        elif path == '/sitemap.xml':
+            return Page(200, XML, self.__create_sitemap_index())
+        elif path.startswith('/sitemap-') and path.endswith('.xml') \
+            and path[9:-4].isdigit():
+            return self.__create_sitemap(int(path[9:-4]))
+        elif path in self.paths:
+            return Page(200, HTML, self.__create_product_page(self.paths[path]))
+
+        return None
+
+    def __get_id(self, n: int) -> str:
+        first_id = self.store_format.first_id
+
+        return str(int(first_id) + n).zfill(len(first_id))
+
+    def __create_sitemap_index(self) -> str:
+        sitemaps = ''.join(
+            f'<sitemap><loc>https://{self.host}/sitemap-{i}.xml</loc></sitemap>'
+            for i in range(0, self.products, self.SITEMAP_SIZE)
+        )
+
+        return '<?xml version="1.0" encoding="UTF-8"?>' \
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">' \
+            f'{sitemaps}</sitemapindex>'
+
+    def __create_sitemap(self, start: int) -> Optional[Page]:
+        if start % self.SITEMAP_SIZE or start >= self.products:
+            return None
+
+        urls = ''.join(
+            f'<url><loc>https://{self.host}'
+            f'{self.store_format.path.format(n=n, id=self.__get_id(n))}'
+            '</loc></url>'
+            for n in range(start, min(start + self.SITEMAP_SIZE, self.products))
+        )
+
+        return Page(
+            200,
+            XML,
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'{urls}</urlset>',
+        )
+
+    def __create_product_page(self, n: int) -> str:
+        page = self.template
+        values = {'id': self.__get_id(n), 'price': f'{1 + n % 500 / 10:.2f}'}
+
+        for value, placeholder in self.store_format.placeholders.items():
+            page = page.replace(value, placeholder.format(**values))
+
+        return page
+
+class ShopifyCatalog:
+    """A Shopify store, with its products.json and product .js."""
+
+    PAGE_SIZE = 250
+
+    def __init__(self, host: str, products: int):
+        self.host = host
+        self.products = products
+
+        with open(
+            os.path.join(DIRECTORY, 'shopify', 'products.json'),
+            encoding='utf-8',
+        ) as file:
+            self.products_json_template = json.load(file)['products'][0]
+
+        with open(
+            os.path.join(DIRECTORY, 'shopify', 'product.js'),
+            encoding='utf-8',
+        ) as file:
+            self.product_js_template = json.load(file)
+
+    def get(self, path: str, query: Dict) -> Optional[Page]:
+        if path == '/robots.txt':
+            return Page(200, TEXT, 'User-agent: *\nAllow: /\n')
+        elif path == '/products.json':
+            page = int(query.get('page', ['1'])[0])
+            limit = min(
+                int(query.get('limit', [self.PAGE_SIZE])[0]),
+                self.PAGE_SIZE,
+            )
+            start = (page - 1) * limit
+
+            return Page(
+                200,
+                JSON,
+                json.dumps({
+                    'products': [
+                        self.__create_products_json_product(n)
+                        for n in range(start, min(start + limit, self.products))
+                    ],
+                }),
+            )
+        elif path.startswith('/products/product-') and path.endswith('.js') \
+            and path[18:-3].isdigit():
+            n = int(path[18:-3])
+
+            if n < self.products:
+                return Page(200, JSON, json.dumps(self.__create_product_js(n)))
+
+        return None
+
+    def __create_products_json_product(self, n: int) -> Dict:
+        product = dict(self.products_json_template)
+        product.update({
+            'id': 1000000 + n,
+            'handle': f'product-{n}',
+            'title': f'Product {n} | Incase',
+            'tags': [f'upc:{650450000000 + n}', f'vsn:INCO{n}', 'case'],
+            'variants': [
+                dict(variant, sku=f'INCO{n}-{i}', price=f'{20 + n % 80}.95')
+                for i, variant in enumerate(product['variants'])
+            ],
+        })
+
+        return product
+
+    def __create_product_js(self, n: int) -> Dict:
+        product = dict(self.product_js_template)
+        product.update({
+            'id': 1000000 + n,
+            'handle': f'product-{n}',
+            'tags': [f'upc:{650450000000 + n}', f'vsn:INCO{n}', 'backpack'],
+            'price': 2000 + n % 8000,
+        })
+
+        return product
+
+FORMATS = {
+    'www.metro.ca': StoreFormat(
+        'metro/product_en.html',
+        '/en/online-grocery/aisles/dairy-cheese/product-{n}/p/{id}',
+        {'056920012029': '{id}', '1.99': '{price}'},
+        '056920000000',
+    ),
+    'www.iga.net': StoreFormat(
+        'iga/product_en.html',
+        '/en/product/product-{n}/00000_{id}',
+        {'056920012029': '{id}', '2.29': '{price}'},
+        '056920000000',
+    ),
+    'www.bestbuy.ca': StoreFormat(
+        'best_buy/product_en.html',
+        '/en-ca/product/product-{n}/{id}',
+        {'13367461': '{id}', '79.99': '{price}'},
+        '13000000',
+    ),
+    'www.toysrus.ca': StoreFormat(
+        'toysrus/product_en.html',
+        '/en/product-{n}/{id}.html',
+        {'10045983': '{id}', '169.99': '{price}'},
+        '10000000',
+    ),
+}
+SHOPIFY_HOSTS = ['incasedesigns.ca', 'www.incasedesigns.ca']
+
+class MockStoreServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        products: int,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+    ):
+        super().__init__(address, MockStoreRequestHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.catalogs = {
+            host: PageCatalog(host, store_format, products)
+            for host, store_format in FORMATS.items()
+        }
+        self.catalogs.update({
+            host: ShopifyCatalog(host, products) for host in SHOPIFY_HOSTS
+        })
+
+class MockStoreRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+
+        if random.random() < server.error_rate:
+            self.__send(Page(503, TEXT, 'Service Unavailable'), {
+                'Retry-After': '1',
+            })
+            return
+
+        host = (self.headers.get('Host') or '').split(':')[0]
+        url = urlsplit(self.path)
+        catalog = server.catalogs.get(host)
+        page = catalog.get(url.path, parse_qs(url.query)) if catalog else None
+        self.__send(page or Page(404, TEXT, 'Not Found'))
+
+    def log_message(self, format, *args):
+        pass
+
+    def __send(self, page: Page, headers: Optional[Dict] = None):
+        body = page.body.encode('utf-8')
+        self.send_response(page.status)
+        self.send_header('Content-Type', page.content_type)
+        self.send_header('Content-Length', str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+def parse_arguments(arguments: List[str]):
+    parser = argparse.ArgumentParser(
+        description='Serve synthetic store catalogs.',
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8070)
+    parser.add_argument(
+        '--products',
+        type=int,
+        default=1000,
+        help='products per store (default: 1000)',
+    )
+    parser.add_argument(
+        '--latency',
+        type=float,
+        default=0.0,
+        help='seconds before each response (default: 0)',
+    )
+    parser.add_argument(
+        '--jitter',
+        type=float,
+        default=0.0,
+        help='up to this many more seconds, at random (default: 0)',
+    )
+    parser.add_argument(
+        '--error-rate',
+        type=float,
+        default=0.0,
+        help='share of responses that are 503 errors (default: 0)',
+    )
+
+    return parser.parse_args(arguments)
+
+if __name__ == '__main__':
+    arguments = parse_arguments(sys.argv[1:])
+    server = MockStoreServer(
+        (arguments.host, arguments.port),
+        products=arguments.products,
+        latency=arguments.latency,
+        jitter=arguments.jitter,
+        error_rate=arguments.error_rate,
+    )
+    print(f'Serving on {arguments.host}:{arguments.port}.', flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,7 @@
+# Settings of the project for a crawl storing into mongomock, see
+# benchmarks.end_to_end_benchmark.
+
+from price_monitor.settings import *
+
+# Mongomock can't report the usage of indexes, and doesn't need them.
+MONGODB_CREATE_INDEXES = False
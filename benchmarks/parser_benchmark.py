@@ -0,0 +1,379 @@
+"""Times each store's parse_product against the fixture corpus.
+
+The fixtures, in benchmarks/fixtures, are pages in each store's format:
+Best Buy's window.__INITIAL_STATE__, Metro and IGA product pages in English
+and French, Shopify's product JSON, Toys R Us' data-product and Walmart's
+preloaded state. Run from the project directory:
+
+    python -m benchmarks.parser_benchmark --save baseline.json
+    python -m benchmarks.parser_benchmark --baseline baseline.json
+
+Compared to a baseline, it exits with 1 when a case no longer parses, or got
+slower or allocates more by more than the thresholds. Items per second and
+p99 include the outliers of a busy machine, so their threshold is looser.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from scrapy.http import (
+    HtmlResponse,
+    Request,
+    TextResponse,
+)
+from price_monitor.middlewares import (
+    js_data_response,
+)
+from price_monitor.models import (
+    best_besy,
+    iga,
+    incase,
+    metro,
+    toysrus,
+    walmart,
+)
+from typing import (
+    Dict,
+    List,
+)
+
+DIRECTORY = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'fixtures',
+)
+SHOPIFY_BASE_URL = 'https://incasedesigns.ca'
+WARM_UP_ITERATIONS = 10
+
+Case = namedtuple(
+    'Case',
+    [
+        'store',
+        'name',
+        'model',
+        'fixture',
+        'url',
+        'response_class',
+        'parse',
+    ],
+)
+
+KEY_ITEMS_PER_SECOND = 'items_per_second'
+KEY_P50 = 'p50_ms'
+KEY_P99 = 'p99_ms'
+KEY_KIB_PER_ITEM = 'peak_kib_per_item'
+KEY_ITEMS = 'items'
+KEY_ERROR = 'error'
+
+def parse_product(model, response) -> List:
+    return [model.parse_product(response)]
+
+def parse_product_js(model, response) -> List:
+    return [model.parse_product_js(response)]
+
+def parse_products_json(model, response) -> List:
+    return [
+        model.parse_products_json_product(response, SHOPIFY_BASE_URL, data)
+        for data in model.find_products_json_products(response)
+    ]
+
+CASES = [
+    Case(
+        'best_buy',
+        'product_en',
+        best_besy.BestBuy,
+        'best_buy/product_en.html',
+        'https://www.bestbuy.ca/en-ca/product/13367461',
+        HtmlResponse,
+        parse_product,
+    ),
+    Case(
+        'best_buy',
+        'product_fr',
+        best_besy.BestBuy,
+        'best_buy/product_fr.html',
+        'https://www.bestbuy.ca/fr-ca/produit/13367461',
+        HtmlResponse,
+        parse_product,
+    ),
+    Case(
+        'metro',
+        'product_en',
+        metro.Metro,
+        'metro/product_en.html',
+        'https://www.metro.ca/en/online-grocery/aisles/dairy-cheese/yogurt/'
+        'drinkable-yogurts/p/056920012029',
+        HtmlResponse,
+        parse_product,
+    ),
+    Case(
+        'metro',
+        'product_fr',
+        metro.Metro,
+        'metro/product_fr.html',
+        'https://www.metro.ca/epicerie-en-ligne/allees/produits-laitiers/'
+        'yogourt/yogourts-a-boire/p/056920012029',
+        HtmlResponse,
+        parse_product,
+    ),
+    Case(
+        'iga',
+        'product_en',
+        iga.IGA,
+        'iga/product_en.html',
+        'https://www.iga.net/en/product/drinkable-yogurt/00000_056920012029',
+        HtmlResponse,
+        parse_product,
+    ),
+    Case(
+        'iga',
+        'product_fr',
+        iga.IGA,
+        'iga/product_fr.html',
+        'https://www.iga.net/fr/produit/yogourt-a-boire/00000_056920012029',
+        HtmlResponse,
+        parse_product,
+    ),
+    Case(
+        'shopify',
+        'product_js',
+        incase.Incase,
+        'shopify/product.js',
+        f'{SHOPIFY_BASE_URL}/products/icon-backpack.js',
+        TextResponse,
+        parse_product_js,
+    ),
+    Case(
+        'shopify',
+        'products_json',
+        incase.Incase,
+        'shopify/products.json',
+        f'{SHOPIFY_BASE_URL}/products.json?limit=250&page=1',
+        TextResponse,
+        parse_products_json,
+    ),
+    Case(
+        'toysrus',
+        'product_en',
+        toysrus.Toysrus,
+        'toysrus/product_en.html',
+        'https://www.toysrus.ca/en/lego-star-wars-millennium-falcon/'
+        '10045983.html',
+        HtmlResponse,
+        parse_product,
+    ),
+    Case(
+        'walmart',
+        'preloaded_state',
+        walmart.Walmart,
+        'walmart/preloaded_state.json',
+        'https://www.walmart.ca/en/ip/nintendo-switch/6000200356123',
+        js_data_response.JsDataResponse,
+        parse_product,
+    ),
+]
+
+def create_response(case: Case, body: bytes):
+    if issubclass(case.response_class, TextResponse):
+        return case.response_class(
+            case.url,
+            body=body,
+            encoding='utf-8',
+            request=Request(case.url),
+        )
+
+    return case.response_class(case.url, body=body, request=Request(case.url))
+
+def run_case(case: Case, iterations: int) -> Dict:
+    with open(os.path.join(DIRECTORY, case.fixture), 'rb') as file:
+        body = file.read()
+
+    model = case.model()
+
+    try:
+        items = [
+            item for item in case.parse(model, create_response(case, body))
+            if item
+        ]
+    except Exception as exception:
+        return {KEY_ERROR: f'{type(exception).__name__}: {exception}'}
+
+    if not items:
+        return {KEY_ERROR: 'No item parsed.'}
+
+    for _ in range(WARM_UP_ITERATIONS):
+        case.parse(model, create_response(case, body))
+
+    # A new response each time, so its tree is parsed again as on a crawl.
+    # Collections are left out of the timings, they depend on earlier cases.
+    latencies = []
+    gc.collect()
+    gc.disable()
+
+    try:
+        for _ in range(iterations):
+            response = create_response(case, body)
+            start = time.perf_counter()
+            case.parse(model, response)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    latencies.sort()
+    tracemalloc.start()
+    peaks = []
+
+    for _ in range(max(1, iterations // 10)):
+        response = create_response(case, body)
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        case.parse(model, response)
+        peaks.append(tracemalloc.get_traced_memory()[1] - start)
+
+    tracemalloc.stop()
+
+    return {
+        KEY_ITEMS: len(items),
+        KEY_ITEMS_PER_SECOND: len(items) * iterations / sum(latencies),
+        KEY_P50: latencies[len(latencies) // 2] * 1000,
+        KEY_P99: latencies[min(
+            len(latencies) - 1,
+            int(len(latencies) * 0.99),
+        )] * 1000,
+        KEY_KIB_PER_ITEM: sorted(peaks)[len(peaks) // 2] / len(items) / 1024,
+    }
+
+def find_regressions(
+    results: Dict,
+    baseline: Dict,
+    threshold: float,
+    tail_threshold: float,
+) -> List[str]:
+    regressions = []
+    # Means and tails include the outliers of a busy machine.
+    thresholds = {
+        KEY_ITEMS_PER_SECOND: tail_threshold,
+        KEY_P50: threshold,
+        KEY_P99: tail_threshold,
+        KEY_KIB_PER_ITEM: threshold,
+    }
+
+    for key, result in results.items():
+        expected = baseline.get(key)
+
+        if not expected or KEY_ERROR in expected:
+            continue
+
+        if KEY_ERROR in result:
+            regressions.append(f'{key} no longer parses: {result[KEY_ERROR]}')
+            continue
+
+        for metric, allowed in thresholds.items():
+            # Fewer items per second is worse, higher latencies and memory too.
+            ratio = expected[metric] / result[metric] \
+                if metric == KEY_ITEMS_PER_SECOND \
+                else result[metric] / expected[metric]
+
+            if ratio > 1 + allowed:
+                regressions.append(
+                    f'{key} {metric} '
+                    f'{expected[metric]:.3f} -> {result[metric]:.3f}'
+                )
+
+    return regressions
+
+def print_results(results: Dict):
+    print(
+        f'{"case":<28} {"items/s":>10} {"p50 ms":>9} {"p99 ms":>9} '
+        f'{"KiB/item":>9}'
+    )
+
+    for key, result in results.items():
+        if KEY_ERROR in result:
+            print(f'{key:<28} error: {result[KEY_ERROR]}')
+            continue
+
+        print(
+            f'{key:<28} {result[KEY_ITEMS_PER_SECOND]:>10.1f} '
+            f'{result[KEY_P50]:>9.3f} {result[KEY_P99]:>9.3f} '
+            f'{result[KEY_KIB_PER_ITEM]:>9.1f}'
+        )
+
+def parse_arguments(arguments: List[str]):
+    parser = argparse.ArgumentParser(
+        description='Time parse_product on the fixture corpus.',
+    )
+    parser.add_argument(
+        '--store',
+        action='append',
+        help='only run the cases of this store (repeatable)',
+    )
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=200,
+        help='parses per case (default: 200)',
+    )
+    parser.add_argument(
+        '--save',
+        help='write the results to this JSON file',
+    )
+    parser.add_argument(
+        '--baseline',
+        help='JSON results to compare with',
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.2,
+        help='allowed relative regression of p50 and KiB/item '
+            '(default: 0.2)',
+    )
+    parser.add_argument(
+        '--tail-threshold',
+        type=float,
+        default=1.0,
+        help='allowed relative regression of items/s and p99 (default: 1.0)',
+    )
+
+    return parser.parse_args(arguments)
+
+if __name__ == '__main__':
+    arguments = parse_arguments(sys.argv[1:])
+    # The stores log their parsing issues, which would skew the timings.
+    logging.disable(logging.WARNING)
+    results = {}
+
+    for case in CASES:
+        if not arguments.store or case.store in arguments.store:
+            results[f'{case.store}/{case.name}'] = run_case(
+                case,
+                arguments.iterations,
+            )
+
+    print_results(results)
+
+    if arguments.save:
+        with open(arguments.save, 'w') as file:
+            json.dump(results, file, indent=4)
+
+    regressions = []
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = find_regressions(
+                results,
+                json.load(file),
+                arguments.threshold,
+                arguments.tail_threshold,
+            )
+
+    for regression in regressions:
+        print(f'Regression: {regression}')
+
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,76 @@
+import logging
+import pymongo
+from scrapy.commands import ScrapyCommand
+from price_monitor.helpers import (
+    brand_key_helper,
+    mongo_db_helper,
+)
+from price_monitor.items import (
+    product,
+)
+from price_monitor.storage import (
+    mongo_db_index_manager,
+)
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return '[options]'
+
+    def short_desc(self):
+        return 'Write the normalized brand key of products missing one'
+
+    def add_options(self, parser):
+        ScrapyCommand.add_options(self, parser)
+        parser.add_option(
+            '--batch-size',
+            dest='batch_size',
+            type='int',
+            default=1000,
+            help='number of products updated per bulk write (default: 1000)',
+        )
+
+    def run(self, args, opts):
+        db = mongo_db_helper.MongoDBHelper.get_database(self.settings)
+        products_collection = db[
+            self.settings.get('MONGODB_COLLECTION_PRODUCTS')
+        ]
+        mongo_db_index_manager.MongoDBIndexManager(
+            db=db,
+            settings=self.settings,
+        ).create_missing_indexes()
+
+        requests = []
+        updated = 0
+
+        for document in products_collection.find(
+            filter={product.Product.KEY_BRAND_KEY: {'$exists': False}},
+            projection=[product.Product.KEY_BRAND],
+        ):
+            requests.append(pymongo.UpdateOne(
+                filter={product.Product.KEY_ID: document[
+                    product.Product.KEY_ID
+                ]},
+                update={'$set': {
+                    product.Product.KEY_BRAND_KEY: brand_key_helper \
+                        .BrandKeyHelper.create_brand_keys(
+                            document.get(product.Product.KEY_BRAND)
+                        ),
+                }},
+            ))
+
+            if len(requests) >= opts.batch_size:
+                updated += products_collection.bulk_write(
+                    requests,
+                    ordered=False,
+                ).modified_count
+                requests = []
+
+        if requests:
+            updated += products_collection.bulk_write(
+                requests,
+                ordered=False,
+            ).modified_count
+
+        logging.info(f'Backfilled brand keys of {updated} products.')
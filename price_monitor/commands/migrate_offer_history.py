@@ -0,0 +1,83 @@
+import logging
+import pymongo
+from scrapy.commands import ScrapyCommand
+from price_monitor.helpers import (
+    mongo_db_helper,
+)
+from price_monitor.items import (
+    offer,
+)
+from price_monitor.storage import (
+    mongo_db_index_manager,
+    offer_history_store,
+)
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return '[options]'
+
+    def short_desc(self):
+        return 'Copy the offers collection into monthly offer history buckets'
+
+    def add_options(self, parser):
+        ScrapyCommand.add_options(self, parser)
+        parser.add_option(
+            '--batch-size',
+            dest='batch_size',
+            type='int',
+            default=1000,
+            help='number of offers read per bulk write (default: 1000)',
+        )
+        parser.add_option(
+            '--drop',
+            dest='drop',
+            action='store_true',
+            help='drop the offer history first, buckets are appended to ' \
+                'otherwise so running twice duplicates points',
+        )
+
+    def run(self, args, opts):
+        db = mongo_db_helper.MongoDBHelper.get_database(self.settings)
+        offers_collection = db[self.settings.get('MONGODB_COLLECTION_OFFERS')]
+        offer_history_collection = db[
+            self.settings.get('MONGODB_COLLECTION_OFFER_HISTORY')
+        ]
+
+        if opts.drop:
+            offer_history_collection.drop()
+
+        # The buckets layout is usually enabled after the migration.
+        settings = self.settings.copy()
+        settings.set(
+            'MONGODB_OFFERS_LAYOUT',
+            offer_history_store.OfferHistoryStore.LAYOUT_BUCKETS,
+        )
+        mongo_db_index_manager.MongoDBIndexManager(
+            db=db,
+            settings=settings,
+        ).create_missing_indexes()
+
+        store = offer_history_store.OfferHistoryStore(
+            offer_history_collection=offer_history_collection,
+        )
+        offer_dictionaries = []
+        migrated = 0
+
+        # Sorted on the offers index so buckets receive points in order.
+        for offer_dictionary in offers_collection.find().sort([
+            (offer.Offer.KEY_PRODUCT_ID, pymongo.ASCENDING),
+            (offer.Offer.KEY_STORE_ID, pymongo.ASCENDING),
+            (offer.Offer.KEY_CREATED, pymongo.ASCENDING),
+        ]):
+            offer_dictionaries.append(offer_dictionary)
+
+            if len(offer_dictionaries) >= opts.batch_size:
+                migrated += store.write_offers(offer_dictionaries)
+                offer_dictionaries = []
+
+        if offer_dictionaries:
+            migrated += store.write_offers(offer_dictionaries)
+
+        logging.info(f'Migrated {migrated} offers to the offer history.')
@@ -0,0 +1,36 @@
+from scrapy.commands import ScrapyCommand
+from price_monitor.helpers import (
+    mongo_db_helper,
+)
+from price_monitor.storage import (
+    mongo_db_index_manager,
+)
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return '[options]'
+
+    def short_desc(self):
+        return 'Report missing or unused indexes, create the missing ones with --create'
+
+    def add_options(self, parser):
+        ScrapyCommand.add_options(self, parser)
+        parser.add_option(
+            '--create',
+            dest='create',
+            action='store_true',
+            help='create the missing indexes',
+        )
+
+    def run(self, args, opts):
+        index_manager = mongo_db_index_manager.MongoDBIndexManager(
+            db=mongo_db_helper.MongoDBHelper.get_database(self.settings),
+            settings=self.settings,
+        )
+
+        if opts.create:
+            index_manager.create_missing_indexes()
+
+        index_manager.report()
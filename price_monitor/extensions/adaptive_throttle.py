@@ -0,0 +1,152 @@
+import logging
+import time
+from collections import deque
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from price_monitor.models import (
+    throttle_policy,
+)
+
+class SlotState(object):
+    def __init__(self, errors: deque):
+        self.errors = errors
+        self.backed_off = 0.0
+
+class AdaptiveThrottle(object):
+    """Adjusts the delay and concurrency of each download slot (AIMD).
+
+    Healthy responses remove the policy's delay step, then add a request
+    in parallel up to the target concurrency. Too many throttled, failed or
+    slow responses, timeouts and connection errors multiply the delay and
+    halve the concurrency.
+    """
+
+    THROTTLE_STATUSES = [429, 503]
+    META_SENT = 'adaptive_throttle_sent'
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.debug = crawler.settings.getbool('ADAPTIVE_THROTTLE_DEBUG')
+        self.max_concurrency = crawler.settings.getint(
+            'CONCURRENT_REQUESTS_PER_DOMAIN'
+        )
+        self.policy = None
+        self.slot_states = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ADAPTIVE_THROTTLE_ENABLED'):
+            raise NotConfigured
+
+        s = cls(crawler)
+        # For AdaptiveThrottleDownloaderMiddleware.
+        crawler.adaptive_throttle = s
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(
+            s.response_downloaded,
+            signal=signals.response_downloaded,
+        )
+        return s
+
+    def spider_opened(self, spider):
+        # Spiders inherit the policy of their store model.
+        self.policy = getattr(spider, 'throttle_policy', None) \
+            or throttle_policy.ThrottlePolicy()
+        # New slots start from these.
+        spider.download_delay = self.policy.start_delay
+        spider.max_concurrent_requests = 1
+
+    def response_downloaded(self, response, request, spider):
+        latency = request.meta.get('download_latency')
+
+        if latency is None:
+            return
+
+        self.__record(
+            request,
+            response.status in self.THROTTLE_STATUSES \
+                or response.status >= 500 \
+                or latency > self.policy.max_latency,
+            latency,
+            response,
+            f'status: {response.status}',
+        )
+
+    def download_failed(self, request, exception, spider):
+        sent = request.meta.get(self.META_SENT)
+
+        if sent is None:
+            return
+
+        self.crawler.stats.inc_value('adaptive_throttle/download_errors')
+        self.__record(
+            request,
+            True,
+            time.time() - sent,
+            None,
+            f'error: {type(exception).__name__}',
+        )
+
+    def __record(self, request, is_error, latency, response, outcome):
+        key, slot = self.__get_slot(request)
+
+        if slot is None or request.meta.get('dont_throttle'):
+            return
+
+        state = self.slot_states.setdefault(
+            key,
+            SlotState(deque(maxlen=self.policy.window)),
+        )
+        state.errors.append(is_error)
+        old_delay, old_concurrency = slot.delay, slot.concurrency
+
+        if is_error:
+            # Requests sent before the last back off don't count again.
+            if time.time() - latency > state.backed_off \
+                and sum(state.errors) / len(state.errors) \
+                    > self.policy.max_error_rate:
+                self.__back_off(slot, response)
+                state.errors.clear()
+                state.backed_off = time.time()
+        elif slot.delay > self.policy.min_delay:
+            slot.delay = max(
+                self.policy.min_delay,
+                slot.delay - self.policy.delay_step,
+            )
+        elif slot.concurrency < self.__get_target_concurrency():
+            slot.concurrency += 1
+
+        if self.debug:
+            logging.log(
+                logging.INFO,
+                f'slot: {key} | {outcome} | '
+                f'latency: {latency * 1000:.0f} ms | '
+                f'delay: {old_delay:.2f} -> {slot.delay:.2f} s | '
+                f'concurrency: {old_concurrency} -> {slot.concurrency}'
+            )
+
+    def __back_off(self, slot, response):
+        delay = max(slot.delay, self.policy.min_delay, 1.0) \
+            * self.policy.backoff_factor
+        slot.delay = min(
+            self.policy.max_delay,
+            max(delay, self.__get_retry_after(response)),
+        )
+        slot.concurrency = max(1, slot.concurrency // 2)
+        self.crawler.stats.inc_value('adaptive_throttle/backoffs')
+
+    def __get_retry_after(self, response) -> float:
+        if response is None:
+            return 0.0
+
+        try:
+            return float(response.headers.get('Retry-After', b'0'))
+        except ValueError: # HTTP dates are not honored.
+            return 0.0
+
+    def __get_target_concurrency(self) -> int:
+        return min(self.policy.target_concurrency, self.max_concurrency)
+
+    def __get_slot(self, request):
+        key = request.meta.get('download_slot')
+        return key, self.crawler.engine.downloader.slots.get(key)
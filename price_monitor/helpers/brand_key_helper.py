@@ -0,0 +1,44 @@
+import unicodedata
+from typing import (
+    List,
+    Optional,
+)
+from price_monitor.items import (
+    text,
+)
+
+class BrandKeyHelper:
+    @staticmethod
+    def create_brand_key(brand: str) -> str:
+        # "Leon's", "LEONS" and "Léon’s" all become "leons".
+        decomposed = unicodedata.normalize('NFKD', brand.casefold())
+
+        return ''.join(
+            character for character in decomposed
+            if character.isalnum() and not unicodedata.combining(character)
+        )
+
+    @staticmethod
+    def create_brand_keys(brand) -> List[str]:
+        result = []
+
+        for value in brand if isinstance(brand, list) else [brand]:
+            # Brands are plain strings or text fields.
+            if isinstance(value, dict):
+                value = value.get(text.Text.KEY_VALUE)
+
+            if not isinstance(value, str):
+                continue
+
+            brand_key = BrandKeyHelper.create_brand_key(value)
+
+            if brand_key and brand_key not in result:
+                result.append(brand_key)
+
+        return result
+
+    @staticmethod
+    def create_first_brand_key(brand) -> Optional[str]:
+        brand_keys = BrandKeyHelper.create_brand_keys(brand)
+
+        return brand_keys[0] if brand_keys else None
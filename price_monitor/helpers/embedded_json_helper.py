@@ -0,0 +1,96 @@
+import json
+import logging
+import re
+from typing import (
+    Any,
+    Optional,
+    Union,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class EmbeddedJsonHelper:
+    ASSIGNMENT_PATTERN = re.compile(rb'\s*=\s*')
+    # Strings are matched whole so braces inside them are skipped.
+    TOKEN_PATTERN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]]', re.DOTALL)
+    OPENING_BYTES = b'{['
+    SCRIPT_END = b'</script>'
+
+    @staticmethod
+    def loads(data: Union[bytes, memoryview, str]) -> Any:
+        if orjson:
+            return orjson.loads(data)
+
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+
+        return json.loads(data)
+
+    @staticmethod
+    def find_assignment(body: bytes, variable: str) -> Optional[Any]:
+        """Returns the JSON assigned to variable (window.X = {...};)."""
+        name = variable.encode('utf-8')
+        start = body.find(name)
+
+        while start != -1:
+            match = EmbeddedJsonHelper.ASSIGNMENT_PATTERN.match(
+                body,
+                start + len(name),
+            )
+
+            if match and body[match.end():match.end() + 1] \
+                and body[match.end()] in EmbeddedJsonHelper.OPENING_BYTES:
+                return EmbeddedJsonHelper.__load_value(body, match.end())
+
+            start = body.find(name, start + len(name))
+
+        return None
+
+    @staticmethod
+    def __load_value(body: bytes, start: int) -> Optional[Any]:
+        view = memoryview(body)
+        closing = b'}' if body[start] == ord('{') else b']'
+        script_end = body.find(EmbeddedJsonHelper.SCRIPT_END, start)
+
+        # Usually the assignment is the last statement of its script.
+        if script_end != -1:
+            end = body.rfind(closing, start, script_end) + 1
+
+            try:
+                return EmbeddedJsonHelper.loads(view[start:end])
+            except ValueError:
+                pass
+
+        end = EmbeddedJsonHelper.__find_value_end(body, start)
+
+        if end is None:
+            logging.warning('Unable to find the end of the embedded JSON.')
+
+            return None
+
+        try:
+            return EmbeddedJsonHelper.loads(view[start:end])
+        except ValueError as error:
+            logging.warning(f'Unable to load embedded JSON: {error}')
+
+        return None
+
+    @staticmethod
+    def __find_value_end(body: bytes, start: int) -> Optional[int]:
+        depth = 0
+
+        for match in EmbeddedJsonHelper.TOKEN_PATTERN.finditer(body, start):
+            token = body[match.start()]
+
+            if token == ord('"'):
+                continue
+
+            depth += 1 if token in EmbeddedJsonHelper.OPENING_BYTES else -1
+
+            if depth == 0:
+                return match.end()
+
+        return None
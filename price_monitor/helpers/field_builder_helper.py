@@ -0,0 +1,106 @@
+from scrapy.utils.misc import arg_to_iter
+from w3lib.html import (
+    remove_tags,
+    replace_entities,
+    replace_escape_chars,
+    strip_html5_whitespace,
+)
+from price_monitor.items import (
+    global_trade_item_number_item,
+    image,
+    text,
+)
+from typing import (
+    Callable,
+    Dict,
+    Optional,
+    Tuple,
+    Union,
+)
+
+class FieldBuilderHelper:
+    # Same cleaning as the default input processors of the text, GTIN and
+    # image item loaders.
+    TEXT_FUNCTIONS = (
+        remove_tags,
+        replace_escape_chars,
+        replace_entities,
+        strip_html5_whitespace,
+    )
+    GTIN_FUNCTIONS = (remove_tags, replace_escape_chars, replace_entities)
+    IMAGE_FUNCTIONS = (remove_tags, replace_escape_chars, replace_entities)
+
+    @staticmethod
+    def clean(value, functions: Tuple[Callable, ...]) -> Optional[str]:
+        # MapCompose(*functions) then TakeFirst(), without a loader.
+        for result in arg_to_iter(value):
+            for function in functions:
+                result = function(result)
+
+            if result is not None and result != '':
+                return result
+
+        return None
+
+    @staticmethod
+    def create_text_field(value, language) -> Dict[str, str]:
+        return FieldBuilderHelper.__create_dictionary([
+            (
+                text.Text.KEY_VALUE,
+                value,
+                FieldBuilderHelper.TEXT_FUNCTIONS,
+            ),
+            (
+                text.Text.KEY_LANGUAGE,
+                language,
+                FieldBuilderHelper.TEXT_FUNCTIONS,
+            ),
+        ])
+
+    @staticmethod
+    def create_gtin_field(type, value) -> Dict[str, str]:
+        return FieldBuilderHelper.__create_dictionary([
+            (
+                global_trade_item_number_item.GlobalTradeItemNumberItem \
+                    .KEY_VALUE,
+                value,
+                FieldBuilderHelper.GTIN_FUNCTIONS,
+            ),
+            (
+                global_trade_item_number_item.GlobalTradeItemNumberItem \
+                    .KEY_GTIN_TYPE,
+                type,
+                FieldBuilderHelper.GTIN_FUNCTIONS,
+            ),
+        ])
+
+    @staticmethod
+    def create_image_field(
+        url,
+        language=None,
+    ) -> Dict[str, Union[str, bool]]:
+        return FieldBuilderHelper.__create_dictionary([
+            (
+                image.Image.KEY_LANGUAGE,
+                language,
+                FieldBuilderHelper.IMAGE_FUNCTIONS,
+            ),
+            (
+                image.Image.KEY_URL,
+                url,
+                FieldBuilderHelper.IMAGE_FUNCTIONS,
+            ),
+        ])
+
+    @staticmethod
+    def __create_dictionary(fields) -> Dict[str, str]:
+        # Like a loaded item, fields without a value are left out.
+        result = {}
+
+        for key, value, functions in fields:
+            value = FieldBuilderHelper.clean(value, functions)
+
+            if value is not None:
+                result[key] = value
+
+        return result
@@ -8,9 +8,10 @@ from price_monitor.items import (
     language_data,
     text,
 )
+from price_monitor.helpers import (
+    field_builder_helper,
+)
 from price_monitor.item_loaders import (
-    global_trade_item_number_loader,
-    image_item_loader,
     language_data_item_loader,
     text_item_loader,
 )
@@ -31,11 +32,11 @@ class ItemLoaderHelper:
         value: str, 
         language: str,
     ) -> Dict[str, Dict[str, str]]:
-        item_loader = text_item_loader.TextItemLoader(response=response)
-        item_loader.add_value(text.Text.KEY_VALUE, value)
-        item_loader.add_value(text.Text.KEY_LANGUAGE, language)
-        
-        return item_loader.load_item().get_dictionary()
+        # Built without a loader, which would parse the response again.
+        return field_builder_helper.FieldBuilderHelper.create_text_field(
+            value=value,
+            language=language,
+        )
     
     @staticmethod
     def _create_text_field_as_language_lookup(
@@ -59,24 +60,11 @@ class ItemLoaderHelper:
         type: str, 
         value: str,
     ) -> Dict[str, str]:
-        gtinItemLoader = \
-            global_trade_item_number_loader.GlobalTradeItemNumberItemLoader(
-                response=response
-            )
-        gtinItemLoader.add_value(
-            field_name=global_trade_item_number_item. \
-                GlobalTradeItemNumberItem.KEY_VALUE, 
-            value=value
-        )
-        gtinItemLoader.add_value(
-            field_name=global_trade_item_number_item \
-                .GlobalTradeItemNumberItem \
-                .KEY_GTIN_TYPE, 
-            value=type
+        return field_builder_helper.FieldBuilderHelper.create_gtin_field(
+            type=type,
+            value=value,
         )
 
-        return dict(gtinItemLoader.load_item())
-
     @staticmethod
     def _create_image_field(
         response: HtmlResponse, 
@@ -84,11 +72,10 @@ class ItemLoaderHelper:
         source: Optional[str] = None,
         language: Optional[str] = None,
     ) -> Dict[str, Union[str, bool]]:
-        item_loader = image_item_loader.ImageItemLoader(response=response)
-        item_loader.add_value(image.Image.KEY_LANGUAGE, language)
-        item_loader.add_value(image.Image.KEY_URL, url)
-        
-        return dict(item_loader.load_item())
+        return field_builder_helper.FieldBuilderHelper.create_image_field(
+            url=url,
+            language=language,
+        )
         
     @staticmethod
     def _create_image_field_from_list(
@@ -115,9 +102,9 @@ class ItemLoaderHelper:
         description: Optional[str] = None,
         breadcrumbs: Optional[List] = None,
     ) -> List[str]:
-        item_loader = language_data_item_loader.LanguageDataItemLoader(
-            response=response
-        ).add_name(name=name) \
+        # Without the response, which the loader would parse again.
+        item_loader = language_data_item_loader.LanguageDataItemLoader() \
+        .add_name(name=name) \
         .add_brand(brand=brand) \
         .add_images(images=images) \
         .add_url(url=url)
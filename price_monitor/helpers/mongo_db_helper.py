@@ -0,0 +1,24 @@
+import pymongo
+import threading
+from pymongo.database import Database
+from scrapy.settings import Settings
+
+class MongoDBHelper:
+    # Clients are thread safe and pool their connections, so every spider
+    # and pipeline of the process shares one per server.
+    clients = {}
+    clients_lock = threading.Lock()
+
+    @staticmethod
+    def get_database(settings: Settings) -> Database:
+        return MongoDBHelper.get_client(settings)[settings.get('MONGODB_DB')]
+
+    @staticmethod
+    def get_client(settings: Settings) -> pymongo.MongoClient:
+        key = (settings.get('MONGODB_SERVER'), settings.get('MONGODB_PORT'))
+
+        with MongoDBHelper.clients_lock:
+            if key not in MongoDBHelper.clients:
+                MongoDBHelper.clients[key] = pymongo.MongoClient(*key)
+
+            return MongoDBHelper.clients[key]
@@ -0,0 +1,72 @@
+import bson
+import datetime
+import json
+from bson.codec_options import (
+    CodecOptions,
+    TypeRegistry,
+)
+from bson.objectid import ObjectId
+from typing import (
+    Any,
+    Dict,
+)
+from price_monitor.items import (
+    record,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class RecordSerializerHelper:
+    # Lets bson encode records, wherever they are nested, as documents.
+    CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry(
+        fallback_encoder=lambda value: value.get_dictionary() \
+            if isinstance(value, record.Record) else value
+    ))
+
+    @staticmethod
+    def to_bson(value: Any) -> bytes:
+        return bson.encode(
+            RecordSerializerHelper.create_document(value),
+            codec_options=RecordSerializerHelper.CODEC_OPTIONS,
+        )
+
+    @staticmethod
+    def to_json(value: Any) -> bytes:
+        document = RecordSerializerHelper.create_document(value)
+
+        if orjson:
+            return orjson.dumps(
+                document,
+                default=RecordSerializerHelper.__encode_json_value,
+            )
+
+        return json.dumps(
+            document,
+            default=RecordSerializerHelper.__encode_json_value,
+            ensure_ascii=False,
+            separators=(',', ':'),
+        ).encode('utf-8')
+
+    @staticmethod
+    def create_document(value: Any) -> Dict:
+        # Items and records serialize like get_dictionary.
+        if hasattr(value, 'get_dictionary'):
+            return value.get_dictionary()
+
+        return dict(value)
+
+    @staticmethod
+    def __encode_json_value(value: Any) -> Any:
+        if isinstance(value, record.Record):
+            return value.get_dictionary()
+
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+
+        if isinstance(value, ObjectId):
+            return str(value)
+
+        raise TypeError(f'Unable to serialize {type(value).__name__}.')
@@ -2,7 +2,11 @@ from __future__ import annotations
 from scrapy.loader import ItemLoader
 from scrapy.loader.processors import Identity, MapCompose, TakeFirst
 from w3lib.html import replace_entities, replace_escape_chars, remove_tags
-from price_monitor.items import language_data
+from price_monitor.items import (
+    language_data,
+    language_data_record,
+)
+from scrapy.utils.project import get_project_settings
 from price_monitor.item_loaders import product_item_loader
 from scrapy.http.response.html import HtmlResponse
 from price_monitor.helpers import input_processor_helper
@@ -21,7 +25,9 @@ class LanguageDataItemLoader(ItemLoader):
         replace_entities,
     )
     default_output_processor = TakeFirst()
-    default_item_class = language_data.LanguageData
+    default_item_class = language_data_record.LanguageDataRecord \
+        if get_project_settings().getbool('ITEM_RECORDS_ENABLED') \
+        else language_data.LanguageData
     images_out = Identity()
     breadcrumbs_out = Identity()
 
@@ -2,12 +2,18 @@ from __future__ import annotations
 from scrapy.loader import ItemLoader
 from scrapy.loader.processors import MapCompose, TakeFirst
 from w3lib.html import remove_tags
-from price_monitor.items import offer
+from scrapy.utils.project import get_project_settings
+from price_monitor.items import (
+    offer,
+    offer_record,
+)
 
 class OfferItemLoader(ItemLoader):
     default_input_processor = MapCompose(remove_tags)
     default_output_processor = TakeFirst()
-    default_item_class = offer.Offer
+    default_item_class = offer_record.OfferRecord \
+        if get_project_settings().getbool('ITEM_RECORDS_ENABLED') \
+        else offer.Offer
 
     def add_amount(self, amount: str) -> OfferItemLoader:
         self.add_value(
@@ -9,7 +9,9 @@ from price_monitor.helpers import (
 )
 from price_monitor.items import (
     product_data,
+    product_data_record,
 )
+from scrapy.utils.project import get_project_settings
 from price_monitor.models import (
     global_trade_item_number,
 )
@@ -28,7 +30,9 @@ class ProductDataItemLoader(ItemLoader):
         replace_entities,
     )
     default_output_processor = TakeFirst()
-    default_item_class = product_data.ProductData
+    default_item_class = product_data_record.ProductDataRecord \
+        if get_project_settings().getbool('ITEM_RECORDS_ENABLED') \
+        else product_data.ProductData
     gtin_in = Identity()
     language_data_in = Identity()
 
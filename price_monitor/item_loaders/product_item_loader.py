@@ -10,7 +10,11 @@ from w3lib.html import (
     replace_escape_chars,
     remove_tags
 )
-from price_monitor.items import product
+from price_monitor.items import (
+    product,
+    product_record,
+)
+from scrapy.utils.project import get_project_settings
 from scrapy.http.response.html import HtmlResponse
 from price_monitor.helpers import (
     item_loader_helper,
@@ -44,7 +48,9 @@ class ProductItemLoader(ItemLoader):
         replace_entities
     )
     default_output_processor = TakeFirst()
-    default_item_class = product.Product
+    default_item_class = product_record.ProductRecord \
+        if get_project_settings().getbool('ITEM_RECORDS_ENABLED') \
+        else product.Product
     brand_in = Identity()
     brand_out = Identity()
     current_offer_in = Identity()
@@ -0,0 +1,8 @@
+from price_monitor.items import (
+    language_data,
+    record,
+)
+
+class LanguageDataRecord(record.Record):
+    __slots__ = tuple(language_data.LanguageData.fields)
+    FIELDS = frozenset(__slots__)
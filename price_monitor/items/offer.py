@@ -14,6 +14,7 @@ class Offer(Item):
     KEY_DATETIME = 'datetime' 
     KEY_END_DATE = 'end_date' # TODO: End date, some stores provide this info.
     KEY_ID = '_id'  
+    KEY_LAST_SEEN = 'last_seen' # Not an item field.
     KEY_PRODUCT_ID = 'product_id'
     # KEY_SKU = 'sku' # TODO: SKU is bad for offer, store could reuse for all items in a case.
     KEY_SOLD_BY = 'sold_by'
@@ -0,0 +1,15 @@
+from typing import Dict
+from price_monitor.items import (
+    offer,
+    record,
+)
+
+class OfferRecord(record.Record):
+    __slots__ = tuple(offer.Offer.fields)
+    FIELDS = frozenset(__slots__)
+    VERSION_SETTING = 'OFFER_ITEM_VERSION'
+
+    def get_dictionary(self) -> Dict:
+        dictionary = super().get_dictionary()
+        dictionary[offer.Offer.KEY_VERSION] = self.get_version()
+        return dictionary
@@ -7,6 +7,7 @@ from scrapy.utils.project import get_project_settings
 class Product(Item):
     # Array indexes.
     KEY_BRAND = 'brand'
+    KEY_BRAND_KEY = 'brand_key' # Not an item field.
     KEY_CREATED = 'created'
     KEY_CURRENT_OFFER = 'current_offer' # Sub dictionary.
     KEY_GTIN = 'gtin' # TODO: Multiple.
@@ -14,6 +15,7 @@ class Product(Item):
     KEY_LANGUAGE = 'language'
     KEY_MODEL_NUMBER = 'model_number'
     KEY_NAME = 'name'
+    KEY_NOT_MODIFIED = 'not_modified' # Not stored.
     KEY_PRODUCT_DATA = 'product_data' # Sub dictionary.
     KEY_STORE = 'store' # Sub dictionary.
     KEY_SUPPORTED_LANGUAGES = 'supported_languages'
@@ -32,6 +34,7 @@ class Product(Item):
     language = Field() # TODO: Pop before upload.
     model_number = Field()
     name = Field()
+    not_modified = Field() # Scraped again after a 304.
     product_data = Field() # Sub dictionary.
     store = Field() # Sub dictionary.
     supported_languages = Field()
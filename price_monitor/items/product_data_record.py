@@ -0,0 +1,19 @@
+from typing import Dict
+from price_monitor.items import (
+    product_data,
+    record,
+)
+
+class ProductDataRecord(record.Record):
+    __slots__ = tuple(product_data.ProductData.fields)
+    FIELDS = frozenset(__slots__)
+
+    def get_dictionary(self) -> Dict:
+        value_dict = super().get_dictionary()
+
+        # Keyed like ProductData.get_dictionary.
+        return {
+            f'{value_dict[product_data.ProductData.KEY_STORE_ID]} '
+            f'({value_dict[product_data.ProductData.KEY_SOLD_BY]})' \
+                .replace('.', ''): value_dict
+        }
@@ -0,0 +1,15 @@
+from typing import Dict
+from price_monitor.items import (
+    product,
+    record,
+)
+
+class ProductRecord(record.Record):
+    __slots__ = tuple(product.Product.fields)
+    FIELDS = frozenset(__slots__)
+    VERSION_SETTING = 'PRODUCT_ITEM_VERSION'
+
+    def get_dictionary(self) -> Dict:
+        dictionary = super().get_dictionary()
+        dictionary[product.Product.KEY_VERSION] = self.get_version()
+        return dictionary
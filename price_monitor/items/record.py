@@ -0,0 +1,120 @@
+from collections.abc import MutableMapping
+from itemadapter import ItemAdapter
+from itemadapter.adapter import DictAdapter
+from typing import (
+    Any,
+    Dict,
+)
+from scrapy.utils.project import get_project_settings
+
+UNSET = object()
+
+class Record(MutableMapping):
+    """Item with one slot per field instead of a dictionary of values.
+
+    Records read and write like items, and like them leave unset fields out.
+    Subclasses declare the fields of their item class as slots.
+    """
+
+    __slots__ = ()
+    FIELDS = frozenset()
+    VERSION_SETTING = None
+    version_value = None
+
+    def __init__(self, *args, **kwargs):
+        # Unset slots hold UNSET, reading an empty slot would raise.
+        for key in self.__slots__:
+            setattr(self, key, UNSET)
+
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key, UNSET) if key in self.FIELDS else UNSET
+
+        if value is UNSET:
+            raise KeyError(key)
+
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.FIELDS:
+            raise KeyError(
+                f'{self.__class__.__name__} does not support field: {key}'
+            )
+
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+
+        setattr(self, key, UNSET)
+
+    def __contains__(self, key) -> bool:
+        return key in self.FIELDS and getattr(self, key) is not UNSET
+
+    def __iter__(self):
+        return (
+            key for key in self.__slots__ if getattr(self, key) is not UNSET
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and dict(self) == dict(other)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({dict(self)!r})'
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, state: Dict):
+        self.__init__(state)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, UNSET) if key in self.FIELDS else UNSET
+
+        return default if value is UNSET else value
+
+    def copy(self) -> 'Record':
+        return self.__class__(self)
+
+    def get_dictionary(self) -> Dict:
+        # Records nested deeper are converted when serialized.
+        result = {}
+
+        for key in self.__slots__:
+            value = getattr(self, key)
+
+            if value is UNSET:
+                continue
+
+            result[key] = value.get_dictionary() \
+                if isinstance(value, Record) else value
+
+        return result
+
+    @classmethod
+    def get_version(cls):
+        if cls.version_value is None and cls.VERSION_SETTING:
+            cls.version_value = get_project_settings().get(
+                cls.VERSION_SETTING
+            )
+
+        return cls.version_value
+
+class RecordAdapter(DictAdapter):
+    # Lets Scrapy and the item loaders handle records like dictionaries.
+
+    @classmethod
+    def is_item(cls, item: Any) -> bool:
+        return isinstance(item, Record)
+
+    @classmethod
+    def is_item_class(cls, item_class: type) -> bool:
+        return issubclass(item_class, Record)
+
+ItemAdapter.ADAPTER_CLASSES.appendleft(RecordAdapter)
@@ -0,0 +1,31 @@
+import time
+from scrapy.downloadermiddlewares.retry import RetryMiddleware
+from scrapy.exceptions import NotConfigured
+
+class AdaptiveThrottleDownloaderMiddleware(object):
+    # Reports timeouts and connection errors to the adaptive throttle, no
+    # signal is sent for them. Ordered after the retry middleware (550),
+    # which would otherwise handle the exception first.
+
+    def __init__(self, throttle):
+        self.throttle = throttle
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        throttle = getattr(crawler, 'adaptive_throttle', None)
+
+        if throttle is None:
+            raise NotConfigured
+
+        return cls(throttle)
+
+    def process_request(self, request, spider):
+        request.meta[self.throttle.META_SENT] = time.time()
+
+        return None
+
+    def process_exception(self, request, exception, spider):
+        if isinstance(exception, RetryMiddleware.EXCEPTIONS_TO_RETRY):
+            self.throttle.download_failed(request, exception, spider)
+
+        return None
@@ -0,0 +1,166 @@
+import copy
+import datetime
+import logging
+import os
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.project import data_path
+from price_monitor.items import (
+    offer,
+    product,
+    product_record,
+)
+from price_monitor.storage import (
+    validator_store,
+)
+
+DOWNLOADER_MIDDLEWARE = 'price_monitor.middlewares.' \
+    'conditional_request_middleware.ConditionalRequestDownloaderMiddleware'
+RENDERING_MIDDLEWARE = 'PriceMonitorDownloaderMiddleware'
+
+class NotModified(Exception):
+    pass
+
+def get_validator_store(crawler) -> validator_store.ValidatorStore:
+    # Both middlewares share one connection, a second one would wait on the
+    # other's uncommitted writes. Each spider has its own file, spiders run
+    # at once by the runner would lock each other's.
+    if not crawler.settings.getbool('CONDITIONAL_REQUESTS_ENABLED'):
+        raise NotConfigured
+
+    if not hasattr(crawler, 'validator_store'):
+        crawler.validator_store = validator_store.ValidatorStore(
+            os.path.join(
+                data_path(
+                    crawler.settings.get('CONDITIONAL_REQUESTS_DIR'),
+                    createdir=True,
+                ),
+                f'{crawler.spidercls.name}.sqlite',
+            )
+        )
+        crawler.signals.connect(
+            lambda spider: crawler.validator_store.close(),
+            signal=signals.spider_closed,
+            weak=False,
+        )
+
+    return crawler.validator_store
+
+class ConditionalRequestDownloaderMiddleware(object):
+    # Sends the validators of the last response of a page, so unchanged
+    # pages come back as an empty 304.
+
+    def __init__(self, store: validator_store.ValidatorStore):
+        self.store = store
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(get_validator_store(crawler))
+
+    def process_request(self, request, spider):
+        validators = self.store.get(request.url)
+
+        # Without an item a 304 could not be scraped again.
+        if not validators or not validators[self.store.KEY_ITEM]:
+            return None
+
+        if validators[self.store.KEY_ETAG]:
+            request.headers.setdefault(
+                'If-None-Match',
+                validators[self.store.KEY_ETAG],
+            )
+
+        if validators[self.store.KEY_LAST_MODIFIED]:
+            request.headers.setdefault(
+                'If-Modified-Since',
+                validators[self.store.KEY_LAST_MODIFIED],
+            )
+
+        request.meta['handle_httpstatus_list'] = \
+            request.meta.get('handle_httpstatus_list', []) + [304]
+
+        return None
+
+    def process_response(self, request, response, spider):
+        if response.status == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+            if etag or last_modified:
+                self.store.set_validators(
+                    request.url,
+                    etag.decode('latin-1') if etag else None,
+                    last_modified.decode('latin-1') if last_modified \
+                        else None,
+                )
+
+        return response
+
+class ConditionalRequestSpiderMiddleware(object):
+    # Keeps the items scraped from each page and scrapes them again, marked
+    # as not modified, instead of calling the callback for a 304.
+
+    def __init__(self, store: validator_store.ValidatorStore):
+        self.store = store
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        # Stores setting DOWNLOADER_MIDDLEWARES replace the project's.
+        enabled = [
+            (name if isinstance(name, str) else name.__name__) \
+                .split('.')[-1]
+            for name, order in crawler.settings.getwithbase(
+                'DOWNLOADER_MIDDLEWARES'
+            ).items()
+            if order is not None
+        ]
+
+        # The browser requests rendered pages, without validators.
+        if RENDERING_MIDDLEWARE in enabled:
+            raise NotConfigured
+
+        if ConditionalRequestDownloaderMiddleware.__name__ not in enabled:
+            logging.error(
+                f'{DOWNLOADER_MIDDLEWARE} is not enabled for '
+                f'{crawler.spidercls.name}, no conditional request is sent.'
+            )
+            raise NotConfigured
+
+        return cls(get_validator_store(crawler))
+
+    def process_spider_input(self, response, spider):
+        if response.status == 304:
+            raise NotModified()
+
+        return None
+
+    def process_spider_output(self, response, result, spider):
+        for i in result:
+            if response.status == 200 and isinstance(
+                i,
+                (product.Product, product_record.ProductRecord),
+            ):
+                self.store.set_item(response.url, dict(copy.deepcopy(i)))
+
+            yield i
+
+    def process_spider_exception(self, response, exception, spider):
+        if not isinstance(exception, NotModified):
+            return None
+
+        spider.crawler.stats.inc_value('conditional_requests/not_modified')
+        item = self.store.get_item(response.url)
+
+        if not item:
+            logging.warning(f'No item to scrape again for {response.url}.')
+            return []
+
+        item = product.Product(item)
+        item[product.Product.KEY_NOT_MODIFIED] = True
+
+        if item.get(product.Product.KEY_CURRENT_OFFER):
+            item[product.Product.KEY_CURRENT_OFFER][
+                offer.Offer.KEY_DATETIME
+            ] = datetime.datetime.utcnow().isoformat()
+
+        return [item]
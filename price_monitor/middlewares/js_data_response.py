@@ -0,0 +1,26 @@
+import json
+from scrapy.http import Response
+
+class JsDataResponse(Response):
+    """The JSON of a page's js_global_variable, without the page's HTML.
+
+    Returned for requests with the js_data_only meta flag. There is no HTML,
+    so selectors built by item loaders see an empty document.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_js_data = None
+        self._js_data_loaded = False
+
+    @property
+    def text(self):
+        return ''
+
+    @property
+    def js_data(self):
+        if not self._js_data_loaded:
+            self._cached_js_data = json.loads(self.body) if self.body else None
+            self._js_data_loaded = True
+
+        return self._cached_js_data
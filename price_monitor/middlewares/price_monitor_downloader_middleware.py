@@ -1,8 +1,24 @@
 # -*- coding: utf-8 -*-
 
+import logging
 from scrapy import signals
 from scrapy.http import HtmlResponse
+from scrapy.utils.project import (
+    data_path,
+    get_project_settings,
+)
+from scrapy.utils.request import request_fingerprint
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+from selenium.webdriver.support.ui import WebDriverWait
+from price_monitor.middlewares import (
+    js_data_response,
+    web_driver_pool,
+)
+from price_monitor.storage import (
+    rendered_page_cache,
+)
 
 class PriceMonitorDownloaderMiddleware(object):
     # Not all methods need to be defined. If a method is not defined,
@@ -11,17 +27,32 @@ class PriceMonitorDownloaderMiddleware(object):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        options = webdriver.ChromeOptions()
-        options.add_argument('headless')
-        options.add_argument('window-size=1920x1080')
-        options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_13_6) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/12.0.3 Safari/605.1.15")
-        self.driver = webdriver.Chrome(chrome_options=options)
+        settings = get_project_settings()
+        self.page_load_strategy = settings.get('SELENIUM_PAGE_LOAD_STRATEGY')
+        self.blocked_url_patterns = settings.getlist(
+            'SELENIUM_BLOCKED_URL_PATTERNS'
+        )
+        self.js_wait_timeout = settings.getfloat('SELENIUM_JS_WAIT_TIMEOUT')
+        self.web_driver_pool = web_driver_pool.WebDriverPool.acquire(
+            size=settings.getint('SELENIUM_DRIVERS'),
+            max_pages=settings.getint('SELENIUM_MAX_PAGES_PER_DRIVER'),
+            create_driver=self.__create_driver,
+        )
+        self.rendered_page_cache = rendered_page_cache.RenderedPageCache(
+            directory=data_path(
+                settings.get('SELENIUM_CACHE_DIR'),
+                createdir=True,
+            ),
+            ttl=settings.getint('SELENIUM_CACHE_EXPIRATION_SECS'),
+            max_size=settings.getint('SELENIUM_CACHE_MAX_SIZE'),
+        ) if settings.getbool('SELENIUM_CACHE_ENABLED') else None
 
     @classmethod
     def from_crawler(cls, crawler):
         # This method is used by Scrapy to create your spiders.
         s = cls()
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
         return s
 
     def process_request(self, request, spider):
@@ -36,18 +67,16 @@ class PriceMonitorDownloaderMiddleware(object):
         #   installed downloader middleware will be called
         # return None
 
-        self.driver.get(request.url)
-        self.driver.implicitly_wait(2) # TODO: Config value.
-        body = self.driver.page_source
+        if self.rendered_page_cache:
+            response = self.__get_cached_response(request)
 
-        # TODO: Retry here.
+            if response:
+                return response
 
-        if request.meta is not None and request.meta.get('js_global_variable'):
-            data = self.driver.execute_script(f"return {request.meta['js_global_variable']};")
-            request.meta['js_data'] = data
-
-        return HtmlResponse(self.driver.current_url, body=body, encoding='utf-8', request=request)
-        # return None
+        # TODO: Retry here.
+        return self.web_driver_pool.render(
+            lambda driver: self.__render_page(driver, request)
+        )
 
     def process_response(self, request, response, spider):
         # Called with the response returned from the downloader.
@@ -70,3 +99,136 @@ class PriceMonitorDownloaderMiddleware(object):
 
     def spider_opened(self, spider):
         spider.logger.info('Spider opened: %s' % spider.name)
+        self.web_driver_pool.start()
+
+    def spider_closed(self, spider):
+        self.web_driver_pool.release()
+
+    def __create_driver(self):
+        options = webdriver.ChromeOptions()
+        options.add_argument('headless')
+        options.add_argument('window-size=1920x1080')
+        options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_13_6) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/12.0.3 Safari/605.1.15")
+        options.add_argument('blink-settings=imagesEnabled=false')
+
+        capabilities = DesiredCapabilities.CHROME.copy()
+        # Eager returns once the DOM is ready, without waiting for resources.
+        capabilities['pageLoadStrategy'] = self.page_load_strategy
+
+        driver = webdriver.Chrome(
+            chrome_options=options,
+            desired_capabilities=capabilities,
+        )
+
+        if self.blocked_url_patterns:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd(
+                'Network.setBlockedURLs',
+                {'urls': self.blocked_url_patterns},
+            )
+
+        return driver
+
+    def __render_page(self, driver, request):
+        # Runs in a web driver pool thread.
+        response = self.__render_page_response(driver, request)
+
+        if self.rendered_page_cache:
+            self.rendered_page_cache.set(
+                self.__create_cache_key(request),
+                {
+                    'url': response.url,
+                    'body': response.body.decode('utf-8'),
+                    'js_data': None if isinstance(
+                        response,
+                        js_data_response.JsDataResponse,
+                    ) else request.meta.get('js_data'),
+                },
+            )
+
+        return response
+
+    def __render_page_response(self, driver, request):
+        driver.get(request.url)
+
+        if request.meta is not None and request.meta.get('js_data_only'):
+            return self.__create_js_data_response(driver, request)
+
+        if request.meta is not None and request.meta.get('js_global_variable'):
+            self.__wait_for_js_global_variable(
+                driver,
+                request.meta['js_global_variable'],
+            )
+            data = driver.execute_script(f"return {request.meta['js_global_variable']};")
+            request.meta['js_data'] = data
+
+        body = driver.page_source
+
+        return HtmlResponse(driver.current_url, body=body, encoding='utf-8', request=request)
+
+    def __get_cached_response(self, request):
+        entry = self.rendered_page_cache.get(self.__create_cache_key(request))
+
+        if not entry:
+            return None
+
+        if request.meta.get('js_data_only'):
+            response = js_data_response.JsDataResponse(
+                entry['url'],
+                body=entry['body'].encode('utf-8'),
+                request=request,
+                flags=['cached'],
+            )
+            request.meta['js_data'] = response.js_data
+
+            return response
+
+        if request.meta.get('js_global_variable'):
+            request.meta['js_data'] = entry['js_data']
+
+        return HtmlResponse(
+            entry['url'],
+            body=entry['body'],
+            encoding='utf-8',
+            request=request,
+            flags=['cached'],
+        )
+
+    def __create_cache_key(self, request):
+        return rendered_page_cache.RenderedPageCache.create_key(
+            request_fingerprint(request),
+            request.meta.get('js_global_variable'),
+            bool(request.meta.get('js_data_only')),
+        )
+
+    def __create_js_data_response(self, driver, request):
+        # Only the JSON of the variable leaves the browser, the DOM is never
+        # serialized.
+        js_global_variable = request.meta['js_global_variable']
+        self.__wait_for_js_global_variable(driver, js_global_variable)
+        text = driver.execute_script(
+            f'try {{ return JSON.stringify({js_global_variable}); }} '
+            'catch (error) { return null; }'
+        )
+        response = js_data_response.JsDataResponse(
+            driver.current_url,
+            body=(text or '').encode('utf-8'),
+            request=request,
+        )
+        request.meta['js_data'] = response.js_data
+
+        return response
+
+    def __wait_for_js_global_variable(self, driver, js_global_variable):
+        try:
+            WebDriverWait(driver, self.js_wait_timeout).until(
+                lambda driver: driver.execute_script(
+                    f'try {{ return {js_global_variable} != null; }} '
+                    'catch (error) { return false; }'
+                )
+            )
+        except TimeoutException:
+            logging.warning(
+                f'Timed out waiting for {js_global_variable} on '
+                f'{driver.current_url}.'
+            )
@@ -0,0 +1,151 @@
+import logging
+import queue
+import threading
+from selenium.common.exceptions import WebDriverException
+from twisted.internet import (
+    reactor,
+    threads,
+)
+from twisted.python.threadpool import ThreadPool
+from typing import Callable
+
+class PooledWebDriver(object):
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+class WebDriverPool(object):
+    """Drives a bounded number of browsers from their own worker threads.
+
+    Each worker takes a browser for the duration of a page, so rendering
+    scales with the number of browsers and never blocks the reactor. Browsers
+    are replaced when they fail a health check, raise a WebDriverException or
+    have rendered max_pages pages.
+
+    Spiders running in the same process share the pool returned by acquire,
+    it is closed once the last of them releases it.
+    """
+
+    shared = None
+    users = 0
+    shared_lock = threading.Lock()
+
+    def __init__(self, size: int, max_pages: int, create_driver: Callable):
+        self.size = size
+        self.max_pages = max_pages
+        self.create_driver = create_driver
+        self.drivers = queue.Queue()
+        self.thread_pool = ThreadPool(
+            minthreads=1,
+            maxthreads=size,
+            name='web_driver_pool',
+        )
+        self.running = False
+
+        for _ in range(size):
+            # Browsers are started lazily by the worker that needs one.
+            self.drivers.put(None)
+
+    @classmethod
+    def acquire(
+        cls,
+        size: int,
+        max_pages: int,
+        create_driver: Callable,
+    ) -> 'WebDriverPool':
+        with cls.shared_lock:
+            if cls.shared is None:
+                cls.shared = cls(size, max_pages, create_driver)
+
+            cls.users += 1
+
+            return cls.shared
+
+    def release(self):
+        with self.shared_lock:
+            WebDriverPool.users -= 1
+
+            if WebDriverPool.users > 0:
+                return
+
+            WebDriverPool.shared = None
+
+        self.close()
+
+    def start(self):
+        if not self.running:
+            self.thread_pool.start()
+            self.running = True
+
+    def render(self, render_page: Callable):
+        """Calls render_page(driver) from a worker, returns a Deferred."""
+        self.start()
+
+        return threads.deferToThreadPool(
+            reactor,
+            self.thread_pool,
+            self.__render,
+            render_page,
+        )
+
+    def close(self):
+        if self.running:
+            self.thread_pool.stop()
+            self.running = False
+
+        while True:
+            try:
+                self.__quit(self.drivers.get_nowait())
+            except queue.Empty:
+                break
+
+        # Leave the pool usable in case another spider opens.
+        for _ in range(self.size):
+            self.drivers.put(None)
+
+    def __render(self, render_page: Callable):
+        pooled_driver = self.drivers.get()
+
+        try:
+            if pooled_driver is None or not self.__is_healthy(pooled_driver):
+                self.__quit(pooled_driver)
+                # An empty slot goes back if the new browser fails to start.
+                pooled_driver = None
+                pooled_driver = PooledWebDriver(self.create_driver())
+
+            try:
+                return render_page(pooled_driver.driver)
+            except WebDriverException:
+                # The browser may have crashed, start a new one next time.
+                self.__quit(pooled_driver)
+                pooled_driver = None
+
+                raise
+            finally:
+                if pooled_driver:
+                    pooled_driver.pages += 1
+
+                    if pooled_driver.pages >= self.max_pages:
+                        self.__quit(pooled_driver)
+                        pooled_driver = None
+        finally:
+            self.drivers.put(pooled_driver)
+
+    def __is_healthy(self, pooled_driver: PooledWebDriver) -> bool:
+        try:
+            pooled_driver.driver.execute_script('return 1;')
+
+            return True
+        except WebDriverException as error:
+            logging.warning(f'Replacing unresponsive browser: {error}')
+
+            return False
+
+    def __quit(self, pooled_driver: PooledWebDriver):
+        if pooled_driver is None:
+            return
+
+        try:
+            pooled_driver.driver.quit()
+        except WebDriverException as error:
+            logging.warning(f'Unable to quit browser: {error}')
@@ -2,6 +2,9 @@ import datetime
 import logging
 import json
 import re
+from price_monitor.helpers import (
+    embedded_json_helper,
+)
 from price_monitor.items import (
     offer,
     product,
@@ -19,6 +22,7 @@ from price_monitor.models import (
     language,
     region,
     store,
+    throttle_policy,
     universal_product_code
 )
 
@@ -31,6 +35,13 @@ class BestBuy(store.Store):
     region = region.Region.CANADA.value
     domain = 'bestbuy.ca'
     allowed_domains = [domain]
+    throttle_policy = throttle_policy.ThrottlePolicy( # Blocks quickly.
+        min_delay=2.0,
+        start_delay=5.0,
+        target_concurrency=1,
+        max_error_rate=0.05,
+        backoff_factor=3.0,
+    )
     custom_settings = {
         'ITEM_PIPELINES': {
             'price_monitor.pipelines.strip_amount_pipeline.StripAmountPipeline': 300,
@@ -51,25 +62,10 @@ class BestBuy(store.Store):
         return None
 
     def _find_json_data(self, response):
-        texts = response.xpath('//script/text()')
-
-        for text in texts:
-            match = text.re(".*window.__INITIAL_STATE__.*")
-
-            if match:
-                text = match[0].strip() \
-                    .split('window.__INITIAL_STATE__ = ')[1]
-
-                if text.endswith(';'):
-                    text = text[:-1]
-                
-                try:
-                    return json.loads(text)
-                except:
-                    pass
-                
-        
-        return None
+        return embedded_json_helper.EmbeddedJsonHelper.find_assignment(
+            body=response.body,
+            variable='window.__INITIAL_STATE__',
+        )
 
     def __load_with_dictionary(self, response, data):
         product_loader = product_item_loader \
@@ -0,0 +1,141 @@
+import logging
+import threading
+from collections import namedtuple
+from lxml import etree
+from parsel.csstranslator import HTMLTranslator
+from scrapy.http.response.html import HtmlResponse
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+# Selectors are CSS, with ::text and ::attr(), or XPath when starting with
+# "/" or "(". Processors are applied to each value, None drops it. Fields
+# with reorder try the selector with the most hits first, only for
+# selectors matching different page layouts.
+FieldSpec = namedtuple(
+    'FieldSpec',
+    [
+        'selectors',
+        'processors',
+        'many',
+        'reorder',
+    ],
+    defaults=[(), False, False],
+)
+
+class ExtractionSpec:
+    """Extracts the fields of a store's product page.
+
+    Selectors are translated to XPath and compiled once, when the store
+    model is defined. Each field takes the values of its first selector
+    with a match, and the selectors that matched are counted.
+    """
+
+    TRANSLATOR = HTMLTranslator()
+
+    def __init__(self, fields: Dict[str, FieldSpec]):
+        self.fields = fields
+        self.compiled = {
+            name: [self.compile(selector) for selector in field.selectors]
+            for name, field in fields.items()
+        }
+        self.hits = {
+            name: [0] * len(field.selectors)
+            for name, field in fields.items()
+        }
+        self.orders = {
+            name: list(range(len(field.selectors)))
+            for name, field in fields.items()
+        }
+        self.lock = threading.Lock()
+
+    @classmethod
+    def compile(cls, selector: str) -> etree.XPath:
+        xpath = selector if selector.startswith(('/', '(')) \
+            else cls.TRANSLATOR.css_to_xpath(selector)
+
+        return etree.XPath(xpath)
+
+    def extract(self, response: HtmlResponse) -> Dict[str, Any]:
+        # The tree parsed for response.css is reused.
+        root = response.selector.root
+        result = {}
+
+        for name, field in self.fields.items():
+            result[name] = self.__extract_field(root, name, field)
+
+        return result
+
+    def get_hits(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: dict(zip(field.selectors, self.hits[name]))
+            for name, field in self.fields.items()
+        }
+
+    def __extract_field(self, root, name: str, field: FieldSpec):
+        for index in self.orders[name]:
+            values = self.__process(
+                self.__evaluate(root, self.compiled[name][index]),
+                field.processors,
+            )
+
+            if values:
+                self.__add_hit(name, field, index)
+
+                return values if field.many else values[0]
+
+        return [] if field.many else None
+
+    def __add_hit(self, name: str, field: FieldSpec, index: int):
+        with self.lock:
+            self.hits[name][index] += 1
+
+            if field.reorder and index != self.orders[name][0]:
+                self.orders[name].sort(key=lambda i: -self.hits[name][i])
+                logging.debug(
+                    f'Trying "{field.selectors[self.orders[name][0]]}" '
+                    f'first for {name}.'
+                )
+
+    def __evaluate(self, root, xpath: etree.XPath) -> List[str]:
+        try:
+            nodes = xpath(root)
+        except etree.XPathError as error:
+            logging.error(f'Unable to evaluate {xpath.path}: {error}')
+            return []
+
+        if not isinstance(nodes, list):
+            nodes = [nodes]
+
+        # Like Selector.getall, elements are returned as HTML.
+        return [
+            etree.tostring(
+                node,
+                method='html',
+                encoding='unicode',
+                with_tail=False,
+            ) if isinstance(node, etree._Element) else str(node)
+            for node in nodes
+        ]
+
+    def __process(
+        self,
+        values: List[str],
+        processors: List[Callable],
+    ) -> List[Any]:
+        result = []
+
+        for value in values:
+            for processor in processors:
+                value = processor(value)
+
+                if value is None:
+                    break
+
+            if value is not None:
+                result.append(value)
+
+        return result
@@ -27,10 +27,12 @@ from price_monitor.models import (
     availability,
     condition,
     curreny,
+    extraction_spec,
     global_trade_item_number,
     language,
     region,
     store,
+    throttle_policy,
     universal_product_code,
 )
 from scrapy.utils.project import get_project_settings
@@ -42,6 +44,37 @@ class IGA(store.Store):
     region = region.Region.CANADA.value
     domain = 'iga.net'
     allowed_domains = [domain]
+    throttle_policy = throttle_policy.ThrottlePolicy(
+        min_delay=1.0,
+        start_delay=5.0,
+        target_concurrency=2,
+    )
+    extraction_spec = extraction_spec.ExtractionSpec({
+        'data': extraction_spec.FieldSpec(
+            [
+                'div.product-details.js-ga-productdetails '
+                '> div.relative::attr(data-product)'
+            ],
+        ),
+        'og_title': extraction_spec.FieldSpec(
+            ['meta[property="og:title"]::attr(content)'],
+            [lambda value: value.split('|')[0]],
+        ),
+        'title': extraction_spec.FieldSpec(['title::text']),
+        'breadcrumbs': extraction_spec.FieldSpec(
+            [
+                'ul.nav.breadcrumb '
+                '> li[itemtype="http://data-vocabulary.org/Breadcrumb"] '
+                '> a[itemprop="url"] '
+                '> span[itemprop="title"]::text'
+            ],
+            many=True,
+        ),
+        'images': extraction_spec.FieldSpec(
+            ['meta[property="og:image"]::attr(content)'],
+            many=True,
+        ),
+    })
     version = get_project_settings().get('VERSION_PRODUCT_DATA_IGA')
     custom_settings = {
         'ITEM_PIPELINES': {
@@ -50,9 +83,6 @@ class IGA(store.Store):
             # 'price_monitor.pipelines.IGAUniversalProductCodePipeline': 900,
             'price_monitor.pipelines.mongo_db_pipeline.MongoDBPipeline': 1000
         },
-        'DOWNLOADER_MIDDLEWARES': {
-            # 'price_monitor.middlewares.PriceMonitorDownloaderMiddleware': 300
-        }
     }
 
     def parse_product(
@@ -65,10 +95,11 @@ class IGA(store.Store):
             logging.error('Unable to determine language!')
             return None
 
-        data = self._find_json_data(response)
+        fields = self.extraction_spec.extract(response)
+        data = self._find_json_data(response, fields)
         
         if data:
-            return self._create_product_dictionary(response, data)
+            return self._create_product_dictionary(response, data, fields)
 
         logging.warning('No product data found!')
         return None
@@ -85,28 +116,30 @@ class IGA(store.Store):
         return availability.Availability.IN_STOCK.value if data \
             else availability.Availability.OUT_OF_STOCK.value
 
-    def _find_json_data(self, response: HtmlResponse) -> Optional[Dict]:
-        css_path = "div.product-details.js-ga-productdetails > " + \
-           "div.relative::attr(data-product)"
-
-        product_data = response.css(css_path).extract()
+    def _find_json_data(
+        self,
+        response: HtmlResponse,
+        fields: Optional[Dict] = None,
+    ) -> Optional[Dict]:
+        fields = fields or self.extraction_spec.extract(response)
+        product_data = fields['data']
 
         if not product_data:
             logging.error('Unable to load JSON data.') # TODO: Log URL.
             return None
 
         try:
-            return json.loads(product_data[0])
+            return json.loads(product_data)
         except:
             pass
 
         # try:
-        #     return ast.literal_eval(product_data[0])
+        #     return ast.literal_eval(product_data)
         # except:
         #     pass
 
         try:
-            data = product_data[0].replace("'", '"')
+            data = product_data.replace("'", '"')
             return json.loads(data)
         except:
             logging.error('Unable to load JSON data.')
@@ -115,7 +148,10 @@ class IGA(store.Store):
         self, 
         response: HtmlResponse, 
         data: Optional[Dict] = None,
+        fields: Optional[Dict] = None,
     ) -> product.Product:
+        fields = fields or self.extraction_spec.extract(response)
+
         try:
             upc = (
                 universal_product_code.UniversalProductCode(
@@ -126,11 +162,7 @@ class IGA(store.Store):
             # TODO: Log issue and return nothing.
             return None
 
-        title1 = response.css(
-                    'meta[property="og:title"]::attr(content)'
-                ).extract()[0].split('|')[0]
-        title2 = response.css('title::text').get()
-        name = title1 or title2
+        name = fields['og_title'] or fields['title']
 
         if not name:
             pass # TODO: Log error and return none.
@@ -160,6 +192,7 @@ class IGA(store.Store):
                 name=name,
                 brand=brand,
                 upc=upc,
+                fields=fields,
             ),
         ).add_offer_dictionary(
             offer_dictionary=self._create_offer_dictionary(
@@ -182,25 +215,18 @@ class IGA(store.Store):
         model_number: Optional[str] = None,
         upc: Optional[str] = None,
         data: Optional[Dict] = None,
+        fields: Optional[Dict] = None,
     ) -> Dict:
-        breadcrumbs = response.css(
-            'ul.nav.breadcrumb \
-                > li[itemtype="http://data-vocabulary.org/Breadcrumb"] \
-                > a[itemprop="url"] \
-                > span[itemprop="title"]::text'
-        ).getall()
-
+        fields = fields or self.extraction_spec.extract(response)
         item = product_data_item_loader \
             .ProductDataItemLoader(response=response) \
             .add_language_data(
                 response=response,
                 brand=brand,
-                images=response.css(
-                    'meta[property="og:image"]::attr(content)'
-                ).extract(),
+                images=fields['images'],
                 name=name,
                 url=response.url,
-                breadcrumbs=breadcrumbs
+                breadcrumbs=fields['breadcrumbs']
             ).add_sku(sku=upc) \
             .add_upc(response=response, upc=upc) \
             .add_store_id(store_id=self.store_id) \
@@ -38,7 +38,10 @@ class Incase(shopify.Shopify):
             'price_monitor.pipelines.mongo_db_pipeline.MongoDBPipeline': 1000
         },
         'DOWNLOADER_MIDDLEWARES': {
-            'price_monitor.middlewares.PriceMonitorDownloaderMiddleware': 300
+            'price_monitor.middlewares.PriceMonitorDownloaderMiddleware': 300,
+            # Replaces the project's middlewares. Rendered pages are never
+            # conditional, the browser sends the requests.
+            'price_monitor.middlewares.adaptive_throttle_middleware.AdaptiveThrottleDownloaderMiddleware': 950,
         }
     }
 
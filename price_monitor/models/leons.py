@@ -40,38 +40,12 @@ class Leons(shopify.Shopify):
         
         return None
 
-    def _create_product_data_dictionary(self, response, data, upc):
-        super()._create_product_data_dictionary(response, data, upc)
-
+    def _find_name_and_description(self, data):
         # The description holds extra data separated by ";;;;".
         descData = data['description'].split(';;;;')
-        name = None
-        desc = None
-
-        if self.language == language.Language.EN.value:
-            name = data['title'].split('|')[0]
-            desc = descData[0]
-        elif self.language == language.Language.FR.value:
-            name = descData[1]
-            desc = descData[2]
-        else:
-            pass # TODO: Error.
 
-        self.product_data_value_loader.replace_value(
-            field_name=product_data.ProductData.KEY_NAME, 
-            value=super()._create_text_field(
-                response=response, 
-                value=name, 
-                language=self.language
-            )
-        )
-        self.product_data_value_loader.replace_value(
-            field_name=product_data.ProductData.KEY_DESCRIPTION, 
-            value=super()._create_text_field(
-                response=response, 
-                value=desc, 
-                language=self.language
-            )
-        )
+        if self.language == language.Language.FR.value \
+            and len(descData) > 2:
+            return descData[1], descData[2]
 
-        return (self.product_data_value_loader.load_item()).get_dictionary()
\ No newline at end of file
+        return data['title'].split('|')[0].strip(), descData[0]
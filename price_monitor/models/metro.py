@@ -29,10 +29,11 @@ from price_monitor.models import (
     condition,
     curreny,
     global_trade_item_number,
+    extraction_spec,
     language,
-    offer,
     region,
     store,
+    throttle_policy,
     universal_product_code,
 )
 from scrapy.utils.project import get_project_settings
@@ -44,6 +45,56 @@ class Metro(store.Store):
     region = region.Region.CANADA.value
     domain = 'metro.ca'
     allowed_domains = [domain]
+    throttle_policy = throttle_policy.ThrottlePolicy(
+        min_delay=1.0,
+        start_delay=5.0,
+        target_concurrency=2,
+    )
+    extraction_spec = extraction_spec.ExtractionSpec({
+        'upc': extraction_spec.FieldSpec(['span[itemprop="sku"]::text']),
+        'name': extraction_spec.FieldSpec(
+            ['div.product-info.item-addToCart > a.invisible-text::text'],
+            many=True,
+        ),
+        'title': extraction_spec.FieldSpec(
+            ['title::text'],
+            [lambda value: value.split('|')[0]],
+        ),
+        'brand': extraction_spec.FieldSpec(
+            [
+                'div[itemtype="http://schema.org/Product"] '
+                '> span[itemprop="brand"]::text'
+            ],
+            many=True,
+        ),
+        'breadcrumbs': extraction_spec.FieldSpec(
+            [
+                'ul[itemtype="http://schema.org/BreadcrumbList"] '
+                '> li[itemtype="http://schema.org/ListItem"] '
+                '> a[itemtype="http://schema.org/Thing"] '
+                '> span[itemprop="name"]::text'
+            ],
+            many=True,
+        ),
+        'images': extraction_spec.FieldSpec(
+            [
+                'div[itemtype="http://schema.org/Product"] '
+                '> span[itemprop="image"]::text'
+            ],
+            many=True,
+        ),
+        'description': extraction_spec.FieldSpec(
+            [
+                'div[itemtype="http://schema.org/Product"] '
+                '> span[itemprop="description"]::text'
+            ],
+        ),
+        'prices': extraction_spec.FieldSpec(
+            ['div[itemprop="offers"] span[itemprop="price"]::text'],
+            [float],
+            many=True,
+        ),
+    })
     version = get_project_settings().get('VERSION_PRODUCT_DATA_METRO')
     custom_settings = {
         'ITEM_PIPELINES': {
@@ -52,9 +103,6 @@ class Metro(store.Store):
             # 'price_monitor.pipelines.UniversalProductCodePipeline': 900,
             'price_monitor.pipelines.mongo_db_pipeline.MongoDBPipeline': 1000
         },
-        'DOWNLOADER_MIDDLEWARES': {
-            # 'price_monitor.middlewares.PriceMonitorDownloaderMiddleware': 999
-        }
     }
 
     def parse_product(
@@ -86,29 +134,24 @@ class Metro(store.Store):
         response: HtmlResponse, 
         data: Optional[Dict] = None,
     ) -> product.Product:
+        fields = self.extraction_spec.extract(response)
+
         try:
             upc = (
                 universal_product_code.UniversalProductCode(
-                    upc=response.css('span[itemprop="sku"]::text').get()
+                    upc=fields['upc']
                 )
             ).value
         except Exception as exception:
             logging.exception(msg='Unable to get UPC.', exc_info=exception)
             return None
 
-        name1 = response.css(
-            "div.product-info.item-addToCart > a.invisible-text::text"
-        ).extract()
-        name2 = response.css(
-            'title::text'
-        ).extract()[0].split('|')[0]
-        name = name1 or name2
+        name = fields['name'] or fields['title']
 
         if not name:
             pass # TODO: Log error and return none.
 
-        brand = response.css('div[itemtype="http://schema.org/Product"] \
-            > span[itemprop="brand"]::text').extract()
+        brand = fields['brand']
         item_loader = product_item_loader.ProductItemLoader(
             response=response
         ).add_name(
@@ -127,11 +170,13 @@ class Metro(store.Store):
                 name=name,
                 brand=brand,
                 upc=upc,
+                fields=fields,
             ),
         ).add_offer_dictionary(
             offer_dictionary=self._create_offer_dictionary(
                 response=response,
                 data=data, 
+                fields=fields,
             ),
         ).add_store_dictionary(
             store_dictionary=self._create_store_dictionary(
@@ -149,30 +194,19 @@ class Metro(store.Store):
         model_number: Optional[str] = None,
         upc: Optional[str] = None,
         data: Optional[Dict] = None,
+        fields: Optional[Dict] = None,
     ) -> Dict:
-        breadcrumbs = response.css(
-            'ul[itemtype="http://schema.org/BreadcrumbList"] \
-                > li[itemtype="http://schema.org/ListItem"] \
-                > a[itemtype="http://schema.org/Thing"] \
-                > span[itemprop="name"]::text'
-        ).getall()
-
+        fields = fields or self.extraction_spec.extract(response)
         item = product_data_item_loader \
             .ProductDataItemLoader(response=response) \
             .add_language_data(
                 response=response,
                 brand=brand,
-                images=response.css(
-                    'div[itemtype="http://schema.org/Product"] \
-                        > span[itemprop="image"]::text'
-                ).getall(),
+                images=fields['images'],
                 name=name,
                 url=response.url,
-                description=response.css(
-                    'div[itemtype="http://schema.org/Product"] \
-                        > span[itemprop="description"]::text'
-                ).get(),
-                breadcrumbs=breadcrumbs,
+                description=fields['description'],
+                breadcrumbs=fields['breadcrumbs'],
             ).add_sku(sku=upc) \
             .add_upc(response=response, upc=upc) \
             .add_store_id(store_id=self.store_id) \
@@ -186,26 +220,16 @@ class Metro(store.Store):
         self, 
         response: HtmlResponse, 
         data: Dict,
+        fields: Optional[Dict] = None,
     ) -> Dict:
-        offers = response.css('div[itemprop="offers"]')
+        fields = fields or self.extraction_spec.extract(response)
 
-        if len(offers) == 0:
+        if len(fields['prices']) == 0:
             pass # TODO: Throw error.
 
-        offer_objects = []
-
-        for o in offers:
-            price = o.css('span[itemprop="price"]::text').get()
-            valid_through = o.css('span[itemprop="validThrough"]::text').get()
-            offer_objects.append(
-                offer.Offer(price=float(price), valid_until=valid_through)
-            )
-
-        # Order to get the sales price.
-        offer_objects.sort(key=lambda x: x.price)
-
-        amount = offer_objects[0].price
-        valid_until = offer_objects[0].valid_until # TODO: Add valid until.
+        # The lowest is the sales price.
+        amount = min(fields['prices'])
+        # TODO: Add valid until.
         item = offer_item_loader.OfferItemLoader(response=response) \
             .add_store_id(store_id=self.store_id) \
             .add_sold_by(sold_by=self.sold_by) \
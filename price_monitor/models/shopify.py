@@ -2,12 +2,16 @@ import datetime
 import logging
 import json
 import re
+from price_monitor.helpers import (
+    embedded_json_helper,
+)
 from price_monitor.items import (
     offer,
     product,
     product_data
 )
 from price_monitor.item_loaders import (
+    offer_item_loader,
     product_item_loader,
     product_data_item_loader
 )
@@ -19,10 +23,17 @@ from price_monitor.models import (
     language,
     region,
     store,
+    throttle_policy,
     universal_product_code
 )
 
 class Shopify(store.Store): 
+    PRODUCTS_JSON_LIMIT = 250 # Most products Shopify returns per page.
+    throttle_policy = throttle_policy.ThrottlePolicy(
+        min_delay=0.1,
+        start_delay=1.0,
+        target_concurrency=8,
+    )
     custom_settings = {
         'ITEM_PIPELINES': {
             'price_monitor.pipelines.shopify_strip_amount_pipeline.ShopifyStripAmountPipeline': 300,
@@ -41,11 +52,65 @@ class Shopify(store.Store):
         data = self._find_json_data(response)
         
         if data:
-            return self.__load_with_dictionary(response, data)
+            return self.__load_with_dictionary(response, response.url, data)
 
         logging.warning('No product data found!')
         return None
 
+    def parse_product_js(self, response):
+        # /products/<handle>.js holds the same data as data-product-json.
+        url = response.url.split('?')[0]
+
+        if url.endswith('.js'):
+            url = url[:-3]
+
+        return self.__load_with_json(
+            response=response,
+            url=url,
+            data=embedded_json_helper.EmbeddedJsonHelper.loads(response.body),
+        )
+
+    def find_products_json_products(self, response):
+        return embedded_json_helper.EmbeddedJsonHelper.loads(
+            response.body
+        ).get('products') or []
+
+    def parse_products_json_product(self, response, base_url: str, data):
+        return self.__load_with_json(
+            response=response,
+            url=f'{base_url}/products/{data["handle"]}',
+            data=self._create_product_json_dictionary(data),
+        )
+
+    def create_products_json_url(self, base_url: str, page: int) -> str:
+        return f'{base_url}/products.json' \
+            f'?limit={self.PRODUCTS_JSON_LIMIT}&page={page}'
+
+    def _create_product_json_dictionary(self, data):
+        # Converts a /products.json product to the data-product-json format.
+        variants = data.get('variants') or [{}]
+        tags = data.get('tags') or []
+
+        return {
+            'title': data.get('title'),
+            'description': data.get('body_html') or '',
+            'vendor': data.get('vendor'),
+            'tags': tags.split(', ') if isinstance(tags, str) else tags,
+            'price': int(round(float(variants[0].get('price') or 0) * 100)),
+            'available': any(variant.get('available') for variant in variants),
+            'variants': variants,
+            'images': [image.get('src') for image in data.get('images') or []],
+        }
+
+    def __load_with_json(self, response, url, data):
+        self.language = self._determine_language_from_url(url)
+
+        if not self.language:
+            logging.error('Unable to determine language!')
+            return None
+
+        return self.__load_with_dictionary(response, url, data)
+
     def _determine_availability(self, data):
         return availability.Availability.IN_STOCK.value if data \
             else availability.Availability.OUT_OF_STOCK.value
@@ -55,18 +120,13 @@ class Shopify(store.Store):
 
         if text:
             try:
-                return json.loads(text)
-            except:
+                return embedded_json_helper.EmbeddedJsonHelper.loads(text)
+            except ValueError:
                 logging.error('Unable to load JSON data.')
-                pass
         
         return None
 
-    def __load_with_dictionary(self, response, data):
-        product_loader = product_item_loader.ProductItemLoader(
-            response=response
-        )
-
+    def __load_with_dictionary(self, response, url, data):
         data['tags'] = self.__parse_tags(data['tags'])
 
         try:
@@ -76,125 +136,94 @@ class Shopify(store.Store):
         except:
             upc = None
 
-        if upc:
-            product_loader.add_value(
-                product.Product.KEY_GTIN, 
-                super()._create_gtin_field(
-                    response=response, 
-                    type=global_trade_item_number
-                        .GlobalTradeItemNumber.UPCA.value, 
-                    value=upc
-                )
-            )
-
-        product_loader.add_value(
-            field_name=product.Product.KEY_BRAND, 
-            value=data['vendor']
-        )
-        product_loader.add_value(
-            field_name=product.Product.KEY_CURRENT_OFFER, 
-            value=self.__create_offer_dictionary(response, data)
-        )
-        product_loader.add_value(
-            field_name=product.Product.KEY_MODEL_NUMBER, 
-            value=data.get('tags').get('vsn') or data.get('variants')[0].get('sku')
-        )
-        product_loader.add_value(
-            field_name=product.Product.KEY_PRODUCT_DATA, 
-            value=self._create_product_data_dictionary(response, data, upc)
-        )
-        product_loader.add_value(
-            field_name=product.Product.KEY_STORE, 
-            value=self.__create_store_dictionary(response)
-        )
-        
-        return product_loader.load_item()
-
-    def _create_product_data_dictionary(self, response, data, upc):
-        self.product_data_value_loader = \
-            product_data_item_loader.ProductDataItemLoader(response=response)
+        variants = data.get('variants') or [{}]
+        model_number = data['tags'].get('vsn') or variants[0].get('sku')
+        name, description = self._find_name_and_description(data)
+        # The data is already parsed, loaders given the response would parse
+        # it again, a whole products.json page for each of its products.
+        item_loader = product_item_loader.ProductItemLoader() \
+            .add_name(
+                response=response,
+                name=name,
+                language=self.language,
+            ).add_brand(
+                response=response,
+                brand=data['vendor'],
+                language=self.language,
+            ).add_model_number(model_number=model_number) \
+            .add_product_data_dictionary(
+                product_data_dictionary=self._create_product_data_dictionary(
+                    response=response,
+                    name=name,
+                    brand=data['vendor'],
+                    model_number=model_number,
+                    upc=upc,
+                    data=data,
+                    url=url,
+                    description=description,
+                ),
+            ).add_offer_dictionary(
+                offer_dictionary=self._create_offer_dictionary(
+                    response=response,
+                    data=data,
+                ),
+            ).add_store_dictionary(
+                store_dictionary=self._create_store_dictionary(
+                    response=response,
+                ),
+            ).add_supported_language(language=self.language)
 
         if upc:
-            self.product_data_value_loader.add_value(
-                field_name=product.Product.KEY_GTIN, 
-                value=super()._create_gtin_field(
-                    response=response, 
-                    type=global_trade_item_number \
-                        .GlobalTradeItemNumber.UPCA.value, 
-                    value=upc
-                )
-            )
-
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_URL, 
-            value=response.url
-        )
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_NAME, 
-            value=super()._create_text_field(
-                response=response, 
-                value=data['title'].split('|')[0], 
-                language=self.language
-            )
-        )
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_DESCRIPTION, 
-            value=super()._create_text_field(
-                response=response, 
-                value=data['description'], 
-                language=self.language
-            )
-        )
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_BRAND, 
-            value=data['vendor']
-        )
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_SKU, 
-            value=data.get('variants')[0].get('sku')
-        )
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_MODEL_NUMBER, 
-            value=data.get('tags').get('vsn') or data.get('variants')[0].get('sku')
-        )
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_SOLD_BY,
-            value=self.sold_by
-        )
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_STORE_ID, 
-            value=self.store_id
-        )
-        # self.product_data_value_loader.add_value(
-        #     field_name=product_data.ProductData.KEY_SUPPORTED_LANGUAGES,
-        #     value=super()._create_supported_languages_field(self.language)
-        # )
-        self.product_data_value_loader.add_value(
-            field_name=product_data.ProductData.KEY_IMAGES,
-            value=data['images']
-        )
+            item_loader.add_upc(response=response, upc=upc)
+
+        return item_loader.load_item()
+
+    def _find_name_and_description(self, data):
+        return data['title'].split('|')[0].strip(), data['description']
+
+    def _create_product_data_dictionary(
+        self,
+        response,
+        name,
+        brand=None,
+        model_number=None,
+        upc=None,
+        data=None,
+        url=None,
+        description=None,
+    ):
+        variants = data.get('variants') or [{}]
+        item_loader = product_data_item_loader.ProductDataItemLoader() \
+            .add_language_data(
+                response=response,
+                brand=brand,
+                images=data['images'],
+                name=name,
+                url=url,
+                description=description,
+            ).add_sku(sku=variants[0].get('sku')) \
+            .add_model_number(model_number=model_number) \
+            .add_store_id(store_id=self.store_id) \
+            .add_sold_by(sold_by=self.sold_by)
 
-        return (self.product_data_value_loader.load_item()).get_dictionary()
-
-    def __create_offer_dictionary(self, response, data):
-        return super()._create_offer_dictionary(
-            response=response, 
-            amount=data['price'], 
-            availability=data['available'], 
-            condition=condition.Condition.NEW.value, 
-            currency=curreny.Currency.CAD.value, 
-            sold_by=self.sold_by, 
-            store_id=self.store_id
-        )
-
-    def __create_store_dictionary(self, response):
-        return super()._create_store_dictionary(
-            response=response, 
-            domain=self.domain, 
-            store_id=self.store_id, 
-            store_name=self.store_name, 
-            region=self.region
-        )
+        if upc:
+            item_loader.add_upc(response=response, upc=upc)
+
+        return item_loader.load_item().get_dictionary()
+
+    def _create_offer_dictionary(self, response, data):
+        # The amount is in cents, see ShopifyStripAmountPipeline.
+        item = offer_item_loader.OfferItemLoader() \
+            .add_store_id(store_id=self.store_id) \
+            .add_sold_by(sold_by=self.sold_by) \
+            .add_amount(amount=str(data['price'])) \
+            .add_currency(currency=curreny.Currency.CAD.value) \
+            .add_availability(
+                availability=self._determine_availability(data['available']),
+            ).add_condition(condition=condition.Condition.NEW.value) \
+            .load_item()
+
+        return item.get_dictionary()
 
     def __parse_tags(self, tags):
         result = dict()
@@ -2,9 +2,56 @@ from price_monitor.item_loaders import (
     offer_item_loader,
     product_item_loader
 )
+from price_monitor.models import (
+    extraction_spec,
+    throttle_policy,
+)
 
 class Staples:
     allowed_domains = ['staples.ca']
+    throttle_policy = throttle_policy.ThrottlePolicy()
+    extraction_spec = extraction_spec.ExtractionSpec({
+        'name': extraction_spec.FieldSpec(
+            ['head > meta[property="og:title"]::attr(content)'],
+            many=True,
+        ),
+        'description': extraction_spec.FieldSpec(
+            ['head > meta[name="description"]::attr(content)'],
+            many=True,
+        ),
+        'releaseDate': extraction_spec.FieldSpec(
+            ['#ctl00_CP_ctl00_PD_lblReleaseDate'],
+            many=True,
+        ),
+        'availability': extraction_spec.FieldSpec(
+            [
+                '#schemaorg-offer > div.price-module.clearfix '
+                '> div.price-wrapper.price-extra-large '
+                '> link[itemprop="availability"]::attr(href)'
+            ],
+            many=True,
+        ),
+        'tags': extraction_spec.FieldSpec(
+            ['head > meta[name="keywords"]::attr(content)'],
+            many=True,
+        ),
+        'amount': extraction_spec.FieldSpec(
+            [
+                '#schemaorg-offer > div.price-module.clearfix '
+                '> div.price-wrapper.price-extra-large '
+                '> meta[itemprop="price"]::attr(content)'
+            ],
+            many=True,
+        ),
+        'currency': extraction_spec.FieldSpec(
+            [
+                '#schemaorg-offer > div.price-module.clearfix '
+                '> div.price-wrapper.price-extra-large '
+                '> meta[itemprop="priceCurrency"]::attr(content)'
+            ],
+            many=True,
+        ),
+    })
     custom_settings = {
         'ITEM_PIPELINES': {
             'price_monitor.pipelines.TagsPipeline': 300,
@@ -12,18 +59,19 @@ class Staples:
     }
 
     def parse_product(self, response):
+        fields = self.extraction_spec.extract(response)
         productLoader = product_item_loader.ProductItemLoader(response=response)
-        productLoader.add_css('name', ['head > meta[property="og:title"]::attr(content)'])
-        productLoader.add_css('description', ['head > meta[name="description"]::attr(content)'])
-        productLoader.add_css('releaseDate', ['#ctl00_CP_ctl00_PD_lblReleaseDate'])
-        productLoader.add_value('currentPrice', [self.__get_price(response)])
+        productLoader.add_value('name', fields['name'])
+        productLoader.add_value('description', fields['description'])
+        productLoader.add_value('releaseDate', fields['releaseDate'])
+        productLoader.add_value('currentPrice', [self.__get_price(response, fields)])
         productLoader.add_value('url', [response.url])
-        productLoader.add_css('availability', ['#schemaorg-offer > div.price-module.clearfix > div.price-wrapper.price-extra-large > link[itemprop="availability"]::attr(href)'])
-        productLoader.add_css('tags', ['head > meta[name="keywords"]::attr(content)'])
+        productLoader.add_value('availability', fields['availability'])
+        productLoader.add_value('tags', fields['tags'])
         return productLoader.load_item()
 
-    def __get_price(self, response):
+    def __get_price(self, response, fields):
         offerLoader = offer_item_loader.OfferItemLoader(response=response)
-        offerLoader.add_css('amount', ['#schemaorg-offer > div.price-module.clearfix > div.price-wrapper.price-extra-large > meta[itemprop="price"]::attr(content)'])
-        offerLoader.add_css('currency', ['#schemaorg-offer > div.price-module.clearfix > div.price-wrapper.price-extra-large > meta[itemprop="priceCurrency"]::attr(content)'])
+        offerLoader.add_value('amount', fields['amount'])
+        offerLoader.add_value('currency', fields['currency'])
         return dict(offerLoader.load_item())
\ No newline at end of file
@@ -23,6 +23,7 @@ from price_monitor.models import (
     language,
     region,
     store,
+    throttle_policy,
     universal_product_code,
 )
 from scrapy.http.response.html import HtmlResponse
@@ -42,6 +43,7 @@ class Store:
     language = None
     version = None
     allowed_domains = []
+    throttle_policy = throttle_policy.ThrottlePolicy()
     custom_settings = {}
 
     def _create_product_dictionary(
@@ -70,7 +72,8 @@ class Store:
         pass
 
     def _create_store_dictionary(self, response: HtmlResponse) -> Dict:
-        item = store_item_loader.StoreItemLoader(response=response) \
+        # Values only, a loader given the response would parse it again.
+        item = store_item_loader.StoreItemLoader() \
             .add_id(id=self.store_id) \
             .add_name(name=self.store_name) \
             .add_domain(domain=self.domain) \
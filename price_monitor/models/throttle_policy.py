@@ -0,0 +1,19 @@
+from collections import namedtuple
+
+# How hard a store may be crawled, declared on the store models and applied
+# per download slot by the adaptive throttle extension.
+ThrottlePolicy = namedtuple(
+    'ThrottlePolicy',
+    [
+        'min_delay', # Seconds between requests once the store is healthy.
+        'max_delay',
+        'start_delay',
+        'target_concurrency', # Most requests in parallel once healthy.
+        'max_latency', # Slower responses count as errors.
+        'max_error_rate', # Of the last window responses, before backing off.
+        'backoff_factor', # Delay multiplier when backing off.
+        'delay_step', # Delay removed after each healthy response.
+        'window',
+    ],
+    defaults=[0.25, 60.0, 2.0, 4, 10.0, 0.1, 2.0, 0.25, 20],
+)
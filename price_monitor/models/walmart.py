@@ -7,12 +7,64 @@ from price_monitor.item_loaders import (
     offer_item_loader,
     iga_product_item_loader
 )
-from price_monitor.models import curreny
+from price_monitor.models import (
+    curreny,
+    extraction_spec,
+    throttle_policy,
+)
 
 class Walmart:
     store_name = 'Walmart'
     domain = 'walmart.ca'
     allowed_domains = [domain]
+    throttle_policy = throttle_policy.ThrottlePolicy( # Rendered by Selenium.
+        min_delay=2.0,
+        start_delay=5.0,
+        target_concurrency=2,
+        max_latency=30.0,
+    )
+    # The page has two layouts, the one seen most is tried first.
+    extraction_spec = extraction_spec.ExtractionSpec({
+        'product_data': extraction_spec.FieldSpec(
+            ['div.js-content div.css-ay2u5v.evlleax1 script::text'],
+        ),
+        'sold_by': extraction_spec.FieldSpec(
+            [
+                '#product-desc p.seller-info span',
+                'div.css-9wd9vm.etlm3820 svg title',
+                'div.css-9wd9vm.etlm3820 a.css-1syn49.elkyjhv0',
+            ],
+            many=True,
+            reorder=True,
+        ),
+        'name': extraction_spec.FieldSpec(
+            ['#product-desc h1', 'div.css-13hwhay.e1yn5b3f0 h1'],
+            many=True,
+            reorder=True,
+        ),
+        'brand': extraction_spec.FieldSpec(
+            [
+                '#product-desc p.brand a.brand-link',
+                'div.css-uxtmi3.e1yn5b3f4 span a.css-1syn49.elkyjhv0',
+            ],
+            many=True,
+            reorder=True,
+        ),
+        'amount': extraction_spec.FieldSpec(
+            [
+                'span[itemprop=price]',
+                'div.css-k008qs.e1ufqjyx0 > span.css-rykmet.esdkp3p2 '
+                '> span.css-2vqe5n.esdkp3p0',
+                'body > div.js-content > div:nth-child(1) > div > div '
+                '> div.css-0.eewy8oa0 > div.css-1i2cfe3.eewy8oa2 '
+                '> div.css-18f77yw.eewy8oa4 > div > div.css-0.e1cd9jig0 '
+                '> div > div.css-mzzkn5.e1yn5b3f5 > div > div '
+                '> div.css-k008qs.e1ufqjyx0 > span.css-rykmet.esdkp3p2 > span',
+            ],
+            many=True,
+            reorder=True,
+        ),
+    })
     custom_settings = {
         'ITEM_PIPELINES': {
             'price_monitor.pipelines.StripAmountPipeline': 300,
@@ -21,7 +73,10 @@ class Walmart:
             'price_monitor.pipelines.MongoDBPipeline': 1000
         },
         'DOWNLOADER_MIDDLEWARES': {
-            'price_monitor.middlewares.PriceMonitorDownloaderMiddleware': 300
+            'price_monitor.middlewares.PriceMonitorDownloaderMiddleware': 300,
+            # Replaces the project's middlewares. Rendered pages are never
+            # conditional, the browser sends the requests.
+            'price_monitor.middlewares.adaptive_throttle_middleware.AdaptiveThrottleDownloaderMiddleware': 950,
         }
     }
 
@@ -30,8 +85,9 @@ class Walmart:
         entities = None
         product = None
         js_data = response.meta.get('js_data')
+        fields = self.extraction_spec.extract(response)
 
-        product_data = response.css('div.js-content div.css-ay2u5v.evlleax1 script::text').get()
+        product_data = fields['product_data']
 
         if product_data:
             product_data = json.loads(product_data)
@@ -52,35 +108,35 @@ class Walmart:
         productLoader.add_value(product.Product.KEY_STORE, [self.store_name])
         productLoader.add_value(product.Product.KEY_DOMAIN, [self.domain])
         productLoader.add_value(product.Product.KEY_URL, [response.url])
-        productLoader.add_value(product.Product.KEY_CURRENT_OFFER, [self.__get_price(response, product_data)])
+        productLoader.add_value(product.Product.KEY_CURRENT_OFFER, [self.__get_price(response, product_data, fields['amount'])])
 
-        productLoader.add_css(product.Product.KEY_SOLD_BY, ['#product-desc p.seller-info span', 'div.css-9wd9vm.etlm3820 svg title', 'div.css-9wd9vm.etlm3820 a.css-1syn49.elkyjhv0'])
+        productLoader.add_value(product.Product.KEY_SOLD_BY, fields['sold_by'])
 
         # Description
         if sku and entities and entities.get('skus').get(sku).get('description'):
-            productLoader.add_css(product.Product.KEY_NAME, ['#product-desc h1', 'div.css-13hwhay.e1yn5b3f0 h1'])
+            productLoader.add_value(product.Product.KEY_NAME, fields['name'])
         elif product and product.get('item').get('description'):
-            productLoader.add_css(product.Product.KEY_NAME, ['#product-desc h1', 'div.css-13hwhay.e1yn5b3f0 h1'])
+            productLoader.add_value(product.Product.KEY_NAME, fields['name'])
         else:
-            productLoader.add_css(product.Product.KEY_NAME, ['#product-desc h1', 'div.css-13hwhay.e1yn5b3f0 h1'])
+            productLoader.add_value(product.Product.KEY_NAME, fields['name'])
 
         # Brand
         if sku and entities.get('skus').get(sku).get('brand').get('name'):
-            productLoader.add_css(product.Product.KEY_BRAND, ['#product-desc p.brand a.brand-link', 'div.css-uxtmi3.e1yn5b3f4 span a.css-1syn49.elkyjhv0'])
+            productLoader.add_value(product.Product.KEY_BRAND, fields['brand'])
         else:
-            productLoader.add_css(product.Product.KEY_BRAND, ['#product-desc p.brand a.brand-link', 'div.css-uxtmi3.e1yn5b3f4 span a.css-1syn49.elkyjhv0'])
+            productLoader.add_value(product.Product.KEY_BRAND, fields['brand'])
 
         # productLoader.add_xpath(Product.KEY_TAGS, ['//ul[contains(concat(" ", normalize-space(@class), " "), " breadcrumb ")]/li[last()-1]/a/@href'])
         # productLoader.add_value(Product.KEY_UPC, [response.url])
         return productLoader.load_item()
 
-    def __get_price(self, response, product_offers):
+    def __get_price(self, response, product_offers, amount=None):
         offerLoader = offer_item_loader.OfferItemLoader(response=response)
 
         if product_offers and product_offers.get('price'):
             offerLoader.add_value(offer.Offer.KEY_AMOUNT, str(product_offers.get('price')))
         else:
-            offerLoader.add_css(offer.Offer.KEY_AMOUNT, ['span[itemprop=price]', 'div.css-k008qs.e1ufqjyx0 > span.css-rykmet.esdkp3p2 > span.css-2vqe5n.esdkp3p0', 'body > div.js-content > div:nth-child(1) > div > div > div.css-0.eewy8oa0 > div.css-1i2cfe3.eewy8oa2 > div.css-18f77yw.eewy8oa4 > div > div.css-0.e1cd9jig0 > div > div.css-mzzkn5.e1yn5b3f5 > div > div > div.css-k008qs.e1ufqjyx0 > span.css-rykmet.esdkp3p2 > span'])
+            offerLoader.add_value(offer.Offer.KEY_AMOUNT, amount)
 
         if product_offers and product_offers.get('priceCurrency'):
             offerLoader.add_value(offer.Offer.KEY_CURRENCY, product_offers.get('priceCurrency'))
@@ -1,15 +1,29 @@
 import logging
 import pymongo
-import re
+import threading
+import time
+from bson.objectid import ObjectId
+from collections import namedtuple
 from datetime import datetime
+from pymongo.errors import (
+    BulkWriteError,
+    PyMongoError,
+)
 from scrapy.utils.project import get_project_settings
+from twisted.internet import task
 from typing import (
-    Dict, 
+    Dict,
     List,
     Optional,
+    Set,
     Union,
 )
+from price_monitor.helpers import (
+    brand_key_helper,
+    mongo_db_helper,
+)
 from price_monitor.items import (
+    global_trade_item_number_item,
     offer,
     product,
     product_data,
@@ -18,26 +32,295 @@ from price_monitor.items import (
 from price_monitor.models import (
     language,
 )
+from price_monitor.storage import (
+    latest_offer_store,
+    mongo_db_index_manager,
+    offer_history_store,
+    product_identity_cache,
+)
+
+PendingProduct = namedtuple(
+    'PendingProduct',
+    [
+        'product_dictionary',
+        'product_data_dictionary',
+        'offer_dictionary',
+        'store_dictionary',
+        'store_seller_key',
+        'lang',
+        'not_modified',
+    ],
+)
 
 class MongoDBPipeline(object):
+    # Stores upserted by any pipeline of this process.
+    ensured_store_ids = set()
+    # Batches kept for a retry while the database is unreachable.
+    MAX_RETRIED_BATCHES = 10
+
     def __init__(self):
         settings = get_project_settings()
-        connection = pymongo.MongoClient(
-            settings.get('MONGODB_SERVER'),
-            settings.get('MONGODB_PORT'),
-        )
-        db = connection[settings.get('MONGODB_DB')]
+        db = mongo_db_helper.MongoDBHelper.get_database(settings)
         self.products_collection = db[settings.get('MONGODB_COLLECTION_PRODUCTS')]
         self.offers_collection = db[settings.get('MONGODB_COLLECTION_OFFERS')]
         self.stores_collection = db[settings.get('MONGODB_COLLECTION_STORES')]
+        self.offers_layout = settings.get('MONGODB_OFFERS_LAYOUT')
+        self.offer_history_store = offer_history_store.OfferHistoryStore(
+            offer_history_collection=db[
+                settings.get('MONGODB_COLLECTION_OFFER_HISTORY')
+            ],
+        )
+        self.offers_changes_only = settings.getbool(
+            'MONGODB_OFFERS_CHANGES_ONLY'
+        )
+        self.latest_offer_store = latest_offer_store.LatestOfferStore(
+            offers_collection=self.offers_collection,
+            latest_offers_collection=db[
+                settings.get('MONGODB_COLLECTION_LATEST_OFFERS')
+            ],
+            max_size=settings.getint('LATEST_OFFER_CACHE_SIZE'),
+        )
+        self.index_manager = mongo_db_index_manager.MongoDBIndexManager(
+            db=db,
+            settings=settings,
+        )
+        self.create_indexes = settings.getbool('MONGODB_CREATE_INDEXES')
+
+        # Without bulk writes every item is flushed on its own.
+        self.bulk_write_enabled = settings.getbool(
+            'MONGODB_BULK_WRITE_ENABLED'
+        )
+        self.bulk_write_batch_size = settings.getint(
+            'MONGODB_BULK_WRITE_BATCH_SIZE'
+        ) if self.bulk_write_enabled else 1
+        self.bulk_write_max_latency = settings.getfloat(
+            'MONGODB_BULK_WRITE_MAX_LATENCY'
+        )
+        self.pending_products = []
+        self.pending_since = None
+        self.retried_products = []
+        self.flush_loop = None
+        self.products_lock = threading.Lock()
+        self.product_identity_cache = \
+            product_identity_cache.ProductIdentityCache(
+                max_size=settings.getint('PRODUCT_IDENTITY_CACHE_SIZE'),
+                ttl=settings.getfloat('PRODUCT_IDENTITY_CACHE_TTL'),
+            )
+        self.product_identity_cache_warm = settings.getbool(
+            'PRODUCT_IDENTITY_CACHE_WARM'
+        )
+
+    def open_spider(self, spider):
+        if self.create_indexes:
+            self.index_manager.create_missing_indexes()
+            self.index_manager.report(usage=False)
+
+        # A limit of 0 is no limit, a disabled cache would load all products.
+        if self.product_identity_cache_warm \
+            and self.product_identity_cache.max_size > 0:
+            self.__warm_product_identity_cache()
+
+        if self.bulk_write_enabled and self.bulk_write_max_latency > 0:
+            self.flush_loop = task.LoopingCall(self.__flush_if_due)
+            self.flush_loop.start(self.bulk_write_max_latency, now=False)
+
+    def close_spider(self, spider):
+        if self.flush_loop and self.flush_loop.running:
+            self.flush_loop.stop()
+
+        self.flush()
 
     def process_item(self, item, spider):
-        product_dictionary = item.get_dictionary()
-    
         # TODO: Add methods to item.
 
         # TODO: Handle errors.
 
+        if self._add_pending_product(item):
+            self.flush()
+
+        return item
+
+    def flush(self):
+        pending_products = self._take_pending_products()
+
+        if not pending_products:
+            return
+
+        try:
+            self._write_pending_products(pending_products)
+        except PyMongoError as error:
+            self._retry_pending_products(pending_products, error)
+
+    def _add_pending_product(self, item) -> bool:
+        if not self.pending_products:
+            self.pending_since = time.monotonic()
+
+        self.pending_products.append(self._create_pending_product(item))
+
+        return len(self.pending_products) >= self.bulk_write_batch_size
+
+    def _take_pending_products(self) -> List[PendingProduct]:
+        pending_products = self.retried_products + self.pending_products
+        self.retried_products = []
+        self.pending_products = []
+        self.pending_since = None
+
+        return pending_products
+
+    def _retry_pending_products(
+        self,
+        pending_products: List[PendingProduct],
+        error: Exception,
+    ):
+        # The cache may hold products that were not written.
+        self.product_identity_cache.clear()
+
+        # Kept apart from the pending products, so a full batch of retried
+        # items does not flush again on every new item.
+        max_size = self.bulk_write_batch_size * self.MAX_RETRIED_BATCHES
+        self.retried_products = pending_products[-max_size:]
+        dropped = len(pending_products) - len(self.retried_products)
+
+        logging.error(
+            f'Unable to write {len(pending_products)} items to database, '
+            f'retrying with the next batch: {error}'
+        )
+
+        if dropped:
+            logging.error(f'Dropped {dropped} items waiting for a retry.')
+
+    def _write_pending_products(
+        self,
+        pending_products: List[PendingProduct],
+    ):
+        stores = {}
+        product_inserts = {}
+        product_updates = {}
+        offer_dictionaries = []
+        not_modified_offer_dictionaries = []
+
+        # Matching must see the products written by the previous batch, so
+        # batches written from several threads take turns up to this point.
+        with self.products_lock:
+            products_by_gtin = self.__find_products_by_gtin(pending_products)
+            products_by_model_number_and_brand = \
+                self.__find_products_by_model_number_and_brand(
+                    pending_products=pending_products,
+                    products_by_gtin=products_by_gtin,
+                )
+
+            for pending_product in pending_products:
+                store_dictionary = pending_product.store_dictionary
+
+                if store_dictionary[store_item.StoreItem.KEY_ID] \
+                    not in MongoDBPipeline.ensured_store_ids:
+                    stores.setdefault(
+                        store_dictionary[store_item.StoreItem.KEY_ID],
+                        store_dictionary,
+                    )
+
+                product_id = self.__write_pending_product(
+                    pending_product=pending_product,
+                    products_by_gtin=products_by_gtin,
+                    products_by_model_number_and_brand= \
+                        products_by_model_number_and_brand,
+                    product_inserts=product_inserts,
+                    product_updates=product_updates,
+                )
+
+                # TODO: Check if URL is the same.
+                offer_dictionary = pending_product.offer_dictionary
+                offer_dictionary[offer.Offer.KEY_PRODUCT_ID] = product_id
+
+                if pending_product.not_modified:
+                    not_modified_offer_dictionaries.append(offer_dictionary)
+                else:
+                    offer_dictionaries.append(offer_dictionary)
+
+            # Each spider has a single store, so it is upserted once.
+            if stores and self.__bulk_write(
+                collection=self.stores_collection,
+                requests=[
+                    self.__create_upsert_store_request(store_dictionary)
+                    for store_dictionary in stores.values()
+                ],
+            ):
+                MongoDBPipeline.ensured_store_ids.update(stores.keys())
+            failed_product_ids = self.__write_products(
+                product_inserts=product_inserts,
+                product_updates=product_updates,
+            )
+
+            if failed_product_ids:
+                # The cache may hold products that were not written.
+                self.product_identity_cache.clear()
+
+        # Offers of products that were not written would be orphans.
+        if failed_product_ids:
+            offer_count = len(offer_dictionaries) \
+                + len(not_modified_offer_dictionaries)
+            offer_dictionaries = self.__remove_offers_of_products(
+                offer_dictionaries=offer_dictionaries,
+                product_ids=failed_product_ids,
+            )
+            not_modified_offer_dictionaries = \
+                self.__remove_offers_of_products(
+                    offer_dictionaries=not_modified_offer_dictionaries,
+                    product_ids=failed_product_ids,
+                )
+            skipped = offer_count - len(offer_dictionaries) \
+                - len(not_modified_offer_dictionaries)
+            logging.error(
+                f'Skipped {skipped} offers of products that were not written.'
+            )
+
+        if self.offers_layout == \
+            offer_history_store.OfferHistoryStore.LAYOUT_BUCKETS \
+            or self.offers_changes_only:
+            offer_dictionaries += not_modified_offer_dictionaries
+            not_modified_offer_dictionaries = []
+
+        if self.offers_layout == \
+            offer_history_store.OfferHistoryStore.LAYOUT_BUCKETS:
+            offers_added, offers_extended = \
+                self.offer_history_store.write_offers(offer_dictionaries), 0
+        elif self.offers_changes_only:
+            offers_added, offers_extended = \
+                self.latest_offer_store.write_offers(offer_dictionaries)
+        else:
+            self.__bulk_write(
+                collection=self.offers_collection,
+                requests=[
+                    pymongo.InsertOne(offer_dictionary)
+                    for offer_dictionary in offer_dictionaries
+                ],
+            )
+            offers_added, offers_extended = len(offer_dictionaries), 0
+
+        # Offers of pages that were not modified only extend the latest.
+        if not_modified_offer_dictionaries:
+            added, extended = self.latest_offer_store.write_offers(
+                not_modified_offer_dictionaries
+            )
+            offers_added += added
+            offers_extended += extended
+
+        logging.log(
+            logging.INFO,
+            f'Wrote {len(pending_products)} items to database, '
+            f'{len(product_inserts)} products added, '
+            f'{len(product_updates)} products updated, '
+            f'{offers_added} offers added, '
+            f'{offers_extended} offers unchanged.'
+        )
+
+    def _create_pending_product(self, item) -> PendingProduct:
+        product_dictionary = item.get_dictionary()
+        not_modified = product_dictionary.pop(
+            product.Product.KEY_NOT_MODIFIED,
+            False,
+        )
+
         # Extract sub dictionaries to new collections and modify dictionaries.
         offer_dictionary = product_dictionary.pop(
             product.Product.KEY_CURRENT_OFFER,
@@ -61,7 +344,7 @@ class MongoDBPipeline(object):
         lang = list(supported_languages)[0]
         product_data_store_dictionary[lang] = \
             product_data_store_dictionary.pop(
-                product_data.ProductData.KEY_LANGUAGE_DATA, 
+                product_data.ProductData.KEY_LANGUAGE_DATA,
                 None,
         )
 
@@ -73,113 +356,284 @@ class MongoDBPipeline(object):
             store_dictionary=store_dictionary,
         )
 
-        # TODO: Could have these values set in config no need to lookup values.
-        self.__upsert_store(store_dictionary)
-     
-        product_found_by_gtin = self.__find_product_found_by_gtin(
-            product_dictionary
-        ) if product_dictionary.get(product.Product.KEY_GTIN) else None
-        product_found_by_store_and_number = None
+        return PendingProduct(
+            product_dictionary=product_dictionary,
+            product_data_dictionary=product_data_dictionary,
+            offer_dictionary=offer_dictionary,
+            store_dictionary=store_dictionary,
+            store_seller_key=store_seller_key,
+            lang=lang,
+            not_modified=not_modified,
+        )
+
+    def __flush_if_due(self):
+        if not self.retried_products and (self.pending_since is None \
+            or time.monotonic() - self.pending_since \
+                < self.bulk_write_max_latency):
+            return None
+
+        # The loop stops on the first error, later items would then only be
+        # written once a batch is full.
+        try:
+            return self.flush()
+        except Exception as error:
+            logging.error(f'Timed flush failed: {error}')
+
+        return None
+
+    def __write_pending_product(
+        self,
+        pending_product: PendingProduct,
+        products_by_gtin: Dict,
+        products_by_model_number_and_brand: Dict,
+        product_inserts: Dict,
+        product_updates: Dict,
+    ):
+        product_dictionary = pending_product.product_dictionary
+        product_data_dictionary = pending_product.product_data_dictionary
+        store_seller_key = pending_product.store_seller_key
+        lang = pending_product.lang
+        gtin_key = self.__create_gtin_key(
+            product_dictionary.get(product.Product.KEY_GTIN)
+        )
         model_number = product_dictionary.get(
             product.Product.KEY_MODEL_NUMBER
         )
-        brand=product_dictionary.get(
-            product.Product.KEY_BRAND
+        brand_keys = brand_key_helper.BrandKeyHelper.create_brand_keys(
+            product_dictionary.get(product.Product.KEY_BRAND)
         )
+        brand_key = brand_keys[0] if brand_keys else None
 
-        if not product_found_by_gtin and model_number and brand:
-            product_found_by_store_and_number = \
-                self.__find_product_by_model_number_and_brand(
-                    model_number=model_number,
-                    brand=brand,
-                )
+        identity = products_by_gtin.get(gtin_key) if gtin_key else None
 
-        if not product_found_by_gtin \
-            and not product_found_by_store_and_number: 
-            # Insert product.
+        if not identity and model_number and brand_key:
+            identity = products_by_model_number_and_brand.get(
+                (model_number, brand_key)
+            )
+
+        if not identity:
+            # Insert product, later items of the batch can then find it.
             product_dictionary[
                 product.Product.KEY_PRODUCT_DATA
             ] = product_data_dictionary
-            
-            product_id = self.products_collection.insert(product_dictionary)
+            product_dictionary[product.Product.KEY_ID] = ObjectId()
+            product_dictionary[product.Product.KEY_BRAND_KEY] = brand_keys
+            product_inserts[
+                product_dictionary[product.Product.KEY_ID]
+            ] = product_dictionary
+            identity = product_identity_cache.ProductIdentity.from_document(
+                product_dictionary
+            )
+
+            if gtin_key:
+                products_by_gtin[gtin_key] = identity
+
+            if model_number and brand_key:
+                products_by_model_number_and_brand[
+                    (model_number, brand_key)
+                ] = identity
+
+            self.product_identity_cache.add(
+                identity=identity,
+                gtin_key=gtin_key,
+                model_number=model_number,
+                brand_keys=brand_keys,
+            )
+
             logging.log(logging.INFO, "Added product to database!")
+
+            return identity.product_id
+
+        product_data_store_seller_index = \
+            self.__create_store_seller_index(
+                store_seller_key=store_seller_key,
+            )
+
+        if not identity.has_store_seller_key(store_seller_key):
+            logging.info('Store data is not set.')
+
+            index = product_data_store_seller_index
+            value = product_data_dictionary[store_seller_key]
+        elif not identity.has_language(store_seller_key, lang):
+            # TODO: Add supported lang
+            index = self.__create_lang_data_index(
+                product_data_store_seller_index= \
+                    product_data_store_seller_index,
+                lang=lang,
+            )
+            value = product_data_dictionary.get(store_seller_key).get(lang)
+
+            logging.log(logging.INFO, "Updated product, added a new language in product data in database!") # TODO: More descriptive messages, use variables.
         else:
-            product1 = product_found_by_gtin \
-                or product_found_by_store_and_number
-            product_id = product1[product.Product.KEY_ID]
-            product_data_store_seller_index = \
-                self.__create_store_seller_index(
-                    store_seller_key=store_seller_key,
-                )
+            # logging.log(logging.INFO, "Updated product's product data in database!")
+            # TODO: Add new language to fields.
+            # TODO: Add supported languages.
+            return identity.product_id
 
-            if not product1[product.Product.KEY_PRODUCT_DATA].get(
-                store_seller_key
-            ):
-                logging.info('Store data is not set.')
-
-                self.products_collection.update_one(
-                    filter={
-                        product.Product.KEY_ID: product1[
-                            product.Product.KEY_ID
-                        ],
-                    }, 
-                    update={
-                        '$set': {
-                            product_data_store_seller_index: \
-                                product_data_dictionary[store_seller_key],
-                            product.Product.KEY_UPDATED: product_dictionary[
-                                product.Product.KEY_UPDATED
-                            ],
-                        },
-                        '$addToSet': self.__make_add_to_set_data(product_dictionary=product_dictionary, langauge=lang),
-                    },
-                    upsert=True,
-                )
-            elif not product1[product.Product.KEY_PRODUCT_DATA].get(
-                store_seller_key
-            ).get(lang):
-                # TODO: Add supported lang
-                product_data_store_seller_lang_index = \
-                    self.__create_lang_data_index(
-                        product_data_store_seller_index= \
-                            product_data_store_seller_index,
-                        lang=lang,
-                    )
+        identity.add_language(store_seller_key, lang)
+        self.__update_product(
+            product_id=identity.product_id,
+            index=index,
+            value=value,
+            product_dictionary=product_dictionary,
+            lang=lang,
+            product_inserts=product_inserts,
+            product_updates=product_updates,
+        )
 
-                self.products_collection.update_one(
-                    filter={
-                        product.Product.KEY_ID: product1[
-                            product.Product.KEY_ID
-                        ],
-                    }, 
-                    update={
-                        '$set': {
-                            product_data_store_seller_lang_index: \
-                                product_data_dictionary.get(
-                                    store_seller_key
-                                ).get(lang),
-                            product.Product.KEY_UPDATED: product_dictionary[
-                                product.Product.KEY_UPDATED
-                            ]
-                        },
-                        '$addToSet': self.__make_add_to_set_data(product_dictionary=product_dictionary, langauge=lang),
-                    },
-                    upsert=True,
-                )
+        return identity.product_id
+
+    def __update_product(
+        self,
+        product_id,
+        index: str,
+        value,
+        product_dictionary: Dict,
+        lang: str,
+        product_inserts: Dict,
+        product_updates: Dict,
+    ):
+        add_to_set_data = self.__make_add_to_set_data(
+            product_dictionary=product_dictionary,
+            langauge=lang,
+        )
 
-                logging.log(logging.INFO, "Updated product, added a new language in product data in database!") # TODO: More descriptive messages, use variables.
+        # A product inserted by this batch is not in the database yet, so the
+        # update is applied to the document waiting to be inserted.
+        if product_id in product_inserts:
+            product1 = product_inserts[product_id]
+            self.__set_by_index(
+                document=product1,
+                index=index,
+                value=value,
+            )
+            product1[product.Product.KEY_UPDATED] = product_dictionary[
+                product.Product.KEY_UPDATED
+            ]
 
-        # logging.log(logging.INFO, "Updated product's product data in database!") 
-        # TODO: Check if URL is the same.
-        # TODO: Add new language to fields.
-        # TODO: Add supported languages.
+            for key, values in add_to_set_data.items():
+                if not values:
+                    continue
 
-        offer_dictionary[offer.Offer.KEY_PRODUCT_ID] = product_id
+                current_values = product1.get(key) or []
+                product1[key] = current_values + [
+                    entry for entry in values if entry not in current_values
+                ]
 
-        offer_id = self.offers_collection.insert(offer_dictionary)
-        logging.log(logging.INFO, "Added offer to database!")
-        
-        return item
+            return
+
+        # Unordered bulk writes can run in any order, so all the updates of a
+        # product are merged into a single request.
+        update = product_updates.setdefault(product_id, {
+            '$set': {},
+            '$addToSet': {},
+        })
+        self.__merge_set_data(
+            set_data=update['$set'],
+            index=index,
+            value=value,
+        )
+        update['$set'][product.Product.KEY_UPDATED] = product_dictionary[
+            product.Product.KEY_UPDATED
+        ]
+
+        for key, values in add_to_set_data.items():
+            if not values:
+                continue
+
+            each = update['$addToSet'].setdefault(key, {'$each': []})['$each']
+            each.extend(entry for entry in values if entry not in each)
+
+    def __set_by_index(self, document: Dict, index: str, value):
+        keys = index.split('.')
+
+        for key in keys[:-1]:
+            document = document.setdefault(key, {})
+
+        document[keys[-1]] = value
+
+    def __merge_set_data(self, set_data: Dict, index: str, value):
+        keys = index.split('.')
+
+        # Mongo rejects an update setting both a path and one of its parents.
+        for i in range(1, len(keys)):
+            parent_index = '.'.join(keys[:i])
+
+            if parent_index in set_data:
+                subject = set_data[parent_index]
+
+                for key in keys[i:-1]:
+                    subject = subject.setdefault(key, {})
+
+                subject[keys[-1]] = value
+                return
+
+        set_data[index] = value
+
+    def __write_products(
+        self,
+        product_inserts: Dict,
+        product_updates: Dict,
+    ) -> Set:
+        product_ids = list(product_inserts) + list(product_updates)
+        product_requests = [
+            pymongo.InsertOne(product_dictionary)
+            for product_dictionary in product_inserts.values()
+        ] + [
+            pymongo.UpdateOne(
+                filter={product.Product.KEY_ID: product_id},
+                update=update,
+                upsert=True,
+            )
+            for product_id, update in product_updates.items()
+        ]
+
+        if not product_requests:
+            return set()
+
+        try:
+            self.products_collection.bulk_write(
+                product_requests,
+                ordered=False,
+            )
+        except BulkWriteError as error:
+            write_errors = error.details.get('writeErrors') or []
+            logging.error(
+                f'Bulk write to "{self.products_collection.name}" failed: '
+                f'{write_errors}'
+            )
+
+            # Error indexes are positions in the requests.
+            return {
+                product_ids[write_error['index']]
+                for write_error in write_errors
+            }
+
+        return set()
+
+    def __remove_offers_of_products(
+        self,
+        offer_dictionaries: List[Dict],
+        product_ids: Set,
+    ) -> List[Dict]:
+        return [
+            offer_dictionary for offer_dictionary in offer_dictionaries
+            if offer_dictionary[offer.Offer.KEY_PRODUCT_ID] not in product_ids
+        ]
+
+    def __bulk_write(self, collection, requests: List):
+        if not requests:
+            return None
+
+        try:
+            return collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as error:
+            logging.error(
+                f'Bulk write to "{collection.name}" failed: '
+                f'{error.details.get("writeErrors")}'
+            )
+
+        return None
 
     # def __is_product_data_set(self, subject, index): # TODO: No lookup required.
     #     return True if subject.get(index) else False
@@ -191,47 +645,186 @@ class MongoDBPipeline(object):
     #     return False
 
     def __create_store_seller_index(
-        self, 
+        self,
         store_seller_key,
     ):
         return product.Product.KEY_PRODUCT_DATA \
                     + '.' + store_seller_key
 
     def __create_lang_data_index(
-        self, 
+        self,
         product_data_store_seller_index: str,
         lang: str
     ):
         return product_data_store_seller_index \
                     + '.' + lang
 
-    def __find_product_found_by_gtin(self, product_dictionary):
-        return self.products_collection.find_one({
-            product.Product.KEY_GTIN: product_dictionary[
+    def __create_gtin_key(self, gtin):
+        if isinstance(gtin, dict):
+            return tuple(sorted(gtin.items()))
+
+        return gtin
+
+    def __cache_product_document(
+        self,
+        document: Dict,
+    ) -> product_identity_cache.ProductIdentity:
+        identity = product_identity_cache.ProductIdentity.from_document(
+            document
+        )
+        self.product_identity_cache.add(
+            identity=identity,
+            gtin_key=self.__create_gtin_key(
+                document.get(product.Product.KEY_GTIN)
+            ),
+            model_number=document.get(product.Product.KEY_MODEL_NUMBER),
+            brand_keys=self.__get_document_brand_keys(document),
+        )
+
+        return identity
+
+    def __get_document_brand_keys(self, document: Dict) -> List[str]:
+        # Products inserted before brand keys existed have to be backfilled,
+        # until then the key is derived from the brand.
+        if product.Product.KEY_BRAND_KEY in document:
+            return document[product.Product.KEY_BRAND_KEY] or []
+
+        return brand_key_helper.BrandKeyHelper.create_brand_keys(
+            document.get(product.Product.KEY_BRAND)
+        )
+
+    def __warm_product_identity_cache(self):
+        documents = self.products_collection.find(
+            projection=[
+                product.Product.KEY_GTIN,
+                product.Product.KEY_MODEL_NUMBER,
+                product.Product.KEY_BRAND,
+                product.Product.KEY_BRAND_KEY,
+                product.Product.KEY_PRODUCT_DATA,
+            ],
+        ).sort(
+            product.Product.KEY_UPDATED,
+            pymongo.DESCENDING,
+        ).limit(self.product_identity_cache.max_size)
+
+        for document in documents:
+            self.__cache_product_document(document)
+
+        logging.info(
+            f'Product identity cache warmed with '
+            f'{len(self.product_identity_cache)} entries.'
+        )
+
+    def __find_products_by_gtin(
+        self,
+        pending_products: List[PendingProduct],
+    ) -> Dict:
+        products_by_gtin = {}
+        gtin_values = set()
+
+        for pending_product in pending_products:
+            gtin = pending_product.product_dictionary.get(
                 product.Product.KEY_GTIN
-            ]
-        })
-    
-    def __find_product_by_model_number_and_brand(
-        self, 
-        model_number, 
-        brand,
-    ):
-        brand_regex = re.compile(f'^{brand}$', re.IGNORECASE)
-        
-        return self.products_collection.find_one(
-            {
-                '$and': [
-                    {
-                        product.Product.KEY_MODEL_NUMBER: model_number
-                    },
-                    {
-                        product.Product.KEY_BRAND: brand_regex
-                    }
-                ]
+            )
+
+            if not gtin:
+                continue
+
+            gtin_key = self.__create_gtin_key(gtin)
+            identity = self.product_identity_cache.get_by_gtin(gtin_key)
+
+            if identity:
+                products_by_gtin[gtin_key] = identity
+            elif isinstance(gtin, dict):
+                gtin_values.add(gtin.get(
+                    global_trade_item_number_item.GlobalTradeItemNumberItem \
+                        .KEY_VALUE
+                ))
+
+        if not gtin_values:
+            return products_by_gtin
+
+        # The value is indexed, the type is compared with the whole GTIN key.
+        for document in self.products_collection.find({
+            product.Product.KEY_GTIN + '.' + global_trade_item_number_item \
+                .GlobalTradeItemNumberItem.KEY_VALUE: {
+                '$in': list(gtin_values),
             }
-        )
-    
+        }):
+            gtin_key = self.__create_gtin_key(
+                document.get(product.Product.KEY_GTIN)
+            )
+
+            if gtin_key not in products_by_gtin:
+                products_by_gtin[gtin_key] = self.__cache_product_document(
+                    document
+                )
+
+        return products_by_gtin
+
+    def __find_products_by_model_number_and_brand(
+        self,
+        pending_products: List[PendingProduct],
+        products_by_gtin: Dict,
+    ) -> Dict:
+        products_by_model_number_and_brand = {}
+        conditions = {}
+
+        for pending_product in pending_products:
+            product_dictionary = pending_product.product_dictionary
+            gtin_key = self.__create_gtin_key(
+                product_dictionary.get(product.Product.KEY_GTIN)
+            )
+            model_number = product_dictionary.get(
+                product.Product.KEY_MODEL_NUMBER
+            )
+            brand_key = brand_key_helper.BrandKeyHelper.create_first_brand_key(
+                product_dictionary.get(product.Product.KEY_BRAND)
+            )
+
+            if (gtin_key and products_by_gtin.get(gtin_key)) \
+                or not model_number or not brand_key:
+                continue
+
+            identity = self.product_identity_cache \
+                .get_by_model_number_and_brand(
+                    model_number=model_number,
+                    brand_key=brand_key,
+                )
+
+            if identity:
+                products_by_model_number_and_brand[
+                    (model_number, brand_key)
+                ] = identity
+                continue
+
+            conditions.setdefault((model_number, brand_key), {
+                product.Product.KEY_MODEL_NUMBER: model_number,
+                product.Product.KEY_BRAND_KEY: brand_key,
+            })
+
+        if not conditions:
+            return products_by_model_number_and_brand
+
+        for document in self.products_collection.find({
+            '$or': list(conditions.values()),
+        }):
+            identity = None
+
+            for brand_key in self.__get_document_brand_keys(document):
+                key = (
+                    document.get(product.Product.KEY_MODEL_NUMBER),
+                    brand_key,
+                )
+
+                if key in conditions \
+                    and key not in products_by_model_number_and_brand:
+                    identity = identity \
+                        or self.__cache_product_document(document)
+                    products_by_model_number_and_brand[key] = identity
+
+        return products_by_model_number_and_brand
+
     def __add_or_fix_datetime_field(
         self,
         offer_dictionary,
@@ -256,10 +849,10 @@ class MongoDBPipeline(object):
             for datetime_index in datetime_indexes:
                 dictionary[datetime_index] = now
 
-    def __upsert_store(self, store_dictionary):
+    def __create_upsert_store_request(self, store_dictionary):
         # nUpserted
         # writeConcernError
-        return self.stores_collection.update_one(
+        return pymongo.UpdateOne(
             filter={
                 store_item.StoreItem.KEY_ID: store_dictionary[
                     store_item.StoreItem.KEY_ID
@@ -274,16 +867,19 @@ class MongoDBPipeline(object):
 
     def __make_add_to_set_data(self, product_dictionary: Dict, langauge: str) -> Dict:
         return {
-            product.Product.KEY_NAME: product_dictionary[
+            product.Product.KEY_NAME: [product_dictionary[
                 product.Product.KEY_NAME
-            ][0],
-            product.Product.KEY_BRAND: product_dictionary[
+            ][0]],
+            product.Product.KEY_BRAND: [product_dictionary[
                 product.Product.KEY_BRAND
-            ][0],
-            product.Product.KEY_SUPPORTED_LANGUAGES: langauge,
-            product.Product.KEY_TAGS: { 
-                '$each': product_dictionary.get(product.Product.KEY_TAGS) 
-            },
+            ][0]],
+            product.Product.KEY_BRAND_KEY: \
+                brand_key_helper.BrandKeyHelper.create_brand_keys(
+                    product_dictionary[product.Product.KEY_BRAND]
+                ),
+            product.Product.KEY_SUPPORTED_LANGUAGES: [langauge],
+            product.Product.KEY_TAGS: \
+                product_dictionary.get(product.Product.KEY_TAGS) or [],
         }
 
-        
\ No newline at end of file
+
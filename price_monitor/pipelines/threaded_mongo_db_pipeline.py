@@ -0,0 +1,93 @@
+import logging
+from pymongo.errors import PyMongoError
+from scrapy.utils.project import get_project_settings
+from twisted.internet import (
+    defer,
+    reactor,
+    threads,
+)
+from twisted.python.threadpool import ThreadPool
+from price_monitor.pipelines import mongo_db_pipeline
+
+class ThreadedMongoDBPipeline(mongo_db_pipeline.MongoDBPipeline):
+    """Writes batches from a dedicated thread pool instead of the reactor.
+
+    Items return once their batch is queued, so Scrapy keeps downloading and
+    parsing while product matching and offer inserts finish in the
+    background. When too many batches are in flight the items wait, which
+    fills Scrapy's scraper slot and slows the crawl down.
+    """
+
+    def __init__(self):
+        super().__init__()
+        settings = get_project_settings()
+        self.thread_pool = ThreadPool(
+            minthreads=1,
+            maxthreads=settings.getint('MONGODB_WRITER_THREADS'),
+            name='mongo_db_writer',
+        )
+        self.in_flight_writes = defer.DeferredSemaphore(
+            settings.getint('MONGODB_MAX_IN_FLIGHT_WRITES')
+        )
+        self.writes = set()
+
+    def open_spider(self, spider):
+        self.thread_pool.start()
+        super().open_spider(spider)
+
+    @defer.inlineCallbacks
+    def close_spider(self, spider):
+        if self.flush_loop and self.flush_loop.running:
+            self.flush_loop.stop()
+
+        try:
+            yield self.flush()
+            yield defer.DeferredList(list(self.writes))
+        finally:
+            self.thread_pool.stop()
+
+    def process_item(self, item, spider):
+        if self._add_pending_product(item):
+            return self.flush().addCallback(lambda _: item)
+
+        return item
+
+    def flush(self):
+        pending_products = self._take_pending_products()
+
+        if not pending_products:
+            return defer.succeed(None)
+
+        return self.in_flight_writes.acquire().addCallback(
+            self.__start_write,
+            pending_products,
+        )
+
+    def __start_write(self, semaphore, pending_products):
+        write = threads.deferToThreadPool(
+            reactor,
+            self.thread_pool,
+            self._write_pending_products,
+            pending_products,
+        )
+        write.addErrback(self.__log_failed_write, pending_products)
+        write.addBoth(self.__finish_write, write, semaphore)
+        self.writes.add(write)
+
+        # Only queuing is awaited, the write itself happens in the background.
+        return None
+
+    def __finish_write(self, result, write, semaphore):
+        self.writes.discard(write)
+        semaphore.release()
+
+        return result
+
+    def __log_failed_write(self, failure, pending_products):
+        # Errbacks run in the reactor thread, as the other flushes.
+        if failure.check(PyMongoError):
+            self._retry_pending_products(pending_products, failure.value)
+        else:
+            logging.error(
+                f'Unable to write items to database: {failure.value}'
+            )
@@ -1,15 +1,198 @@
+import argparse
+import collections
+import json
+import logging
 import os
-from scrapy.cmdline import execute
+import sys
+from scrapy.crawler import (
+    Crawler,
+    CrawlerProcess,
+)
+from scrapy.settings import Settings
+from scrapy.utils.project import get_project_settings
+from twisted.internet import reactor
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
 
-os.chdir(os.path.dirname(os.path.realpath(__file__)))
+DIRECTORY = os.path.dirname(os.path.realpath(__file__))
 
-try:
-    execute(
-        [
-            'scrapy',
-            'crawl',
-            'metro_spider',
-        ]
+class SpiderRunner(object):
+    """Runs the spiders of a schedule in one process.
+
+    All crawlers share the reactor, the Mongo client and the browser pool.
+    At most max_spiders crawl at once, each with its share of the global
+    concurrency, and the spiders of a store crawl one after the other so the
+    store never sees more than the per store concurrency.
+    """
+
+    KEY_SPIDERS = 'spiders'
+    KEY_NAME = 'name'
+    KEY_ARGUMENTS = 'arguments'
+    KEY_SETTINGS = 'settings'
+    KEY_CONCURRENT_REQUESTS = 'concurrent_requests'
+    KEY_CONCURRENT_REQUESTS_PER_STORE = 'concurrent_requests_per_store'
+    KEY_MAX_SPIDERS = 'max_spiders'
+    SUMMED_STATS = [
+        'downloader/request_count',
+        'downloader/response_count',
+        'downloader/response_bytes',
+        'item_scraped_count',
+        'item_dropped_count',
+        'log_count/ERROR',
+        'adaptive_throttle/backoffs',
+        'conditional_requests/not_modified',
+    ]
+
+    def __init__(self, schedule: Dict, settings: Optional[Settings] = None):
+        self.settings = settings or get_project_settings()
+        self.process = CrawlerProcess(self.settings)
+        self.max_spiders = schedule.get(self.KEY_MAX_SPIDERS, 4)
+        self.concurrent_requests = schedule.get(
+            self.KEY_CONCURRENT_REQUESTS,
+            self.settings.getint('CONCURRENT_REQUESTS'),
+        )
+        self.concurrent_requests_per_store = schedule.get(
+            self.KEY_CONCURRENT_REQUESTS_PER_STORE,
+            self.settings.getint('CONCURRENT_REQUESTS_PER_DOMAIN'),
+        )
+        self.pending = collections.deque(schedule[self.KEY_SPIDERS])
+        self.running_stores = set()
+        self.running = 0
+        self.stopping = False
+        self.stats = {}
+
+    def run(self) -> Dict:
+        self.__start_next()
+        self.process.start(stop_after_crawl=False)
+
+        return self.__create_summary()
+
+    def __start_next(self):
+        while self.running < self.max_spiders:
+            entry = self.__pop_next()
+
+            if not entry:
+                break
+
+            spider_class = self.process.spider_loader.load(
+                entry[self.KEY_NAME]
+            )
+            store = self.__get_store(spider_class)
+            self.running_stores.add(store)
+            self.running += 1
+            crawler = Crawler(spider_class, self.__create_settings(entry))
+            logging.log(logging.INFO, f'Starting {entry[self.KEY_NAME]}.')
+            # May finish, and start the next spiders, before returning.
+            self.process.crawl(
+                crawler,
+                **entry.get(self.KEY_ARGUMENTS, {})
+            ).addBoth(self.__finished, entry, crawler, store)
+
+        if not self.running and not self.stopping:
+            self.stopping = True
+            reactor.callLater(0, reactor.stop)
+
+    def __pop_next(self) -> Optional[Dict]:
+        for entry in self.pending:
+            spider_class = self.process.spider_loader.load(
+                entry[self.KEY_NAME]
+            )
+
+            if self.__get_store(spider_class) not in self.running_stores:
+                self.pending.remove(entry)
+
+                return entry
+
+        return None
+
+    def __finished(self, result, entry: Dict, crawler: Crawler, store):
+        if isinstance(result, Exception) or hasattr(result, 'getTraceback'):
+            logging.error(f'{entry[self.KEY_NAME]} failed: {result}')
+
+        self.stats[entry[self.KEY_NAME]] = crawler.stats.get_stats()
+        self.running_stores.discard(store)
+        self.running -= 1
+        self.__start_next()
+
+    def __create_settings(self, entry: Dict):
+        settings = self.settings.copy()
+        settings.setdict(
+            {
+                'CONCURRENT_REQUESTS': max(
+                    1,
+                    self.concurrent_requests // self.max_spiders,
+                ),
+                'CONCURRENT_REQUESTS_PER_DOMAIN': \
+                    self.concurrent_requests_per_store,
+            },
+            priority='cmdline',
+        )
+        settings.setdict(entry.get(self.KEY_SETTINGS, {}), priority='cmdline')
+
+        return settings
+
+    def __get_store(self, spider_class):
+        # Spiders of a store share its domains.
+        return tuple(getattr(spider_class, 'allowed_domains', None) or ()) \
+            or spider_class.name
+
+    def __create_summary(self) -> Dict:
+        summary = {'spiders': {}, 'total': {}}
+
+        for name, stats in self.stats.items():
+            summary['spiders'][name] = {
+                key: stats.get(key, 0) for key in self.SUMMED_STATS
+            }
+            summary['spiders'][name]['finish_reason'] = stats.get(
+                'finish_reason'
+            )
+            summary['spiders'][name]['elapsed_time_seconds'] = stats.get(
+                'elapsed_time_seconds',
+                0,
+            )
+
+        for key in self.SUMMED_STATS + ['elapsed_time_seconds']:
+            summary['total'][key] = sum(
+                spider_summary[key]
+                for spider_summary in summary['spiders'].values()
+            )
+
+        return summary
+
+def parse_arguments(arguments: List[str]):
+    parser = argparse.ArgumentParser(
+        description='Run the spiders of a schedule in one process.',
     )
-except SystemExit:
-    pass
\ No newline at end of file
+    parser.add_argument(
+        'schedule',
+        nargs='?',
+        default=os.path.join(DIRECTORY, 'schedule.json'),
+        help='JSON schedule of the spiders to run (default: schedule.json)',
+    )
+    parser.add_argument(
+        '--stats-file',
+        help='also write the combined stats to this JSON file',
+    )
+
+    return parser.parse_args(arguments)
+
+if __name__ == '__main__':
+    arguments = parse_arguments(sys.argv[1:])
+
+    with open(arguments.schedule) as file:
+        schedule = json.load(file)
+
+    stats_file = os.path.abspath(arguments.stats_file) \
+        if arguments.stats_file else None
+    # The project settings are found from the working directory.
+    os.chdir(DIRECTORY)
+    summary = SpiderRunner(schedule).run()
+    text = json.dumps(summary, indent=4, default=str)
+    print(text)
+
+    if stats_file:
+        with open(stats_file, 'w') as file:
+            file.write(text)
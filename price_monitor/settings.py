@@ -13,6 +13,7 @@ BOT_NAME = 'price_monitor'
 
 SPIDER_MODULES = ['price_monitor.spiders']
 NEWSPIDER_MODULE = 'price_monitor.spiders'
+COMMANDS_MODULE = 'price_monitor.commands'
 
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
 #USER_AGENT = 'price_monitor/VERSION (+http://www.yourdomain.com)'
@@ -27,7 +28,8 @@ ROBOTSTXT_OBEY = True
 # Configure a delay for requests for the same website (default: 0)
 # See https://doc.scrapy.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
-DOWNLOAD_DELAY = 10
+# The adaptive throttle sets the delay from each store's throttle policy.
+#DOWNLOAD_DELAY = 10
 # The download delay setting will honor only one of:
 CONCURRENT_REQUESTS_PER_DOMAIN = 16
 # CONCURRENT_REQUESTS_PER_IP = 16
@@ -46,21 +48,25 @@ COOKIES_ENABLED = False
 
 # Enable or disable spider middlewares
 # See https://doc.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
+SPIDER_MIDDLEWARES = {
 #    'price_monitor.middlewares.PriceMonitorSpiderMiddleware': 543,
-#}
+    'price_monitor.middlewares.conditional_request_middleware.ConditionalRequestSpiderMiddleware': 100,
+}
 
 # Enable or disable downloader middlewares
 # See https://doc.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
+DOWNLOADER_MIDDLEWARES = {
 #    'price_monitor.middlewares.PriceMonitorDownloaderMiddleware': 543,
-#}
+    'price_monitor.middlewares.conditional_request_middleware.ConditionalRequestDownloaderMiddleware': 560,
+    'price_monitor.middlewares.adaptive_throttle_middleware.AdaptiveThrottleDownloaderMiddleware': 950,
+}
 
 # Enable or disable extensions
 # See https://doc.scrapy.org/en/latest/topics/extensions.html
-#EXTENSIONS = {
+EXTENSIONS = {
 #    'scrapy.extensions.telnet.TelnetConsole': None,
-#}
+    'price_monitor.extensions.adaptive_throttle.AdaptiveThrottle': 0,
+}
 
 # Configure item pipelines
 # See https://doc.scrapy.org/en/latest/topics/item-pipeline.html
@@ -70,7 +76,8 @@ COOKIES_ENABLED = False
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://doc.scrapy.org/en/latest/topics/autothrottle.html
-AUTOTHROTTLE_ENABLED = True
+# Replaced by the adaptive throttle, which follows each store's policy.
+AUTOTHROTTLE_ENABLED = False
 # The initial download delay
 AUTOTHROTTLE_START_DELAY = 5
 # The maximum download delay to be set in case of high latencies
@@ -81,6 +88,13 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
 # Enable showing throttling stats for every response received:
 #AUTOTHROTTLE_DEBUG = False
 
+# Adaptive throttle. Policies are the throttle_policy of the store models,
+# CONCURRENT_REQUESTS_PER_DOMAIN caps their target concurrency. Timeouts and
+# connection errors are reported by AdaptiveThrottleDownloaderMiddleware.
+ADAPTIVE_THROTTLE_ENABLED = True
+# Log the delay and concurrency of every response received.
+ADAPTIVE_THROTTLE_DEBUG = False
+
 # Enable and configure HTTP caching (disabled by default)
 # See https://doc.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
 #HTTPCACHE_ENABLED = True
@@ -96,6 +110,106 @@ MONGODB_DB = 'price_monitor'
 MONGODB_COLLECTION_PRODUCTS = 'products'
 MONGODB_COLLECTION_OFFERS = 'offers'
 MONGODB_COLLECTION_STORES = 'stores'
+MONGODB_COLLECTION_LATEST_OFFERS = 'latest_offers'
+MONGODB_COLLECTION_OFFER_HISTORY = 'offer_history'
+# Create the indexes the pipelines need when a spider opens, see also
+# "scrapy mongo_db_indexes".
+MONGODB_CREATE_INDEXES = True
+# Buffer items and write them with unordered bulk writes. A batch is flushed
+# when it is full, when its oldest item is older than the max latency (in
+# seconds) or when the spider closes.
+MONGODB_BULK_WRITE_ENABLED = False
+MONGODB_BULK_WRITE_BATCH_SIZE = 500
+MONGODB_BULK_WRITE_MAX_LATENCY = 5
+# Used by ThreadedMongoDBPipeline. Items wait once this many batches are
+# queued or being written.
+MONGODB_WRITER_THREADS = 2
+MONGODB_MAX_IN_FLIGHT_WRITES = 4
+# Keeps matched products in memory so most lookups never reach the database,
+# a size of 0 disables it. Entries expire after the TTL (in seconds). Warming
+# loads the most recently updated products when the spider opens.
+PRODUCT_IDENTITY_CACHE_SIZE = 100000
+PRODUCT_IDENTITY_CACHE_TTL = 3600
+PRODUCT_IDENTITY_CACHE_WARM = False
+# Only insert an offer when its amount, availability, condition, currency or
+# end date changed since the latest offer of the product, store and seller.
+# Otherwise the latest offer's last_seen is extended.
+MONGODB_OFFERS_CHANGES_ONLY = False
+LATEST_OFFER_CACHE_SIZE = 100000
+# Write offers as one document each ('documents') or into monthly buckets of
+# the offer history collection ('buckets'), see "scrapy migrate_offer_history".
+# Changes only offers apply to the documents layout.
+MONGODB_OFFERS_LAYOUT = 'documents'
+
+# Browsers rendering pages for PriceMonitorDownloaderMiddleware, each one is
+# replaced after rendering SELENIUM_MAX_PAGES_PER_DRIVER pages.
+SELENIUM_DRIVERS = 2
+SELENIUM_MAX_PAGES_PER_DRIVER = 100
+# Pages are rendered without images and the blocked URL patterns, only the
+# DOM and scripts are needed. With the eager strategy driver.get returns once
+# the DOM is ready, then the middleware waits up to SELENIUM_JS_WAIT_TIMEOUT
+# seconds for the request's js_global_variable.
+SELENIUM_PAGE_LOAD_STRATEGY = 'eager'
+SELENIUM_JS_WAIT_TIMEOUT = 10
+SELENIUM_BLOCKED_URL_PATTERNS = [
+    '*.css',
+    '*.gif',
+    '*.ico',
+    '*.jpeg',
+    '*.jpg',
+    '*.mp4',
+    '*.png',
+    '*.svg',
+    '*.ttf',
+    '*.webp',
+    '*.woff',
+    '*.woff2',
+    '*doubleclick.net*',
+    '*facebook.net*',
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*googlesyndication.com*',
+    '*hotjar.com*',
+    '*newrelic.com*',
+]
+# Keep rendered pages and their js_data in .scrapy/SELENIUM_CACHE_DIR so
+# reruns do not start a browser. Entries expire after the expiration (in
+# seconds, 0 never expires) and the least recently used ones are removed
+# beyond the max size (in bytes).
+SELENIUM_CACHE_ENABLED = False
+SELENIUM_CACHE_DIR = 'selenium_cache'
+SELENIUM_CACHE_EXPIRATION_SECS = 0
+SELENIUM_CACHE_MAX_SIZE = 500 * 1024 * 1024
+
+# Sitemap spiders remember each product URL's lastmod, last fetch time and
+# offer hash in .scrapy/URL_STATE_DIR/<spider>.sqlite, and only request URLs
+# that are new, have a new lastmod or were fetched more than
+# URL_STATE_REVISIT_AFTER seconds ago. The interval doubles each time the
+# offer is unchanged, up to URL_STATE_MAX_REVISIT_AFTER seconds.
+URL_STATE_ENABLED = False
+URL_STATE_DIR = 'url_state'
+URL_STATE_REVISIT_AFTER = 7 * 24 * 60 * 60
+URL_STATE_MAX_REVISIT_AFTER = 28 * 24 * 60 * 60
+# Sitemap spiders visit known products when their offer history says a
+# change is RECRAWL_TARGET_CHANGE_PROBABILITY likely, with the change rate
+# smoothed towards RECRAWL_PRIOR_CHANGES per RECRAWL_PRIOR_DAYS days and the
+# interval kept between the min and max (in seconds).
+RECRAWL_SCHEDULER_ENABLED = False
+RECRAWL_TARGET_CHANGE_PROBABILITY = 0.5
+RECRAWL_PRIOR_CHANGES = 1
+RECRAWL_PRIOR_DAYS = 30
+RECRAWL_MIN_INTERVAL = 24 * 60 * 60
+RECRAWL_MAX_INTERVAL = 60 * 24 * 60 * 60
+
+# Send If-None-Match and If-Modified-Since with the validators kept in
+# .scrapy/CONDITIONAL_REQUESTS_DIR/<spider>.sqlite. For a 304 the page's last
+# item is scraped again and its offer only extends the latest offer's
+# last_seen.
+CONDITIONAL_REQUESTS_ENABLED = False
+CONDITIONAL_REQUESTS_DIR = 'validators'
+
+# Load products, offers and their data as slotted records instead of items.
+ITEM_RECORDS_ENABLED = False
 
 # Item and model version numbers.
 PRODUCT_ITEM_VERSION = 1.0     # TODO: Rename.
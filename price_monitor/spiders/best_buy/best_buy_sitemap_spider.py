@@ -1,10 +1,12 @@
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.best_besy import BestBuy
 
-class BestBuySitemapSpider(SitemapSpider):
+class BestBuySitemapSpider(IncrementalSitemapSpider):
     name = 'best_buy_sitemap_spider'
+    store_id = BestBuy.store_id
     allowed_domains = BestBuy.allowed_domains
     custom_settings = BestBuy.custom_settings
+    throttle_policy = BestBuy.throttle_policy
     sitemap_urls = ['http://www.bestbuy.ca/robots.txt']
     sitemap_rules = [
         ('/en-ca/product/', 'parse_product'),
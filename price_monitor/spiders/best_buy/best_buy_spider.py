@@ -6,6 +6,7 @@ class BestBuySpider(Spider):
     name = 'best_buy_spider'
     allowed_domains = BestBuy.allowed_domains
     custom_settings = BestBuy.custom_settings
+    throttle_policy = BestBuy.throttle_policy
     start_urls = [
         'https://www.bestbuy.ca/en-ca/product/sony-65-4k-uhd-hdr-led-android-smart-tv-xbr65x950g/13375799',
         # 'https://www.bestbuy.ca/en-ca/product/spider-man-ps4/10439890.aspx',
@@ -1,10 +1,12 @@
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.iga import IGA
 
-class IGASitemapSpider(SitemapSpider):
+class IGASitemapSpider(IncrementalSitemapSpider):
     name = 'iga_sitemap_spider'
+    store_id = IGA.store_id
     allowed_domains = IGA.allowed_domains
     custom_settings = IGA.custom_settings
+    throttle_policy = IGA.throttle_policy
     sitemap_urls = ['http://www.iga.net/robots.txt']
     sitemap_rules = [
         ('/en/product/', 'parse_product'),
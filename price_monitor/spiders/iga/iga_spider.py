@@ -5,6 +5,7 @@ class IGASpider(Spider):
     name = 'iga_spider'
     allowed_domains = IGA.allowed_domains
     custom_settings = IGA.custom_settings
+    throttle_policy = IGA.throttle_policy
     start_urls = [
         # 'https://www.iga.net/en/product/cheesemarble-cheddar/00000_000000006810090189',
         # 'https://www.iga.net/en/product/cheesemozzarellissima-20-/00000_000000006354999379',
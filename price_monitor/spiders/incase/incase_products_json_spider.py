@@ -0,0 +1,18 @@
+from price_monitor.models.incase import Incase
+from price_monitor.spiders.shopify.shopify_products_json_spider import ShopifyProductsJsonSpider
+
+class IncaseProductsJsonSpider(ShopifyProductsJsonSpider):
+    name = 'incase_products_json_spider'
+    allowed_domains = Incase.allowed_domains
+    throttle_policy = Incase.throttle_policy
+    custom_settings = {
+        # Only Incase product pages need a browser, its JSON does not.
+        'ITEM_PIPELINES': Incase.custom_settings['ITEM_PIPELINES'],
+    }
+    base_urls = [
+        'https://incasedesigns.ca',
+    ]
+
+    def __init__(self, *a, **kw):
+        super(IncaseProductsJsonSpider, self).__init__(*a, **kw)
+        self.store = Incase()
@@ -1,10 +1,12 @@
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.incase import Incase
 
-class LeonsSitemapSpider(SitemapSpider):
+class LeonsSitemapSpider(IncrementalSitemapSpider):
     name = 'incase_sitemap_spider'
+    store_id = Incase.store_id
     allowed_domains = Incase.allowed_domains
     custom_settings = Incase.custom_settings
+    throttle_policy = Incase.throttle_policy
     sitemap_urls = ['http://www.incasedesigns.ca/robots.txt']
     sitemap_rules = [
         ('/product/', 'parse_product'),
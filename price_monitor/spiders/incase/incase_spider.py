@@ -6,6 +6,7 @@ class IncaseSpider(Spider):
     name = 'incase_spider'
     allowed_domains = Incase.allowed_domains
     custom_settings = Incase.custom_settings
+    throttle_policy = Incase.throttle_policy
     start_urls = [
         'https://incasedesigns.ca/products/cl55532-blk-os',
     ]
@@ -16,7 +17,7 @@ class IncaseSpider(Spider):
 
     def start_requests(self):
         for url in self.start_urls:
-            yield Request(url, dont_filter=True, meta={'js_global_variable': 'window.productJSON'})
+            yield Request(url, dont_filter=True, meta={'js_global_variable': 'window.productJSON', 'js_data_only': True})
 
     def parse(self, response):
         return self.incase.parse_product(response)
\ No newline at end of file
@@ -0,0 +1,18 @@
+from price_monitor.models.leons import Leons
+from price_monitor.spiders.shopify.shopify_products_json_spider import ShopifyProductsJsonSpider
+
+class LeonsProductsJsonSpider(ShopifyProductsJsonSpider):
+    name = 'leons_products_json_spider'
+    allowed_domains = Leons.allowed_domains
+    throttle_policy = Leons.throttle_policy
+    custom_settings = {
+        'ITEM_PIPELINES': Leons.custom_settings['ITEM_PIPELINES'],
+    }
+    base_urls = [
+        'https://www.leons.ca',
+        'https://fr.leons.ca',
+    ]
+
+    def __init__(self, *a, **kw):
+        super(LeonsProductsJsonSpider, self).__init__(*a, **kw)
+        self.store = Leons()
@@ -1,10 +1,12 @@
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.leons import Leons
 
-class LeonsSitemapSpider(SitemapSpider):
+class LeonsSitemapSpider(IncrementalSitemapSpider):
     name = 'leons_sitemap_spider'
+    store_id = Leons.store_id
     allowed_domains = Leons.allowed_domains
     custom_settings = Leons.custom_settings
+    throttle_policy = Leons.throttle_policy
     sitemap_urls = ['http://www.leons.ca/robots.txt']
     sitemap_rules = [
         ('/product/', 'parse_product'),
@@ -6,6 +6,7 @@ class LeonsSpider(Spider):
     name = 'leons_spider'
     allowed_domains = Leons.allowed_domains
     custom_settings = Leons.custom_settings
+    throttle_policy = Leons.throttle_policy
     start_urls = [
         # 'https://www.leons.ca/products/sony-65-4k-hdr-smart-120hz-led-tv-xbr65x950g?variant=15940800118830',
         'https://www.leons.ca/products/sony-65-4k-hdr-android-smart-xr240-led-tv-xbr65x800h?variant=31644334194734',
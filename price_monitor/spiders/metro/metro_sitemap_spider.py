@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.metro import Metro
 
-class MetroSitemapSpider(SitemapSpider):
+class MetroSitemapSpider(IncrementalSitemapSpider):
     name = 'metro_sitemap_spider'
+    store_id = Metro.store_id
     allowed_domains = Metro.allowed_domains
     custom_settings = Metro.custom_settings
+    throttle_policy = Metro.throttle_policy
     sitemap_urls = ['https://www.metro.ca/robots.txt']
     sitemap_rules = [
         ('/en/online-grocery/aisles/', 'parse_product'),
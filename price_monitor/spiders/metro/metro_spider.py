@@ -7,6 +7,7 @@ class MetroSpider(Spider):
     name = 'metro_spider'
     allowed_domains = Metro.allowed_domains
     custom_settings = Metro.custom_settings
+    throttle_policy = Metro.throttle_policy
     start_urls = [
         'https://www.metro.ca/en/online-grocery/aisles/dairy-cheese/yogurt/drinkable-yogurts/2-raspberry-flavoured-drinkable-yogurt/p/056920012029',
         # 'https://www.metro.ca/en/online-grocery/aisles/dairy-cheese/milk-cream/flavoured-milk/1-chocolate-milk/p/068700106361',
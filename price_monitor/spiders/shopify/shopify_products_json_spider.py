@@ -0,0 +1,57 @@
+from scrapy.http import Request
+from scrapy.spiders import Spider
+
+class ShopifyProductsJsonSpider(Spider):
+    # Crawls the catalogue from /products.json, or only the product URLs
+    # given with "-a product_urls=" from /products/<handle>.js.
+    store = None
+    base_urls = []
+
+    def __init__(self, product_urls=None, *a, **kw):
+        super(ShopifyProductsJsonSpider, self).__init__(*a, **kw)
+        self.product_urls = product_urls.split(',') if product_urls else []
+
+    def start_requests(self):
+        for url in self.product_urls:
+            yield Request(
+                url.split('?')[0] + '.js',
+                callback=self.parse_product_js,
+                dont_filter=True,
+            )
+
+        if not self.product_urls:
+            for base_url in self.base_urls:
+                yield self.__create_products_json_request(base_url, 1)
+
+    def parse(self, response):
+        base_url = response.meta['base_url']
+        products = self.store.find_products_json_products(response)
+
+        for data in products:
+            item = self.store.parse_products_json_product(
+                response,
+                base_url,
+                data,
+            )
+
+            if item:
+                yield item
+
+        # A full page means there may be another one.
+        if len(products) >= self.store.PRODUCTS_JSON_LIMIT:
+            yield self.__create_products_json_request(
+                base_url,
+                response.meta['page'] + 1,
+            )
+
+    def parse_product_js(self, response):
+        return self.store.parse_product_js(response)
+
+    def __create_products_json_request(self, base_url, page):
+        return Request(
+            self.store.create_products_json_url(base_url, page),
+            meta={
+                'base_url': base_url,
+                'page': page,
+            },
+        )
@@ -0,0 +1,160 @@
+import calendar
+import os
+from datetime import datetime
+from scrapy import signals
+from scrapy.http import Request
+from scrapy.utils.project import data_path
+from price_monitor.helpers import (
+    mongo_db_helper,
+)
+from price_monitor.items import (
+    offer,
+    product,
+)
+from price_monitor.spiders.sitemap import (
+    streaming_sitemap_spider,
+)
+from price_monitor.storage import (
+    recrawl_scheduler,
+    url_state_store,
+)
+
+class IncrementalSitemapSpider(
+    streaming_sitemap_spider.StreamingSitemapSpider
+):
+    # Only requests the product URLs of the sitemaps that are new, changed
+    # since they were fetched or due for a revisit, see URL_STATE_ENABLED.
+    # With RECRAWL_SCHEDULER_ENABLED, known products of the store are visited
+    # when a change is likely, most likely first.
+    store_id = None
+    url_state_store = None
+    recrawl_schedule = {}
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+
+        if crawler.settings.getbool('RECRAWL_SCHEDULER_ENABLED') \
+            and spider.store_id:
+            spider.recrawl_schedule = recrawl_scheduler.RecrawlScheduler(
+                db=mongo_db_helper.MongoDBHelper.get_database(
+                    crawler.settings
+                ),
+                settings=crawler.settings,
+            ).create_schedule(spider.store_id)
+
+        if crawler.settings.getbool('URL_STATE_ENABLED'):
+            spider.url_state_store = url_state_store.UrlStateStore(
+                path=os.path.join(
+                    data_path(
+                        crawler.settings.get('URL_STATE_DIR'),
+                        createdir=True,
+                    ),
+                    f'{spider.name}.sqlite',
+                ),
+                revisit_after=crawler.settings.getint(
+                    'URL_STATE_REVISIT_AFTER'
+                ),
+                max_revisit_after=crawler.settings.getint(
+                    'URL_STATE_MAX_REVISIT_AFTER'
+                ),
+            )
+            spider.pending_lastmods = {}
+            crawler.signals.connect(
+                spider.item_scraped,
+                signal=signals.item_scraped,
+            )
+            crawler.signals.connect(
+                spider.spider_closed,
+                signal=signals.spider_closed,
+            )
+
+        return spider
+
+    def start_requests(self):
+        now = datetime.utcnow()
+
+        # Due products go first, they need not wait for their sitemap.
+        for visit in sorted(
+            self.recrawl_schedule.values(),
+            key=lambda visit: visit.priority,
+            reverse=True,
+        ):
+            callback = self.__find_callback(visit.url)
+
+            if visit.next_visit <= now and callback:
+                self.__add_pending_lastmod(visit.url, None)
+                yield self._create_product_request(visit.url, callback)
+
+        yield from super().start_requests()
+
+    def sitemap_filter(self, entries):
+        now = datetime.utcnow()
+
+        for entry in entries:
+            loc = entry['loc']
+            visit = self.recrawl_schedule.get(loc)
+
+            if not self.__is_product_url(loc):
+                yield entry
+            elif self.url_state_store is not None:
+                if self.url_state_store.is_due(
+                    loc,
+                    entry.get('lastmod'),
+                    calendar.timegm(visit.next_visit.timetuple()) \
+                        if visit else None,
+                ):
+                    self.__add_pending_lastmod(loc, entry.get('lastmod'))
+                    yield entry
+            elif not visit or visit.next_visit <= now:
+                yield entry
+
+    def _create_product_request(self, url, callback):
+        visit = self.recrawl_schedule.get(url)
+
+        return Request(
+            url,
+            callback=callback,
+            priority=visit.priority if visit else 0,
+        )
+
+    def item_scraped(self, item, response, spider):
+        # Only pages with a product count as fetched, errors are due again
+        # on the next crawl. A 304 scrapes the last item again.
+        url = self.__get_original_url(response)
+        self.url_state_store.set_scraped(
+            url,
+            url_state_store.UrlStateStore.create_offer_hash(
+                self.__get_offer_fingerprint(item)
+            ),
+            self.pending_lastmods.pop(url, None),
+        )
+
+    def spider_closed(self, spider):
+        self.url_state_store.close()
+
+    def __is_product_url(self, url):
+        return self.__find_callback(url) is not None
+
+    def __find_callback(self, url):
+        for rule, callback in self._cbs:
+            if rule.search(url):
+                return callback
+
+        return None
+
+    def __add_pending_lastmod(self, url, lastmod):
+        if self.url_state_store is not None:
+            self.pending_lastmods[url] = lastmod
+
+    def __get_original_url(self, response):
+        return response.meta.get('redirect_urls', [response.url])[0]
+
+    def __get_offer_fingerprint(self, item):
+        current_offer = item.get(product.Product.KEY_CURRENT_OFFER) or {}
+
+        # The offer's datetime changes on every fetch.
+        return {
+            key: value for key, value in dict(current_offer).items()
+            if key != offer.Offer.KEY_DATETIME
+        }
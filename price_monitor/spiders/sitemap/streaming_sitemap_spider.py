@@ -0,0 +1,155 @@
+import gzip
+import io
+import logging
+from lxml import etree
+from scrapy.http import (
+    Request,
+    XmlResponse,
+)
+from scrapy.spiders import SitemapSpider
+from scrapy.spiders.sitemap import iterloc
+from scrapy.utils.gz import gzip_magic_number
+
+class DecompressionMaxSizeExceeded(ValueError):
+    pass
+
+class MaxSizeStream:
+    # Stops a decompressing stream once max_size bytes were read, 0 is no
+    # limit. The downloader only limits the compressed size.
+
+    def __init__(self, stream, max_size: int):
+        self.stream = stream
+        self.max_size = max_size
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.size += len(data)
+
+        if self.max_size and self.size > self.max_size:
+            raise DecompressionMaxSizeExceeded(
+                f'larger than {self.max_size} bytes once decompressed'
+            )
+
+        return data
+
+class StreamingSitemapSpider(SitemapSpider):
+    # Parses sitemaps with iterparse while decompressing them, clearing each
+    # entry once read, so memory does not grow with the sitemap and requests
+    # are yielded while the rest of the file is still unread.
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider._max_size = getattr(
+            spider,
+            'download_maxsize',
+            crawler.settings.getint('DOWNLOAD_MAXSIZE'),
+        )
+
+        return spider
+
+    def _parse_sitemap(self, response):
+        if response.url.endswith('/robots.txt'):
+            yield from super()._parse_sitemap(response)
+            return
+
+        stream = self._get_sitemap_stream(response)
+
+        if stream is None:
+            logging.warning(f'Ignoring invalid sitemap: {response}')
+            return
+
+        sitemap = {'type': None}
+        entries = self.sitemap_filter(
+            self.__iterate_entries(stream, sitemap, response)
+        )
+
+        for loc in iterloc(entries, self.sitemap_alternate_links):
+            if sitemap['type'] == 'sitemapindex':
+                if any(x.search(loc) for x in self._follow):
+                    yield Request(loc, callback=self._parse_sitemap)
+            elif sitemap['type'] == 'urlset':
+                for r, c in self._cbs:
+                    if r.search(loc):
+                        yield self._create_product_request(loc, c)
+                        break
+
+    def _create_product_request(self, url, callback):
+        return Request(url, callback=callback)
+
+    def _get_sitemap_stream(self, response):
+        if gzip_magic_number(response):
+            return MaxSizeStream(
+                stream=gzip.GzipFile(fileobj=io.BytesIO(response.body)),
+                max_size=self._max_size,
+            )
+        elif isinstance(response, XmlResponse) \
+            or response.url.endswith('.xml') \
+            or response.url.endswith('.xml.gz'):
+            return io.BytesIO(response.body)
+
+        return None
+
+    def __iterate_entries(self, stream, sitemap, response):
+        events = etree.iterparse(
+            stream,
+            events=('start', 'end'),
+            recover=True,
+            remove_comments=True,
+            resolve_entities=False,
+            huge_tree=True,
+        )
+        depth = 0
+
+        try:
+            for event, element in events:
+                if event == 'start':
+                    if depth == 0:
+                        sitemap['type'] = self.__get_name(element)
+
+                    depth += 1
+                    continue
+
+                depth -= 1
+
+                # Only whole <url> or <sitemap> entries are read.
+                if depth != 1:
+                    continue
+
+                entry = self.__create_entry(element)
+
+                # The entry and the ones before it are no longer needed.
+                element.clear()
+
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+                if 'loc' in entry:
+                    yield entry
+        except (
+            etree.XMLSyntaxError,
+            OSError,
+            EOFError,
+            DecompressionMaxSizeExceeded,
+        ) as error:
+            logging.warning(f'Stopped reading sitemap {response}: {error}')
+
+    def __create_entry(self, element):
+        entry = {}
+
+        for child in element:
+            name = self.__get_name(child)
+
+            if name == 'link':
+                if 'href' in child.attrib:
+                    entry.setdefault('alternate', []).append(child.get('href'))
+            else:
+                entry[name] = child.text.strip() if child.text else ''
+
+        return entry
+
+    def __get_name(self, element):
+        tag = element.tag
+
+        return tag.split('}', 1)[1] if '}' in tag else tag
@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.staples import Staples
 
-class StaplesSitemapSpider(SitemapSpider):
+class StaplesSitemapSpider(IncrementalSitemapSpider):
     name = 'staples_sitemap_spider'
     allowed_domains = Staples.allowed_domains
     custom_settings = Staples.custom_settings
+    throttle_policy = Staples.throttle_policy
     sitemap_urls = ['https://www.staples.ca/robots.txt']
     sitemap_rules = [
         ('/en-ca/product/', 'parse_product'),
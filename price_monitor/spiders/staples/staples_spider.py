@@ -7,6 +7,7 @@ class StaplesSpider(Spider):
     name = 'staples_spider'
     allowed_domains = Staples.allowed_domains
     custom_settings = Staples.custom_settings
+    throttle_policy = Staples.throttle_policy
     start_urls = [
         'https://www.bestbuy.ca/en-ca/product/spider-man-ps4/10439890.aspx',
     ]
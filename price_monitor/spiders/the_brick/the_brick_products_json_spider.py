@@ -0,0 +1,18 @@
+from price_monitor.models.the_brick import TheBrick
+from price_monitor.spiders.shopify.shopify_products_json_spider import ShopifyProductsJsonSpider
+
+class TheBrickProductsJsonSpider(ShopifyProductsJsonSpider):
+    name = 'the_brick_products_json_spider'
+    allowed_domains = TheBrick.allowed_domains
+    throttle_policy = TheBrick.throttle_policy
+    custom_settings = {
+        'ITEM_PIPELINES': TheBrick.custom_settings['ITEM_PIPELINES'],
+    }
+    base_urls = [
+        'https://www.thebrick.com',
+        'https://www.brickenligne.com',
+    ]
+
+    def __init__(self, *a, **kw):
+        super(TheBrickProductsJsonSpider, self).__init__(*a, **kw)
+        self.store = TheBrick()
@@ -1,10 +1,12 @@
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.the_brick import TheBrick
 
-class TheBrickSitemapSpider(SitemapSpider):
+class TheBrickSitemapSpider(IncrementalSitemapSpider):
     name = 'the_brick_sitemap_spider'
+    store_id = TheBrick.store_id
     allowed_domains = TheBrick.allowed_domains
     custom_settings = TheBrick.custom_settings
+    throttle_policy = TheBrick.throttle_policy
     sitemap_urls = ['http://www.thebrick.com/robots.txt']
     sitemap_rules = [
         ('/products/', 'parse_product'),
@@ -6,6 +6,7 @@ class TheBrickSpider(Spider):
     name = 'the_brick_spider'
     allowed_domains = TheBrick.allowed_domains
     custom_settings = TheBrick.custom_settings
+    throttle_policy = TheBrick.throttle_policy
     start_urls = [
         'https://www.thebrick.com/products/sony-65-x950g-4k-uhd-led-smart-television-xbr65x950g#cm-store',
     ]
@@ -1,10 +1,12 @@
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.toysrus import Toysrus
 
-class ToysrusSitemapSpider(SitemapSpider):
+class ToysrusSitemapSpider(IncrementalSitemapSpider):
     name = 'toysrus_sitemap_spider'
+    store_id = Toysrus.store_id
     allowed_domains = Toysrus.allowed_domains
     custom_settings = Toysrus.custom_settings
+    throttle_policy = Toysrus.throttle_policy
     sitemap_urls = ['http://www.toysrus.ca/robots.txt']
     sitemap_rules = [
         ('/en/', 'parse_product'),
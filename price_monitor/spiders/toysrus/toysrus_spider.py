@@ -6,6 +6,7 @@ class ToysrusSpider(Spider):
     name = 'toysrus_spider'
     allowed_domains = Toysrus.allowed_domains
     custom_settings = Toysrus.custom_settings
+    throttle_policy = Toysrus.throttle_policy
     start_urls = [
         # 'https://www.toysrus.ca/en/Star-Wars-The-Vintage-Collection-The-Mandalorian-AT-ST-Raider-Vehicle-with-Figure/7489BAB1.html',
         # 'https://www.toysrus.ca/en/Star-Wars-The-Black-Series-The-Mandalorian-6-inch-Scale-Collectible--063061/3AC65FDE.html',
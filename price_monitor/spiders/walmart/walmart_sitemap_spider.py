@@ -1,13 +1,14 @@
 # -*- coding: utf-8 -*-
 
 from scrapy.http import Request
-from scrapy.spiders import SitemapSpider
+from price_monitor.spiders.sitemap.incremental_sitemap_spider import IncrementalSitemapSpider
 from price_monitor.models.walmart import Walmart
 
-class WalmartSitemapSpider(SitemapSpider):
+class WalmartSitemapSpider(IncrementalSitemapSpider):
     name = 'walmart_sitemap_spider'
     allowed_domains = Walmart.allowed_domains
     custom_settings = Walmart.custom_settings
+    throttle_policy = Walmart.throttle_policy
     sitemap_urls = ['https://www.walmart.ca/robots.txt']
     sitemap_rules = [
         ('/en/ip/.*star-wars', 'parse_product'),
@@ -8,6 +8,7 @@ class WalmartSpider(Spider):
     name = 'walmart_spider'
     allowed_domains = Walmart.allowed_domains
     custom_settings = Walmart.custom_settings
+    throttle_policy = Walmart.throttle_policy
     start_urls = [
         # 'https://www.walmart.ca/en/ip/mastro-hot-genoa-salami/6000199245768',
         # 'https://www.walmart.ca/en/ip/rogue-one-a-star-wars-story-blu-ray-dvd-digital-hd/6000196818817',
@@ -0,0 +1,163 @@
+import logging
+import pymongo
+import threading
+from bson.objectid import ObjectId
+from collections import OrderedDict
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
+from price_monitor.items import (
+    offer,
+)
+
+class LatestOfferStore:
+    """Remembers the latest offer of each product, store and seller.
+
+    Offers are only inserted when they differ from the latest one, otherwise
+    the latest offer's last seen time is extended. The latest offers are kept
+    in memory and in their own collection so other runs can use them.
+    """
+
+    KEY_OFFER_ID = 'offer_id'
+    FINGERPRINT_KEYS = [
+        offer.Offer.KEY_AMOUNT,
+        offer.Offer.KEY_AVAILABILITY,
+        offer.Offer.KEY_CONDITION,
+        offer.Offer.KEY_CURRENCY,
+        offer.Offer.KEY_END_DATE,
+    ]
+
+    def __init__(
+        self,
+        offers_collection: Collection,
+        latest_offers_collection: Collection,
+        max_size: int,
+    ):
+        self.offers_collection = offers_collection
+        self.latest_offers_collection = latest_offers_collection
+        self.max_size = max_size
+        self.latest_offers = OrderedDict()
+        self.lock = threading.Lock()
+
+    def write_offers(self, offer_dictionaries: List[Dict]) -> Tuple[int, int]:
+        with self.lock:
+            return self.__write_offers(offer_dictionaries)
+
+    def __write_offers(self, offer_dictionaries: List[Dict]) -> Tuple[int, int]:
+        self.__load_latest_offers([
+            self.__create_key(offer_dictionary)
+            for offer_dictionary in offer_dictionaries
+        ])
+
+        offer_inserts = []
+        last_seen_by_offer_id = {}
+        latest_offer_requests = {}
+
+        for offer_dictionary in offer_dictionaries:
+            key = self.__create_key(offer_dictionary)
+            fingerprint = self.__create_fingerprint(offer_dictionary)
+            latest_offer = self.latest_offers.get(key)
+            last_seen = offer_dictionary[offer.Offer.KEY_UPDATED]
+
+            if latest_offer and latest_offer[0] == fingerprint:
+                last_seen_by_offer_id[latest_offer[1]] = last_seen
+                continue
+
+            offer_dictionary[offer.Offer.KEY_ID] = ObjectId()
+            offer_dictionary[offer.Offer.KEY_LAST_SEEN] = last_seen
+            offer_inserts.append(pymongo.InsertOne(offer_dictionary))
+            self.__set_latest_offer(
+                key,
+                (fingerprint, offer_dictionary[offer.Offer.KEY_ID]),
+            )
+
+            latest_offer_dictionary = dict(fingerprint)
+            latest_offer_dictionary[self.KEY_OFFER_ID] = offer_dictionary[
+                offer.Offer.KEY_ID
+            ]
+            latest_offer_dictionary[offer.Offer.KEY_UPDATED] = last_seen
+            latest_offer_requests[key] = pymongo.ReplaceOne(
+                filter={offer.Offer.KEY_ID: self.__create_id(key)},
+                replacement=latest_offer_dictionary,
+                upsert=True,
+            )
+
+        try:
+            if offer_inserts or last_seen_by_offer_id:
+                self.offers_collection.bulk_write(
+                    offer_inserts + [
+                        pymongo.UpdateOne(
+                            filter={offer.Offer.KEY_ID: offer_id},
+                            update={'$max': {
+                                offer.Offer.KEY_LAST_SEEN: last_seen,
+                            }},
+                        )
+                        for offer_id, last_seen in \
+                            last_seen_by_offer_id.items()
+                    ],
+                    ordered=False,
+                )
+
+            if latest_offer_requests:
+                self.latest_offers_collection.bulk_write(
+                    list(latest_offer_requests.values()),
+                    ordered=False,
+                )
+        except BulkWriteError as error:
+            logging.error(
+                f'Unable to write offers: {error.details.get("writeErrors")}'
+            )
+            # Forget what may not have been written.
+            self.latest_offers.clear()
+
+        return len(offer_inserts), len(last_seen_by_offer_id)
+
+    def __load_latest_offers(self, keys: List[Tuple]):
+        missing_ids = [
+            self.__create_id(key) for key in dict.fromkeys(keys)
+            if key not in self.latest_offers
+        ]
+
+        if not missing_ids:
+            return
+
+        for document in self.latest_offers_collection.find({
+            offer.Offer.KEY_ID: {'$in': missing_ids},
+        }):
+            self.__set_latest_offer(
+                tuple(document[offer.Offer.KEY_ID].values()),
+                (
+                    self.__create_fingerprint(document),
+                    document[self.KEY_OFFER_ID],
+                ),
+            )
+
+    def __set_latest_offer(self, key: Tuple, latest_offer: Tuple):
+        self.latest_offers[key] = latest_offer
+        self.latest_offers.move_to_end(key)
+
+        while len(self.latest_offers) > self.max_size:
+            self.latest_offers.popitem(last=False)
+
+    def __create_key(self, offer_dictionary: Dict) -> Tuple:
+        return (
+            offer_dictionary.get(offer.Offer.KEY_PRODUCT_ID),
+            offer_dictionary.get(offer.Offer.KEY_STORE_ID),
+            offer_dictionary.get(offer.Offer.KEY_SOLD_BY),
+        )
+
+    def __create_id(self, key: Tuple) -> Dict:
+        return {
+            offer.Offer.KEY_PRODUCT_ID: key[0],
+            offer.Offer.KEY_STORE_ID: key[1],
+            offer.Offer.KEY_SOLD_BY: key[2],
+        }
+
+    def __create_fingerprint(self, dictionary: Dict) -> Tuple:
+        return tuple(
+            (key, dictionary.get(key)) for key in self.FINGERPRINT_KEYS
+        )
@@ -0,0 +1,186 @@
+import logging
+import pymongo
+from pymongo.database import Database
+from pymongo.errors import OperationFailure
+from scrapy.settings import Settings
+from typing import (
+    Dict,
+    List,
+)
+from price_monitor.items import (
+    offer,
+    product,
+)
+from price_monitor.storage import (
+    offer_history_store,
+)
+
+class MongoDBIndexManager:
+    # Indexes required by the pipelines' queries, by collection setting.
+    INDEXES = {
+        'MONGODB_COLLECTION_PRODUCTS': [
+            pymongo.IndexModel(
+                [
+                    (product.Product.KEY_GTIN + '.value', pymongo.ASCENDING),
+                ],
+                name='gtin_value',
+            ),
+            pymongo.IndexModel(
+                [
+                    (product.Product.KEY_MODEL_NUMBER, pymongo.ASCENDING),
+                    (product.Product.KEY_BRAND_KEY, pymongo.ASCENDING),
+                ],
+                name='model_number_brand_key',
+            ),
+        ],
+        'MONGODB_COLLECTION_OFFERS': [
+            pymongo.IndexModel(
+                [
+                    (offer.Offer.KEY_PRODUCT_ID, pymongo.ASCENDING),
+                    (offer.Offer.KEY_STORE_ID, pymongo.ASCENDING),
+                    (offer.Offer.KEY_CREATED, pymongo.ASCENDING),
+                ],
+                name='product_id_store_id_created',
+            ),
+        ],
+        # Stores and latest offers are only looked up by _id.
+        'MONGODB_COLLECTION_STORES': [],
+        'MONGODB_COLLECTION_LATEST_OFFERS': [],
+        'MONGODB_COLLECTION_OFFER_HISTORY': [
+            pymongo.IndexModel(
+                [
+                    (offer.Offer.KEY_PRODUCT_ID, pymongo.ASCENDING),
+                    (offer.Offer.KEY_STORE_ID, pymongo.ASCENDING),
+                    (
+                        offer_history_store.OfferHistoryStore.KEY_MONTH,
+                        pymongo.ASCENDING,
+                    ),
+                ],
+                name='product_id_store_id_month',
+            ),
+        ],
+    }
+
+    def __init__(self, db: Database, settings: Settings):
+        self.db = db
+        self.settings = settings
+
+    def create_missing_indexes(self) -> List[str]:
+        created = []
+
+        for collection, indexes in self.find_missing_indexes().items():
+            created += self.db[collection].create_indexes(indexes)
+
+        if created:
+            logging.info(f'Created indexes: {", ".join(created)}.')
+
+        return created
+
+    def find_missing_indexes(self) -> Dict[str, List[pymongo.IndexModel]]:
+        result = {}
+
+        for collection, indexes in self.__get_declared_indexes().items():
+            existing_keys = [
+                information['key'] for information in
+                self.db[collection].index_information().values()
+            ]
+            missing = [
+                index for index in indexes
+                if list(index.document['key'].items()) not in existing_keys
+            ]
+
+            if missing:
+                result[collection] = missing
+
+        return result
+
+    def find_undeclared_indexes(self) -> Dict[str, List[str]]:
+        result = {}
+
+        for collection, indexes in self.__get_declared_indexes().items():
+            declared_keys = [
+                list(index.document['key'].items()) for index in indexes
+            ]
+            undeclared = [
+                name for name, information in
+                self.db[collection].index_information().items()
+                if name != '_id_' and information['key'] not in declared_keys
+            ]
+
+            if undeclared:
+                result[collection] = undeclared
+
+        return result
+
+    def find_unused_indexes(self) -> Dict[str, List[str]]:
+        # Usage is counted since the server started. Undeclared indexes are
+        # reported too since the pipelines don't need them.
+        result = {}
+
+        for collection, indexes in self.__get_declared_indexes().items():
+            declared_keys = [
+                list(index.document['key'].items()) for index in indexes
+            ]
+            unused = []
+
+            for stats in self.db[collection].aggregate([{'$indexStats': {}}]):
+                if stats['name'] == '_id_':
+                    continue
+
+                if stats['accesses']['ops'] == 0 \
+                    or list(stats['key'].items()) not in declared_keys:
+                    unused.append(stats['name'])
+
+            if unused:
+                result[collection] = unused
+
+        return result
+
+    def report(self, usage: bool = True):
+        for collection, indexes in self.find_missing_indexes().items():
+            for index in indexes:
+                logging.warning(
+                    f'Missing index "{index.document["name"]}" '
+                    f'on "{collection}".'
+                )
+
+        # Usage says little about indexes that were just created.
+        if not usage:
+            for collection, names in self.find_undeclared_indexes().items():
+                for name in names:
+                    logging.warning(
+                        f'Undeclared index "{name}" on "{collection}".'
+                    )
+
+            return
+
+        try:
+            unused_indexes = self.find_unused_indexes()
+        except OperationFailure as error:
+            # $indexStats needs the indexStats privilege.
+            logging.warning(f'Unable to read index usage: {error}')
+            unused_indexes = {}
+
+        for collection, names in unused_indexes.items():
+            for name in names:
+                logging.warning(
+                    f'Unused or undeclared index "{name}" on "{collection}".'
+                )
+
+    def __get_declared_indexes(self) -> Dict[str, List[pymongo.IndexModel]]:
+        # Collections of disabled features are neither created nor checked.
+        buckets = self.settings.get('MONGODB_OFFERS_LAYOUT') \
+            == offer_history_store.OfferHistoryStore.LAYOUT_BUCKETS
+        enabled = {
+            'MONGODB_COLLECTION_LATEST_OFFERS': not buckets and (
+                self.settings.getbool('MONGODB_OFFERS_CHANGES_ONLY')
+                or self.settings.getbool('CONDITIONAL_REQUESTS_ENABLED')
+            ),
+            'MONGODB_COLLECTION_OFFER_HISTORY': buckets,
+        }
+
+        return {
+            self.settings.get(setting): indexes
+            for setting, indexes in self.INDEXES.items()
+            if enabled.get(setting, True)
+        }
@@ -0,0 +1,166 @@
+import logging
+import pymongo
+from collections import OrderedDict
+from datetime import datetime
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+from price_monitor.items import (
+    offer,
+)
+
+class OfferHistoryStore:
+    """Writes offers into one bucket per product, store, seller and month.
+
+    Each bucket holds the month's points as compact (created, amount,
+    availability) arrays, so reading a product's price history takes a
+    document per month instead of one per offer.
+    """
+
+    LAYOUT_DOCUMENTS = 'documents'
+    LAYOUT_BUCKETS = 'buckets'
+
+    KEY_COUNT = 'count'
+    KEY_FIRST = 'first'
+    KEY_LAST = 'last'
+    KEY_MONTH = 'month'
+    KEY_POINTS = 'points'
+
+    def __init__(self, offer_history_collection: Collection):
+        self.offer_history_collection = offer_history_collection
+
+    def write_offers(self, offer_dictionaries: List[Dict]) -> int:
+        requests = self.create_requests(offer_dictionaries)
+
+        if not requests:
+            return 0
+
+        try:
+            self.offer_history_collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as error:
+            logging.error(
+                'Unable to write offer history: '
+                f'{error.details.get("writeErrors")}'
+            )
+
+            return 0
+
+        return len(offer_dictionaries)
+
+    def create_requests(self, offer_dictionaries: List[Dict]) -> List:
+        points_by_bucket_id = OrderedDict()
+
+        for offer_dictionary in offer_dictionaries:
+            bucket_id = self.__create_bucket_id(offer_dictionary)
+            key = tuple(bucket_id.values())
+
+            if key not in points_by_bucket_id:
+                points_by_bucket_id[key] = (bucket_id, offer_dictionary, [])
+
+            points_by_bucket_id[key][2].append([
+                offer_dictionary.get(offer.Offer.KEY_CREATED),
+                offer_dictionary.get(offer.Offer.KEY_AMOUNT),
+                offer_dictionary.get(offer.Offer.KEY_AVAILABILITY),
+            ])
+
+        return [
+            pymongo.UpdateOne(
+                filter={offer.Offer.KEY_ID: bucket_id},
+                update={
+                    '$setOnInsert': {
+                        offer.Offer.KEY_PRODUCT_ID: bucket_id[
+                            offer.Offer.KEY_PRODUCT_ID
+                        ],
+                        offer.Offer.KEY_STORE_ID: bucket_id[
+                            offer.Offer.KEY_STORE_ID
+                        ],
+                        offer.Offer.KEY_SOLD_BY: bucket_id[
+                            offer.Offer.KEY_SOLD_BY
+                        ],
+                        self.KEY_MONTH: bucket_id[self.KEY_MONTH],
+                        offer.Offer.KEY_CURRENCY: offer_dictionary.get(
+                            offer.Offer.KEY_CURRENCY
+                        ),
+                        offer.Offer.KEY_CONDITION: offer_dictionary.get(
+                            offer.Offer.KEY_CONDITION
+                        ),
+                    },
+                    '$push': {self.KEY_POINTS: {'$each': points}},
+                    '$inc': {self.KEY_COUNT: len(points)},
+                    '$min': {self.KEY_FIRST: min(point[0] for point in points)},
+                    '$max': {self.KEY_LAST: max(point[0] for point in points)},
+                },
+                upsert=True,
+            )
+            for bucket_id, offer_dictionary, points in \
+                points_by_bucket_id.values()
+        ]
+
+    def find_history(
+        self,
+        product_id,
+        store_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Dict]:
+        month_filter = {}
+
+        if start:
+            month_filter['$gte'] = self.__get_month(start)
+
+        if end:
+            month_filter['$lte'] = self.__get_month(end)
+
+        query = {
+            offer.Offer.KEY_PRODUCT_ID: product_id,
+            offer.Offer.KEY_STORE_ID: store_id,
+        }
+
+        if month_filter:
+            query[self.KEY_MONTH] = month_filter
+
+        history = []
+
+        for document in self.offer_history_collection.find(query).sort(
+            self.KEY_MONTH,
+            pymongo.ASCENDING,
+        ):
+            for created, amount, availability in document[self.KEY_POINTS]:
+                if (start and created < start) or (end and created > end):
+                    continue
+
+                history.append({
+                    offer.Offer.KEY_CREATED: created,
+                    offer.Offer.KEY_AMOUNT: amount,
+                    offer.Offer.KEY_AVAILABILITY: availability,
+                    offer.Offer.KEY_SOLD_BY: document[offer.Offer.KEY_SOLD_BY],
+                })
+
+        return sorted(
+            history,
+            key=lambda point: point[offer.Offer.KEY_CREATED],
+        )
+
+    def __create_bucket_id(self, offer_dictionary: Dict) -> Dict:
+        return {
+            offer.Offer.KEY_PRODUCT_ID: offer_dictionary.get(
+                offer.Offer.KEY_PRODUCT_ID
+            ),
+            offer.Offer.KEY_STORE_ID: offer_dictionary.get(
+                offer.Offer.KEY_STORE_ID
+            ),
+            offer.Offer.KEY_SOLD_BY: offer_dictionary.get(
+                offer.Offer.KEY_SOLD_BY
+            ),
+            self.KEY_MONTH: self.__get_month(
+                offer_dictionary.get(offer.Offer.KEY_CREATED) \
+                    or datetime.utcnow()
+            ),
+        }
+
+    def __get_month(self, value: datetime) -> datetime:
+        return datetime(value.year, value.month, 1)
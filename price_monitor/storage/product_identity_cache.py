@@ -0,0 +1,131 @@
+import time
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+)
+from price_monitor.items import (
+    product,
+)
+from price_monitor.models import (
+    language,
+)
+
+class ProductIdentity:
+    LANGUAGES = {lang.value for lang in language.Language}
+
+    def __init__(
+        self,
+        product_id,
+        languages_by_store_seller_key: Optional[Dict[str, Set[str]]] = None,
+    ):
+        self.product_id = product_id
+        self.languages_by_store_seller_key = languages_by_store_seller_key \
+            or {}
+
+    @classmethod
+    def from_document(cls, document: Dict) -> 'ProductIdentity':
+        languages_by_store_seller_key = {}
+
+        for store_seller_key, store_data in (
+            document.get(product.Product.KEY_PRODUCT_DATA) or {}
+        ).items():
+            languages_by_store_seller_key[store_seller_key] = {
+                key for key in store_data if key in cls.LANGUAGES
+            }
+
+        return cls(
+            product_id=document[product.Product.KEY_ID],
+            languages_by_store_seller_key=languages_by_store_seller_key,
+        )
+
+    def has_store_seller_key(self, store_seller_key: str) -> bool:
+        return store_seller_key in self.languages_by_store_seller_key
+
+    def has_language(self, store_seller_key: str, lang: str) -> bool:
+        return lang in self.languages_by_store_seller_key.get(
+            store_seller_key,
+            (),
+        )
+
+    def add_language(self, store_seller_key: str, lang: str):
+        self.languages_by_store_seller_key.setdefault(
+            store_seller_key,
+            set(),
+        ).add(lang)
+
+    def __repr__(self):
+        return repr((self.product_id, self.languages_by_store_seller_key))
+
+class ProductIdentityCache:
+    """LRU cache with TTL mapping GTINs and (model number, brand) to products.
+
+    An identity is shared by all of its keys, so adding a store or language to
+    it is seen whichever key finds it next.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_by_gtin(self, gtin_key) -> Optional[ProductIdentity]:
+        return self.__get(('gtin', gtin_key))
+
+    def get_by_model_number_and_brand(
+        self,
+        model_number: str,
+        brand_key: str,
+    ) -> Optional[ProductIdentity]:
+        return self.__get(('model_number_brand', model_number, brand_key))
+
+    def add(
+        self,
+        identity: ProductIdentity,
+        gtin_key=None,
+        model_number: Optional[str] = None,
+        brand_keys: Iterable[str] = (),
+    ):
+        if gtin_key:
+            self.__set(('gtin', gtin_key), identity)
+
+        if model_number:
+            for brand_key in brand_keys:
+                self.__set(
+                    ('model_number_brand', model_number, brand_key),
+                    identity,
+                )
+
+    def clear(self):
+        self.entries.clear()
+
+    def __get(self, key) -> Optional[ProductIdentity]:
+        entry = self.entries.get(key)
+
+        if not entry:
+            return None
+
+        expires, identity = entry
+
+        if expires <= time.monotonic():
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+
+        return identity
+
+    def __set(self, key, identity: ProductIdentity):
+        if self.max_size <= 0:
+            return
+
+        self.entries[key] = (time.monotonic() + self.ttl, identity)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
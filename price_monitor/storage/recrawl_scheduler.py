@@ -0,0 +1,226 @@
+import math
+from collections import namedtuple
+from datetime import (
+    datetime,
+    timedelta,
+)
+from pymongo.database import Database
+from scrapy.settings import Settings
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+from price_monitor.items import (
+    language_data,
+    offer,
+    product,
+    product_data,
+)
+from price_monitor.storage import (
+    offer_history_store,
+)
+
+ScheduledVisit = namedtuple(
+    'ScheduledVisit',
+    [
+        'url',
+        'next_visit',
+        'priority',
+        'change_probability',
+    ],
+)
+
+class RecrawlScheduler:
+    """Schedules product URLs by how often their offers change.
+
+    The change rate of each product is estimated from its offer history,
+    smoothed towards a prior of RECRAWL_PRIOR_CHANGES changes per
+    RECRAWL_PRIOR_DAYS days. The next visit is when a change becomes
+    RECRAWL_TARGET_CHANGE_PROBABILITY likely, and the priority is the
+    probability (in percent) that it changed since it was last seen.
+    """
+
+    HISTORY_KEYS = [
+        offer.Offer.KEY_CREATED,
+        offer.Offer.KEY_LAST_SEEN,
+        offer.Offer.KEY_AMOUNT,
+        offer.Offer.KEY_AVAILABILITY,
+    ]
+    MAX_PRIORITY = 100
+    PRODUCT_ID_CHUNK_SIZE = 1000
+
+    def __init__(self, db: Database, settings: Settings):
+        self.products_collection = db[
+            settings.get('MONGODB_COLLECTION_PRODUCTS')
+        ]
+        self.offers_collection = db[settings.get('MONGODB_COLLECTION_OFFERS')]
+        self.offer_history_collection = db[
+            settings.get('MONGODB_COLLECTION_OFFER_HISTORY')
+        ]
+        self.offers_layout = settings.get('MONGODB_OFFERS_LAYOUT')
+        self.prior_changes = settings.getfloat('RECRAWL_PRIOR_CHANGES')
+        self.prior_days = settings.getfloat('RECRAWL_PRIOR_DAYS')
+        self.target_change_probability = settings.getfloat(
+            'RECRAWL_TARGET_CHANGE_PROBABILITY'
+        )
+        self.min_interval = timedelta(
+            seconds=settings.getint('RECRAWL_MIN_INTERVAL')
+        )
+        self.max_interval = timedelta(
+            seconds=settings.getint('RECRAWL_MAX_INTERVAL')
+        )
+
+    def create_schedule(
+        self,
+        store_id: str,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, ScheduledVisit]:
+        now = now or datetime.utcnow()
+        visits_by_product_id = {}
+
+        for product_id, history in self.__find_histories(store_id).items():
+            visits_by_product_id[product_id] = self.__create_visit(
+                history,
+                now,
+            )
+
+        schedule = {}
+
+        for document in self.__find_products(list(visits_by_product_id)):
+            next_visit, priority, change_probability = visits_by_product_id[
+                document[product.Product.KEY_ID]
+            ]
+
+            for url in self.__get_urls(document, store_id):
+                schedule[url] = ScheduledVisit(
+                    url=url,
+                    next_visit=next_visit,
+                    priority=priority,
+                    change_probability=change_probability,
+                )
+
+        return schedule
+
+    def estimate_change_rate(self, history: List[List]) -> float:
+        """Returns the expected number of changes per day.
+
+        The history is a list of [created, last_seen, amount, availability]
+        sorted by created.
+        """
+        changes = sum(
+            1 for previous, current in zip(history, history[1:])
+            if previous[2:] != current[2:]
+        )
+        observed = max(point[1] for point in history) - history[0][0]
+
+        return (changes + self.prior_changes) \
+            / (observed.total_seconds() / 86400 + self.prior_days)
+
+    def __create_visit(self, history: List[List], now: datetime) -> tuple:
+        change_rate = self.estimate_change_rate(history)
+        last_seen = max(point[1] for point in history)
+        interval = timedelta(
+            days=-math.log(1 - self.target_change_probability) / change_rate
+        )
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        unseen_days = max((now - last_seen).total_seconds(), 0) / 86400
+        change_probability = 1 - math.exp(-change_rate * unseen_days)
+
+        return (
+            last_seen + interval,
+            int(round(change_probability * self.MAX_PRIORITY)),
+            change_probability,
+        )
+
+    def __find_histories(self, store_id: str) -> Dict:
+        if self.offers_layout == \
+            offer_history_store.OfferHistoryStore.LAYOUT_BUCKETS:
+            return self.__find_bucket_histories(store_id)
+
+        histories = {}
+
+        for document in self.offers_collection.aggregate(
+            [
+                {'$match': {offer.Offer.KEY_STORE_ID: store_id}},
+                {'$sort': {
+                    offer.Offer.KEY_PRODUCT_ID: 1,
+                    offer.Offer.KEY_CREATED: 1,
+                }},
+                {'$project': {
+                    offer.Offer.KEY_PRODUCT_ID: 1,
+                    offer.Offer.KEY_CREATED: 1,
+                    offer.Offer.KEY_LAST_SEEN: {'$ifNull': [
+                        f'${offer.Offer.KEY_LAST_SEEN}',
+                        f'${offer.Offer.KEY_CREATED}',
+                    ]},
+                    offer.Offer.KEY_AMOUNT: 1,
+                    offer.Offer.KEY_AVAILABILITY: 1,
+                }},
+                {'$group': {
+                    '_id': f'${offer.Offer.KEY_PRODUCT_ID}',
+                    'history': {'$push': {
+                        key: f'${key}' for key in self.HISTORY_KEYS
+                    }},
+                }},
+            ],
+            allowDiskUse=True,
+        ):
+            histories[document['_id']] = [
+                [point.get(key) for key in self.HISTORY_KEYS]
+                for point in document['history']
+            ]
+
+        return histories
+
+    def __find_bucket_histories(self, store_id: str) -> Dict:
+        histories = {}
+
+        for document in self.offer_history_collection.find(
+            {offer.Offer.KEY_STORE_ID: store_id},
+        ).sort(offer_history_store.OfferHistoryStore.KEY_MONTH, 1):
+            histories.setdefault(
+                document[offer.Offer.KEY_PRODUCT_ID],
+                [],
+            ).extend(
+                [created, created, amount, availability]
+                for created, amount, availability in document[
+                    offer_history_store.OfferHistoryStore.KEY_POINTS
+                ]
+            )
+
+        for history in histories.values():
+            history.sort(key=lambda point: point[0])
+
+        return histories
+
+    def __find_products(self, product_ids: List):
+        for index in range(0, len(product_ids), self.PRODUCT_ID_CHUNK_SIZE):
+            yield from self.products_collection.find(
+                {product.Product.KEY_ID: {
+                    '$in': product_ids[index:index + \
+                        self.PRODUCT_ID_CHUNK_SIZE],
+                }},
+                projection=[product.Product.KEY_PRODUCT_DATA],
+            )
+
+    def __get_urls(self, document: Dict, store_id: str) -> List[str]:
+        urls = []
+
+        for store_data in (
+            document.get(product.Product.KEY_PRODUCT_DATA) or {}
+        ).values():
+            if store_data.get(product_data.ProductData.KEY_STORE_ID) \
+                != store_id:
+                continue
+
+            if store_data.get(product_data.ProductData.KEY_URL):
+                urls.append(store_data[product_data.ProductData.KEY_URL])
+
+            # Language data keeps the URL of each language's page.
+            for value in store_data.values():
+                if isinstance(value, dict) \
+                    and value.get(language_data.LanguageData.KEY_URL):
+                    urls.append(value[language_data.LanguageData.KEY_URL])
+
+        return urls
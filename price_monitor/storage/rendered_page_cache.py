@@ -0,0 +1,118 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Optional,
+)
+
+class RenderedPageCache:
+    """Keeps rendered pages on disk as zlib compressed JSON files.
+
+    Entries older than the TTL (in seconds, 0 never expires) are ignored, and
+    the least recently used files are removed once the cache is larger than
+    max_size bytes.
+    """
+
+    FILE_EXTENSION = '.json.z'
+
+    def __init__(self, directory: str, ttl: int, max_size: int):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.sizes = OrderedDict()
+        self.size = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.__load_sizes()
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self.__get_path(key)
+
+        with self.lock:
+            if key not in self.sizes:
+                return None
+
+            try:
+                if self.ttl and os.path.getmtime(path) < time.time() - self.ttl:
+                    self.__remove(key)
+
+                    return None
+
+                with open(path, 'rb') as file:
+                    data = file.read()
+            except OSError:
+                self.__forget(key)
+
+                return None
+
+            self.sizes.move_to_end(key)
+            # Last access is kept in atime, so LRU order survives restarts.
+            os.utime(path, (time.time(), os.path.getmtime(path)))
+
+        try:
+            return json.loads(zlib.decompress(data))
+        except (ValueError, zlib.error) as error:
+            logging.warning(f'Unable to read rendered page {path}: {error}')
+
+            return None
+
+    def set(self, key: str, entry: Dict):
+        data = zlib.compress(json.dumps(entry).encode('utf-8'))
+        path = self.__get_path(key)
+
+        with self.lock:
+            temporary_path = f'{path}.{threading.get_ident()}.tmp'
+
+            with open(temporary_path, 'wb') as file:
+                file.write(data)
+
+            os.replace(temporary_path, path)
+            self.__forget(key)
+            self.sizes[key] = len(data)
+            self.size += len(data)
+
+            while self.size > self.max_size and len(self.sizes) > 1:
+                self.__remove(next(iter(self.sizes)))
+
+    @staticmethod
+    def create_key(*values) -> str:
+        return hashlib.sha1(
+            json.dumps(values, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    def __load_sizes(self):
+        entries = []
+
+        for name in os.listdir(self.directory):
+            if name.endswith(self.FILE_EXTENSION):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((
+                    max(stat.st_atime, stat.st_mtime),
+                    name[:-len(self.FILE_EXTENSION)],
+                    stat.st_size,
+                ))
+
+        for _, key, size in sorted(entries):
+            self.sizes[key] = size
+            self.size += size
+
+    def __get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.FILE_EXTENSION)
+
+    def __remove(self, key: str):
+        self.__forget(key)
+
+        try:
+            os.remove(self.__get_path(key))
+        except OSError:
+            pass
+
+    def __forget(self, key: str):
+        self.size -= self.sizes.pop(key, 0)
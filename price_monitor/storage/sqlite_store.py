@@ -0,0 +1,39 @@
+import os
+import sqlite3
+from typing import (
+    Dict,
+    Optional,
+)
+
+class SQLiteStore:
+    """A table in a local SQLite file, written in batches.
+
+    Writes are committed every COMMIT_EVERY statements and on close, one
+    commit per page would cost a sync of the file each time.
+    """
+
+    COMMIT_EVERY = 100
+
+    def __init__(self, path: str, schema: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(schema)
+        self.uncommitted = 0
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def _fetch_one(self, sql: str, parameters: tuple) -> Optional[Dict]:
+        row = self.connection.execute(sql, parameters).fetchone()
+
+        return dict(row) if row else None
+
+    def _execute(self, sql: str, parameters: tuple):
+        self.connection.execute(sql, parameters)
+        self.uncommitted += 1
+
+        if self.uncommitted >= self.COMMIT_EVERY:
+            self.connection.commit()
+            self.uncommitted = 0
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import time
+from typing import (
+    Dict,
+    Optional,
+)
+from price_monitor.storage import (
+    sqlite_store,
+)
+
+class UrlStateStore(sqlite_store.SQLiteStore):
+    """Remembers what was last scraped from each URL of a store in SQLite.
+
+    A URL is due when it was never scraped, when its sitemap lastmod changed
+    since it was scraped or when it was scraped more than revisit_after
+    seconds ago, unless it has its own next visit time. The interval doubles
+    each time the offer was scraped unchanged, up to max_revisit_after.
+    """
+
+    KEY_URL = 'url'
+    KEY_LASTMOD = 'lastmod'
+    KEY_LAST_FETCHED = 'last_fetched'
+    KEY_OFFER_HASH = 'offer_hash'
+    KEY_UNCHANGED_FETCHES = 'unchanged_fetches'
+
+    def __init__(
+        self,
+        path: str,
+        revisit_after: int,
+        max_revisit_after: Optional[int] = None,
+    ):
+        super().__init__(
+            path,
+            'CREATE TABLE IF NOT EXISTS url_states ('
+            'url TEXT PRIMARY KEY, '
+            'lastmod TEXT, '
+            'last_fetched REAL, '
+            'offer_hash TEXT, '
+            'unchanged_fetches INTEGER NOT NULL DEFAULT 0)',
+        )
+        self.revisit_after = revisit_after
+        self.max_revisit_after = max(
+            max_revisit_after or revisit_after,
+            revisit_after,
+        )
+
+        # Files from before the count was kept.
+        if self.KEY_UNCHANGED_FETCHES not in [
+            row['name'] for row in self.connection.execute(
+                'PRAGMA table_info(url_states)'
+            )
+        ]:
+            self.connection.execute(
+                'ALTER TABLE url_states ADD COLUMN '
+                'unchanged_fetches INTEGER NOT NULL DEFAULT 0'
+            )
+
+    def get(self, url: str) -> Optional[Dict]:
+        return self._fetch_one(
+            'SELECT * FROM url_states WHERE url = ?',
+            (url,),
+        )
+
+    def is_due(
+        self,
+        url: str,
+        lastmod: Optional[str] = None,
+        next_visit: Optional[float] = None,
+    ) -> bool:
+        state = self.get(url)
+
+        if not state or not state[self.KEY_LAST_FETCHED]:
+            return True
+
+        if lastmod and lastmod != state[self.KEY_LASTMOD]:
+            return True
+
+        if next_visit is not None:
+            return next_visit <= time.time()
+
+        return state[self.KEY_LAST_FETCHED] \
+            < time.time() - self.get_revisit_after(state)
+
+    def get_revisit_after(self, state: Dict) -> float:
+        return min(
+            self.revisit_after \
+                * 2 ** min(state[self.KEY_UNCHANGED_FETCHES], 32),
+            self.max_revisit_after,
+        )
+
+    def set_scraped(
+        self,
+        url: str,
+        offer_hash: str,
+        lastmod: Optional[str] = None,
+    ):
+        # The updates read the row's values from before the statement.
+        self._execute(
+            'INSERT INTO url_states (url, lastmod, last_fetched, offer_hash) '
+            'VALUES (?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET '
+            'lastmod = COALESCE(excluded.lastmod, lastmod), '
+            'last_fetched = excluded.last_fetched, '
+            'unchanged_fetches = CASE WHEN offer_hash = excluded.offer_hash '
+            'THEN unchanged_fetches + 1 ELSE 0 END, '
+            'offer_hash = excluded.offer_hash',
+            (url, lastmod, time.time(), offer_hash),
+        )
+
+    @staticmethod
+    def create_offer_hash(offer_dictionary: Optional[Dict]) -> str:
+        return hashlib.sha1(
+            json.dumps(offer_dictionary or {}, sort_keys=True, default=str) \
+                .encode('utf-8')
+        ).hexdigest()
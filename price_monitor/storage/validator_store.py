@@ -0,0 +1,64 @@
+import json
+from typing import (
+    Dict,
+    Optional,
+)
+from w3lib.url import canonicalize_url
+from price_monitor.storage import (
+    sqlite_store,
+)
+
+class ValidatorStore(sqlite_store.SQLiteStore):
+    """Keeps the ETag and Last-Modified validators of each page in SQLite.
+
+    The last item scraped from the page is kept with them, so it can be
+    scraped again when the server answers 304 Not Modified.
+    """
+
+    KEY_ETAG = 'etag'
+    KEY_LAST_MODIFIED = 'last_modified'
+    KEY_ITEM = 'item'
+
+    def __init__(self, path: str):
+        super().__init__(
+            path,
+            'CREATE TABLE IF NOT EXISTS validators ('
+            'url TEXT PRIMARY KEY, '
+            'etag TEXT, '
+            'last_modified TEXT, '
+            'item TEXT)',
+        )
+
+    def get(self, url: str) -> Optional[Dict]:
+        return self._fetch_one(
+            'SELECT * FROM validators WHERE url = ?',
+            (canonicalize_url(url),),
+        )
+
+    def get_item(self, url: str) -> Optional[Dict]:
+        validators = self.get(url)
+
+        if not validators or not validators[self.KEY_ITEM]:
+            return None
+
+        return json.loads(validators[self.KEY_ITEM])
+
+    def set_validators(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ):
+        self._execute(
+            'INSERT INTO validators (url, etag, last_modified) '
+            'VALUES (?, ?, ?) ON CONFLICT(url) DO UPDATE SET '
+            'etag = excluded.etag, last_modified = excluded.last_modified',
+            (canonicalize_url(url), etag, last_modified),
+        )
+
+    def set_item(self, url: str, item: Dict):
+        self._execute(
+            'INSERT INTO validators (url, item) VALUES (?, ?) '
+            'ON CONFLICT(url) DO UPDATE SET item = excluded.item',
+            (canonicalize_url(url), json.dumps(item, default=str)),
+        )